@@ -4,9 +4,10 @@
 import os
 import json
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 from core.data.data_manager import DataManager
 from core.analyzers.composite_analyzer import CompositeAnalyzer
+from core.data.digit_sequence import DigitSequence
 
 class BatchAnalyzer:
     def __init__(self):
@@ -36,7 +37,14 @@ class BatchAnalyzer:
             if not digits:
                 print(f"❌ 无法加载常数: {constant_name}")
                 return None
-            
+        except Exception as e:
+            print(f"❌ 分析失败: {constant_name} - {str(e)}")
+            return None
+        return self.analyze_digits(constant_name, digits)
+    
+    def analyze_digits(self, constant_name: str, digits: Union[List[int], DigitSequence]) -> Dict[str, Any]:
+        """分析已加载的常数"""
+        try:
             # 分析常数
             start_time = time.time()
             result = self.analyzer.analyze(digits)
@@ -59,8 +67,14 @@ class BatchAnalyzer:
                 json.dump(result, f, ensure_ascii=False, indent=2)
             print(f"📄 保存结果: {filename}")
     
-    def generate_summary(self, results: Dict[str, Any]) -> Dict[str, Any]:
-        """生成汇总报告"""
+    def generate_summary(self, results: Dict[str, Any], batch_analysis_time: Optional[float] = None) -> Dict[str, Any]:
+        """
+        生成汇总报告
+        
+        Args:
+            results: 常数名称到分析结果的映射
+            batch_analysis_time: 批量分析的总耗时（逐个分析时为None）
+        """
         summary = {
             'total_constants': len(results),
             'successful_analyses': sum(1 for r in results.values() if r is not None),
@@ -68,6 +82,7 @@ class BatchAnalyzer:
             'constants': {},
             'statistics': {
                 'average_analysis_time': 0,
+                'batch_analysis_time': batch_analysis_time,
                 'average_randomness': 0,
                 'average_symmetry': 0,
                 'average_predictability': 0,
@@ -76,6 +91,7 @@ class BatchAnalyzer:
         }
         
         total_time = 0
+        timed_results = 0
         total_randomness = 0
         total_symmetry = 0
         total_predictability = 0
@@ -86,7 +102,6 @@ class BatchAnalyzer:
             if result:
                 # 提取关键指标
                 stats = {
-                    'analysis_time': result.get('analysis_time', 0),
                     'length': result.get('statistical', {}).get('total_digits', 0),
                     'entropy': result.get('statistical', {}).get('entropy', 0),
                     'randomness': result.get('scores', {}).get('randomness', 0),
@@ -94,6 +109,11 @@ class BatchAnalyzer:
                     'predictability': result.get('scores', {}).get('predictability', 0),
                     'total_score': result.get('scores', {}).get('total_score', 0)
                 }
+                # 只有逐个分析的常数才有单独的分析时间
+                if 'analysis_time' in result:
+                    stats['analysis_time'] = result['analysis_time']
+                    total_time += result['analysis_time']
+                    timed_results += 1
                 
                 # 提取四轨分析结果
                 four_track = {}
@@ -122,7 +142,6 @@ class BatchAnalyzer:
                 }
                 
                 # 累积统计数据
-                total_time += stats['analysis_time']
                 total_randomness += stats['randomness']
                 total_symmetry += stats['symmetry']
                 total_predictability += stats['predictability']
@@ -130,8 +149,9 @@ class BatchAnalyzer:
                 valid_results += 1
         
         # 计算平均值
+        if timed_results > 0:
+            summary['statistics']['average_analysis_time'] = total_time / timed_results
         if valid_results > 0:
-            summary['statistics']['average_analysis_time'] = total_time / valid_results
             summary['statistics']['average_randomness'] = total_randomness / valid_results
             summary['statistics']['average_symmetry'] = total_symmetry / valid_results
             summary['statistics']['average_predictability'] = total_predictability / valid_results
@@ -158,7 +178,10 @@ class BatchAnalyzer:
             f.write(f"分析失败: {summary['failed_analyses']}\n\n")
             
             f.write("平均统计指标:\n")
-            f.write(f"  分析时间: {summary['statistics']['average_analysis_time']:.2f}秒\n")
+            if summary['statistics']['batch_analysis_time'] is not None:
+                f.write(f"  批量分析时间: {summary['statistics']['batch_analysis_time']:.2f}秒\n")
+            else:
+                f.write(f"  分析时间: {summary['statistics']['average_analysis_time']:.2f}秒\n")
             f.write(f"  随机性: {summary['statistics']['average_randomness']:.4f}\n")
             f.write(f"  对称性: {summary['statistics']['average_symmetry']:.4f}\n")
             f.write(f"  可预测性: {summary['statistics']['average_predictability']:.4f}\n")
@@ -176,7 +199,8 @@ class BatchAnalyzer:
                 f.write(f"  对称性: {stats['symmetry']:.4f}\n")
                 f.write(f"  可预测性: {stats['predictability']:.4f}\n")
                 f.write(f"  总体评分: {stats['total_score']:.4f}\n")
-                f.write(f"  分析时间: {stats['analysis_time']:.2f}秒\n")
+                if 'analysis_time' in stats:
+                    f.write(f"  分析时间: {stats['analysis_time']:.2f}秒\n")
                 
                 # 四轨分析结果
                 four_track = data['four_track']
@@ -201,20 +225,46 @@ class BatchAnalyzer:
         # 获取可用常数
         constant_names = self.get_available_constants()
         
-        # 分析每个常数
+        # 加载所有常数，一次批量分析
         results = {}
+        loaded_names = []
+        sequences = []
         for i, constant_name in enumerate(constant_names, 1):
-            print(f"\n[{i}/{len(constant_names)}] 分析: {constant_name}")
-            result = self.analyze_constant(constant_name, max_digits)
+            print(f"\n[{i}/{len(constant_names)}] 加载: {constant_name}")
+            try:
+                digits = self.data_manager.load_sequence(constant_name, max_digits)
+            except Exception as e:
+                print(f"❌ 加载失败: {constant_name} - {str(e)}")
+                digits = None
+            if digits is None or len(digits) == 0:
+                print(f"❌ 无法加载常数: {constant_name}")
+                results[constant_name] = None
+                continue
+            loaded_names.append(constant_name)
+            sequences.append(digits)
+        
+        # 批量分析无法区分单个常数的耗时，只在汇总中记录一次总耗时
+        batch_analysis_time = None
+        try:
+            batch_start = time.time()
+            batch_results = self.analyzer.analyze_batch(sequences) if sequences else []
+            batch_analysis_time = time.time() - batch_start
+            print(f"\n批量分析 {len(sequences)} 个常数耗时: {batch_analysis_time:.2f}秒")
+        except Exception as e:
+            # 批量分析失败时逐个分析，单个常数失败不影响其他常数
+            print(f"\n⚠️ 批量分析失败，改为逐个分析: {str(e)}")
+            batch_results = [self.analyze_digits(constant_name, digits)
+                             for constant_name, digits in zip(loaded_names, sequences)]
+        
+        for constant_name, result in zip(loaded_names, batch_results):
             results[constant_name] = result
             
             # 保存结果
-            if result:
-                self.save_result(constant_name, result)
+            self.save_result(constant_name, result)
         
         # 生成汇总报告
         print("\n生成汇总报告...")
-        summary = self.generate_summary(results)
+        summary = self.generate_summary(results, batch_analysis_time)
         self.save_summary(summary)
         
         total_time = time.time() - start_time
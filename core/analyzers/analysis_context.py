@@ -0,0 +1,85 @@
+# core/analyzers/analysis_context.py
+# 分析上下文（同一输入的共享预计算）
+
+from typing import Any, Dict, List, Union
+import numpy as np
+from core.analyzers.ngram_spectrum import MAX_CODE_LENGTH, NGramSpectrum
+from core.data.digit_sequence import DigitSequence, as_digit_array
+
+class AnalysisContext:
+    """
+    分析上下文
+    
+    每个输入构建一次，交给复合分析器中的所有子分析器。
+    输入只在构建时校验一次；数字直方图、相邻数字对计数、反向视图、n元组频谱和列表形式
+    都在第一次访问时计算并缓存，多个分析器使用时不重复计算。共享的数组为只读。
+    缓存的计算是幂等的，多个线程同时首次访问时可能重复计算，但得到的结果相同。
+    results 保存已完成的分析器结果（名称 -> 结果），声明了 inputs 的分析器从中读取上游结果。
+    """
+    
+    def __init__(self, digits: Union[List[int], DigitSequence]):
+        """
+        初始化分析上下文
+        
+        Args:
+            digits: 数字序列
+        
+        Raises:
+            ValueError: 包含非法数字
+        """
+        self.sequence = DigitSequence(digits)
+        self.digits = as_digit_array(self.sequence)
+        self.length = len(self.digits)
+        self._histogram = None
+        self._parity_bigrams = None
+        self._spectrum = None
+        self._list = None
+        self.results: Dict[str, Dict[str, Any]] = {}
+    
+    @property
+    def histogram(self) -> np.ndarray:
+        """数字直方图（长度10的int64数组）"""
+        if self._histogram is None:
+            self._histogram = np.bincount(self.digits, minlength=10).astype(np.int64)
+            self._histogram.setflags(write=False)
+        return self._histogram
+    
+    @property
+    def parity_bigrams(self) -> np.ndarray:
+        """
+        相邻数字对直方图，按起始位置奇偶区分
+        
+        形状为 (2, 100)，[p][10*a+b] 为起始位置奇偶为p的数字对(a, b)的数量。
+        """
+        if self._parity_bigrams is None:
+            parity_bigrams = np.zeros((2, 100), dtype=np.int64)
+            if self.length >= 2:
+                pair_codes = self.digits[:-1].astype(np.intp) * 10 + self.digits[1:]
+                parity_bigrams[0] = np.bincount(pair_codes[0::2], minlength=100)
+                parity_bigrams[1] = np.bincount(pair_codes[1::2], minlength=100)
+            parity_bigrams.setflags(write=False)
+            self._parity_bigrams = parity_bigrams
+        return self._parity_bigrams
+    
+    @property
+    def bigrams(self) -> np.ndarray:
+        """相邻数字转移矩阵（10×10），[a][b] 为数字a后紧跟数字b的次数"""
+        return self.parity_bigrams.sum(axis=0).reshape(10, 10)
+    
+    @property
+    def reversed_digits(self) -> np.ndarray:
+        """反向序列（不复制的视图）"""
+        return self.digits[::-1]
+    
+    @property
+    def spectrum(self) -> NGramSpectrum:
+        """n元组频谱（各长度的计数在首次查询时计算）"""
+        if self._spectrum is None:
+            self._spectrum = NGramSpectrum(self.digits, max_length=MAX_CODE_LENGTH)
+        return self._spectrum
+    
+    def tolist(self) -> List[int]:
+        """列表形式（逐项处理的分析器使用）"""
+        if self._list is None:
+            self._list = self.sequence.tolist()
+        return self._list
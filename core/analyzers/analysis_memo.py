@@ -0,0 +1,210 @@
+# core/analyzers/analysis_memo.py
+# 分析结果备忘（进程内共享的LRU缓存）
+
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Union
+import numpy as np
+
+# 默认保留的分析结果个数
+DEFAULT_MAX_ENTRIES = 32
+
+# 默认保留的结果总字节数（按序列化后的大小计算）
+DEFAULT_MAX_BYTES = 256 << 20
+
+def content_hash(digits: np.ndarray) -> str:
+    """
+    计算数字缓冲区的内容哈希
+    
+    Args:
+        digits: uint8 数字数组
+    
+    Returns:
+        BLAKE2b 摘要（十六进制）
+    """
+    return hashlib.blake2b(np.ascontiguousarray(digits).data, digest_size=16).hexdigest()
+
+def config_fingerprint(config: Any) -> str:
+    """
+    计算配置的内容指纹
+    
+    递归处理字典、列表、元组、集合、NumPy数组和带实例属性的对象（只取公开属性），
+    配置相同的分析器得到相同的指纹。
+    
+    Args:
+        config: 配置（通常为 BaseAnalyzer.get_config() 的结果）
+    
+    Returns:
+        BLAKE2b 摘要（十六进制）
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _feed_config(digest, config, set())
+    return digest.hexdigest()
+
+def _feed_config(digest: Any, value: Any, seen: set) -> None:
+    """将配置值按类型写入摘要"""
+    if isinstance(value, np.ndarray):
+        digest.update(f'ndarray:{value.dtype}:{value.shape}:'.encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (dict, list, tuple, set, frozenset)):
+        if isinstance(value, dict):
+            items = sorted(value.items(), key=lambda item: repr(item[0]))
+        elif isinstance(value, (set, frozenset)):
+            items = sorted(value, key=repr)
+        else:
+            items = value
+        digest.update(f'{type(value).__name__}:{len(value)}['.encode())
+        for item in items:
+            _feed_config(digest, item, seen)
+        digest.update(b']')
+    elif hasattr(value, '__dict__') and not callable(value) and id(value) not in seen:
+        seen.add(id(value))
+        digest.update(f'{type(value).__module__}.{type(value).__qualname__}:'.encode())
+        _feed_config(digest, {name: item for name, item in vars(value).items()
+                              if not name.startswith('_')}, seen)
+        seen.discard(id(value))
+    else:
+        digest.update(f'{type(value).__qualname__}:{value!r};'.encode())
+
+def _freeze(value: Any) -> Union[bytes, Dict[str, bytes]]:
+    """序列化结果的一个顶层项；字典的各子项单独序列化，以便只取出需要的子项"""
+    if isinstance(value, dict):
+        return {key: pickle.dumps(item, pickle.HIGHEST_PROTOCOL) for key, item in value.items()}
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+def _thaw(frozen: Union[bytes, Dict[str, bytes]], keys: Optional[Iterable[str]] = None) -> Any:
+    """还原 _freeze() 的结果（keys 为需要的子项，None表示全部）"""
+    if isinstance(frozen, bytes):
+        return pickle.loads(frozen)
+    if keys is not None:
+        frozen = {key: frozen[key] for key in keys if key in frozen}
+    return {key: pickle.loads(data) for key, data in frozen.items()}
+
+class AnalysisMemo:
+    """
+    分析结果备忘
+    
+    以 (输入内容哈希, 分析器版本和配置, 请求字段) 为键保存分析结果，
+    结果个数超过 max_entries 或总字节数超过 max_bytes 时淘汰最久未使用的结果。
+    结果按顶层项（字典再按子项）分别序列化保存：查询时返回新的副本，调用方修改返回值不影响备忘，
+    也可以只取出需要的项。单个结果超过 max_bytes 时不保存。
+    进程内的复合分析器默认共享同一个实例，因此界面、预测器和分类器对同一输入只分析一次。
+    访问加锁，可在多线程中使用。
+    """
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        初始化分析结果备忘
+        
+        Args:
+            max_entries: 保留的结果个数上限（0表示不保留）
+            max_bytes: 保留的结果总字节数上限
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Dict[str, bytes]]' = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: Hashable,
+            fields: Optional[Dict[str, Optional[Iterable[str]]]] = None) -> Optional[Dict[str, Any]]:
+        """
+        查询分析结果
+        
+        Args:
+            key: 键
+            fields: 需要的顶层项 -> 其中需要的子项（None表示整项）；为None时返回全部
+        
+        Returns:
+            分析结果的副本（只包含 fields 中存在的项），不存在时返回None
+        """
+        with self._lock:
+            frozen = self._entries.get(key)
+            if frozen is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        if fields is None:
+            fields = dict.fromkeys(frozen)
+        return {name: _thaw(frozen[name], keys) for name, keys in fields.items() if name in frozen}
+    
+    def put(self, key: Hashable, result: Dict[str, Any]) -> None:
+        """
+        保存分析结果（无法序列化或超过字节数上限的结果不保存）
+        
+        Args:
+            key: 键
+            result: 分析结果
+        """
+        if self.max_entries <= 0:
+            return
+        try:
+            frozen = {name: _freeze(value) for name, value in result.items()}
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return
+        size = sum(len(data) if isinstance(data, bytes) else sum(map(len, data.values()))
+                   for data in frozen.values())
+        
+        with self._lock:
+            self._discard(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = frozen
+            self._sizes[key] = size
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+    
+    def _discard(self, key: Hashable) -> None:
+        """移除一个结果（调用方持有锁）"""
+        if key in self._entries:
+            del self._entries[key]
+            self._bytes -= self._sizes.pop(key)
+    
+    def clear(self) -> None:
+        """清空备忘"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取备忘统计
+        
+        Returns:
+            结果个数、总字节数、命中次数和未命中次数
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+    
+    def __len__(self) -> int:
+        """备忘中的结果个数"""
+        return len(self._entries)
+
+# 进程内共享的分析结果备忘
+_SHARED_MEMO = AnalysisMemo()
+
+def get_analysis_memo() -> AnalysisMemo:
+    """
+    获取进程内共享的分析结果备忘
+    
+    Returns:
+        共享的 AnalysisMemo 实例
+    """
+    return _SHARED_MEMO
@@ -0,0 +1,145 @@
+# core/analyzers/analysis_scheduler.py
+# 分析器依赖图调度
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Set, Tuple
+from core.analyzers.analysis_context import AnalysisContext
+from core.analyzers.base_analyzer import BaseAnalyzer
+from core.analyzers.sharding import MIN_SHARD_SIZE, analyze_shared_task, share_digits
+
+# 支持的执行方式
+EXECUTORS = (None, 'thread', 'process')
+
+def _timed_analyze(analyzer: BaseAnalyzer, context: AnalysisContext,
+                   fields: Optional[Set[str]] = None) -> Tuple[Dict[str, Any], float]:
+    """运行一个分析器并返回 (结果, 耗时秒数)"""
+    start = time.perf_counter()
+    result = analyzer.analyze_fields(context, fields)
+    return result, time.perf_counter() - start
+
+def analyzer_dependencies(analyzers: Dict[str, BaseAnalyzer], names: List[str]) -> Dict[str, Set[str]]:
+    """
+    由分析器声明的 inputs 构建依赖图
+    
+    Args:
+        analyzers: 名称 -> 分析器
+        names: 参与调度的分析器名称
+    
+    Returns:
+        名称 -> 直接依赖的分析器名称集合
+    
+    Raises:
+        ValueError: 依赖的分析器不存在或不参与调度
+    """
+    dependencies = {}
+    for name in names:
+        upstream = {field.partition('.')[0] for field in analyzers[name].inputs}
+        missing = upstream - set(names)
+        if missing:
+            raise ValueError(f"分析器 {name} 依赖的分析器不可用: {sorted(missing)}")
+        dependencies[name] = upstream
+    return dependencies
+
+def topological_order(dependencies: Dict[str, Set[str]]) -> List[str]:
+    """
+    依赖图的拓扑顺序（没有依赖关系的节点保持原顺序）
+    
+    Args:
+        dependencies: 名称 -> 直接依赖的名称集合
+    
+    Returns:
+        每个节点都排在其依赖之后的名称列表
+    
+    Raises:
+        ValueError: 依赖图中存在环
+    """
+    order = []
+    done = set()
+    remaining = list(dependencies)
+    while remaining:
+        ready = [name for name in remaining if dependencies[name] <= done]
+        if not ready:
+            raise ValueError(f"分析器依赖存在环: {remaining}")
+        order.extend(ready)
+        done.update(ready)
+        remaining = [name for name in remaining if name not in done]
+    return order
+
+def run_plan(analyzers: Dict[str, BaseAnalyzer], plan: Dict[str, Optional[Set[str]]],
+             context: AnalysisContext, executor: str = None, max_workers: int = None,
+             min_process_size: int = MIN_SHARD_SIZE) -> Dict[str, Tuple[Dict[str, Any], float]]:
+    """
+    按依赖图运行计划中的分析器
+    
+    依赖都已完成的节点立即提交，互不依赖的节点并行运行。每个节点完成后结果写入
+    context.results，下游分析器从中读取声明的输入。
+    executor 为 'process' 时，parallel_backend 为 'process' 的分析器在进程池中运行，
+    输入通过共享内存传递，上游结果随任务一起发送。
+    
+    Args:
+        analyzers: 名称 -> 分析器
+        plan: 需要运行的分析器名称 -> 需要的结果字段集合（None表示完整结果）
+        context: 分析上下文
+        executor: 执行方式（None表示在当前线程中按拓扑顺序依次运行，'thread' 或 'process'）
+        max_workers: 线程池和进程池的最大工作数（None表示每个分析器一个）
+        min_process_size: 使用进程池的最小序列长度，较短的序列在线程中运行
+    
+    Returns:
+        名称 -> (结果, 耗时秒数)，按 plan 的顺序排列
+    
+    Raises:
+        ValueError: 依赖不可用或存在环
+    """
+    dependencies = analyzer_dependencies(analyzers, list(plan))
+    order = topological_order(dependencies)
+    outcomes = {}
+    
+    if executor is None:
+        for name in order:
+            outcomes[name] = _timed_analyze(analyzers[name], context, plan[name])
+            context.results[name] = outcomes[name][0]
+        return {name: outcomes[name] for name in plan}
+    
+    process_names = set()
+    if executor == 'process' and context.length >= min_process_size:
+        process_names = {name for name in plan if analyzers[name].parallel_backend == 'process'}
+    thread_count = len(plan) - len(process_names)
+    
+    shared = None
+    process_pool = nullcontext()
+    if process_names:
+        # 纯 Python 分析器在子进程中直接读取共享内存中的输入
+        shared = share_digits(context.digits)
+        process_pool = ProcessPoolExecutor(max_workers=max_workers or len(process_names))
+    thread_pool = ThreadPoolExecutor(max_workers=max_workers or max(thread_count, 1))
+    try:
+        with process_pool as processes, thread_pool as threads:
+            waiting = {name: set(dependencies[name]) for name in order}
+            running = {}
+            while waiting or running:
+                for name in [name for name, upstream in waiting.items() if not upstream]:
+                    del waiting[name]
+                    if name in process_names:
+                        upstream_results = {dependency: context.results[dependency]
+                                            for dependency in dependencies[name]}
+                        future = processes.submit(analyze_shared_task, analyzers[name], shared.name,
+                                                  context.length, plan[name], upstream_results)
+                    else:
+                        future = threads.submit(_timed_analyze, analyzers[name], context, plan[name])
+                    running[future] = name
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    outcomes[name] = future.result()
+                    context.results[name] = outcomes[name][0]
+                    for upstream in waiting.values():
+                        upstream.discard(name)
+    finally:
+        if shared is not None:
+            shared.close()
+            shared.unlink()
+    
+    return {name: outcomes[name] for name in plan}
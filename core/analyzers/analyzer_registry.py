@@ -0,0 +1,96 @@
+# core/analyzers/analyzer_registry.py
+# 分析器插件注册表
+
+from typing import Callable, Dict, List, Optional, Tuple
+from core.analyzers.base_analyzer import BaseAnalyzer
+from core.analyzers.block_entropy_analyzer import BlockEntropyAnalyzer
+from core.analyzers.complexity_analyzer import ComplexityAnalyzer
+from core.analyzers.four_track_analyzer import FourTrackAnalyzer
+from core.analyzers.pattern_analyzer import PatternAnalyzer
+from core.analyzers.spectral_analyzer import SpectralAnalyzer
+from core.analyzers.statistical_analyzer import StatisticalAnalyzer
+
+# 名称 -> (创建分析器实例的工厂, 是否默认加入复合分析器)，按注册顺序排列
+_REGISTRY: Dict[str, Tuple[Callable[[], BaseAnalyzer], bool]] = {}
+
+def register_analyzer(name: str, factory: Optional[Callable[[], BaseAnalyzer]] = None,
+                      default: bool = True):
+    """
+    注册分析器插件
+    
+    分析器通过类属性 inputs / outputs 声明依赖的其他分析器字段和自己产生的字段，
+    复合分析器据此构建依赖图并调度。可以直接调用，也可以作为类装饰器使用：
+    @register_analyzer('name')。
+    
+    Args:
+        name: 分析器名称（复合分析结果中的键）
+        factory: 无参数创建分析器实例的工厂（通常是分析器类）
+        default: 是否默认加入新建的复合分析器
+    
+    Returns:
+        factory；作为装饰器使用时返回装饰器
+    
+    Raises:
+        ValueError: 名称已注册
+    """
+    def decorator(analyzer_factory: Callable[[], BaseAnalyzer]) -> Callable[[], BaseAnalyzer]:
+        if name in _REGISTRY:
+            raise ValueError(f"分析器已注册: {name}")
+        _REGISTRY[name] = (analyzer_factory, default)
+        return analyzer_factory
+    
+    if factory is None:
+        return decorator
+    return decorator(factory)
+
+def unregister_analyzer(name: str) -> None:
+    """
+    注销分析器插件
+    
+    Args:
+        name: 分析器名称
+    """
+    _REGISTRY.pop(name, None)
+
+def registered_analyzers() -> List[str]:
+    """
+    获取已注册的分析器名称
+    
+    Returns:
+        按注册顺序排列的名称列表
+    """
+    return list(_REGISTRY)
+
+def create_analyzer(name: str) -> BaseAnalyzer:
+    """
+    创建已注册的分析器实例
+    
+    Args:
+        name: 分析器名称
+    
+    Returns:
+        分析器实例
+    
+    Raises:
+        KeyError: 名称未注册
+    """
+    if name not in _REGISTRY:
+        raise KeyError(f"未注册的分析器: {name}")
+    return _REGISTRY[name][0]()
+
+def create_default_analyzers() -> Dict[str, BaseAnalyzer]:
+    """
+    创建所有默认分析器的实例
+    
+    Returns:
+        名称 -> 分析器实例，按注册顺序排列
+    """
+    return {name: factory() for name, (factory, default) in _REGISTRY.items() if default}
+
+# 内置分析器
+register_analyzer('four_track', FourTrackAnalyzer)
+register_analyzer('pattern', PatternAnalyzer)
+register_analyzer('statistical', StatisticalAnalyzer)
+register_analyzer('spectral', SpectralAnalyzer)
+register_analyzer('complexity', ComplexityAnalyzer)
+register_analyzer('block_entropy', BlockEntropyAnalyzer, default=False)
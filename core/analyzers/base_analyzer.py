@@ -2,13 +2,25 @@
 # 分析器基类
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
+from core.analyzers.analysis_context import AnalysisContext
+from core.data.digit_sequence import DigitSequence, is_digit_list
 
 class BaseAnalyzer(ABC):
     """分析器基类"""
     
+    # 复合分析器并行运行时的执行方式：主要在 NumPy/C 扩展中计算（释放GIL）的分析器用 'thread'，
+    # 以纯 Python 循环为主的分析器用 'process'
+    parallel_backend = 'thread'
+    
+    # 依赖的其他分析器字段（'分析器.结果字段'），运行时从 context.results 读取
+    inputs: Tuple[str, ...] = ()
+    
+    # 产生的结果字段（为空时不检查请求的字段）
+    outputs: Tuple[str, ...] = ()
+    
     @abstractmethod
-    def analyze(self, digits: List[int]) -> Dict[str, Any]:
+    def analyze(self, digits: Union[List[int], DigitSequence]) -> Dict[str, Any]:
         """
         分析数字序列
         
@@ -40,7 +52,64 @@ class BaseAnalyzer(ABC):
         """
         pass
     
-    def validate_input(self, digits: List[int]) -> bool:
+    def get_config(self) -> Dict[str, Any]:
+        """
+        获取分析器配置
+        
+        默认为全部公开的实例属性（以下划线开头的流式状态和内部缓存除外）。
+        复合分析器的结果备忘以此区分配置不同的同名分析器。
+        
+        Returns:
+            属性名 -> 值
+        """
+        return {name: value for name, value in vars(self).items() if not name.startswith('_')}
+    
+    def analyze_context(self, context: AnalysisContext) -> Dict[str, Any]:
+        """
+        使用共享的分析上下文分析数字序列
+        
+        默认对上下文中已校验的序列调用 analyze()；能复用上下文中直方图、数字对计数或
+        n元组频谱的分析器可以重写此方法，结果应与 analyze() 一致。
+        
+        Args:
+            context: 分析上下文
+        
+        Returns:
+            分析结果
+        """
+        return self.analyze(context.sequence)
+    
+    def analyze_fields(self, context: AnalysisContext, fields: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        只计算需要的结果字段
+        
+        默认计算完整结果；能跳过昂贵部分的分析器可以重写此方法，
+        返回的结果至少包含 fields 中的字段，且取值与 analyze() 一致。
+        
+        Args:
+            context: 分析上下文
+            fields: 需要的结果字段（None表示全部）
+        
+        Returns:
+            分析结果
+        """
+        return self.analyze_context(context)
+    
+    def analyze_batch(self, sequences: List[Union[List[int], DigitSequence]]) -> List[Dict[str, Any]]:
+        """
+        批量分析多个数字序列
+        
+        默认逐个调用 analyze()，支持整体向量化的分析器可以重写此方法。
+        
+        Args:
+            sequences: 数字序列列表
+            
+        Returns:
+            与输入顺序一致的分析结果列表
+        """
+        return [self.analyze(digits) for digits in sequences]
+    
+    def validate_input(self, digits: Union[List[int], DigitSequence]) -> bool:
         """
         验证输入数据
         
@@ -50,10 +119,14 @@ class BaseAnalyzer(ABC):
         Returns:
             是否有效
         """
+        # DigitSequence 在构造时已校验，无需逐元素扫描
+        if isinstance(digits, DigitSequence):
+            return len(digits) > 0
+        
         if not isinstance(digits, list):
             return False
         
-        if not all(isinstance(d, int) and 0 <= d <= 9 for d in digits):
+        if not is_digit_list(digits):
             return False
         
         return len(digits) > 0
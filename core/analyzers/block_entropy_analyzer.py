@@ -0,0 +1,141 @@
+# core/analyzers/block_entropy_analyzer.py
+# 块熵与熵率分析器
+
+from typing import Dict, List, Any, Union
+import numpy as np
+from core.analyzers.analysis_context import AnalysisContext
+from core.analyzers.base_analyzer import BaseAnalyzer
+from core.analyzers.ngram_spectrum import MAX_CODE_LENGTH, NGramSpectrum
+from core.data.digit_sequence import DigitSequence, as_digit_array
+
+class BlockEntropyAnalyzer(BaseAnalyzer):
+    """
+    块熵分析器
+    
+    H_k 为长度k的块（k元组）经验分布的香农熵，条件熵 h_k = H_k - H_(k-1)
+    是已知前 k-1 位时下一位的不确定度，随k增大单调不增并趋于熵率。
+    单个数字均匀分布（H_1 约3.32比特）的序列若存在高阶结构，h_k 会明显下降。
+    经验分布的熵（插入估计）系统性偏低，约低 (K-1)/(2N ln 2) 比特（K为出现的不同块个数，
+    N为样本数），k较大时偏差明显；条件熵和熵率由加上该项的 Miller–Madow 修正块熵计算。
+    k元组计数来自 NGramSpectrum，可传入已有的频谱对象复用其计数缓存。
+    """
+    
+    # 结果字段
+    outputs = ('block_entropies', 'corrected_block_entropies', 'conditional_entropies', 'block_entropy_rates',
+               'distinct_blocks', 'reliable_length', 'entropy_rate', 'redundancy', 'total_digits')
+    
+    def __init__(self, max_length: int = 12, min_samples_per_block: int = 10, bias_correction: bool = True):
+        """
+        初始化块熵分析器
+        
+        Args:
+            max_length: 最大块长度
+            min_samples_per_block: 估计熵率时，块长度k需满足样本数 >= 该值 * 不同块个数
+            bias_correction: 条件熵和熵率是否使用 Miller–Madow 修正的块熵
+        """
+        if not 1 <= max_length <= MAX_CODE_LENGTH:
+            raise ValueError(f"max_length 必须在1到{MAX_CODE_LENGTH}之间: {max_length}")
+        self.max_length = max_length
+        self.min_samples_per_block = min_samples_per_block
+        self.bias_correction = bias_correction
+    
+    def analyze(self, digits: Union[List[int], DigitSequence], spectrum: NGramSpectrum = None) -> Dict[str, Any]:
+        """
+        分析数字序列的块熵和熵率
+        
+        Args:
+            digits: 数字序列
+            spectrum: 同一序列的n元组频谱（可选，长度不超过其 max_length 的块复用其缓存）
+        
+        Returns:
+            分析结果（block_entropies 为插入估计，corrected_block_entropies 为修正后的块熵）
+        """
+        if not self.validate_input(digits):
+            return self._create_error_response()
+        
+        digits_array = as_digit_array(DigitSequence(self.preprocess(digits)))
+        n = len(digits_array)
+        max_length = min(self.max_length, n)
+        if spectrum is None or spectrum.max_length < max_length:
+            local = NGramSpectrum(digits_array, max_length)
+        else:
+            local = spectrum
+        shared = spectrum if spectrum is not None else local
+        
+        block_entropies = {}
+        corrected_block_entropies = {}
+        conditional_entropies = {}
+        distinct_blocks = {}
+        reliable_length = 1
+        previous = 0.0
+        for k in range(1, max_length + 1):
+            source = shared if k <= shared.max_length else local
+            counts = source.count_values(k)
+            samples = n - k + 1
+            block_entropies[k] = self._shannon_entropy(counts, samples)
+            entropy = block_entropies[k]
+            if self.bias_correction:
+                entropy += self._miller_madow_correction(len(counts), samples)
+            corrected_block_entropies[k] = entropy
+            conditional_entropies[k] = max(0.0, entropy - previous)
+            distinct_blocks[k] = int(len(counts))
+            if samples >= self.min_samples_per_block * len(counts):
+                reliable_length = k
+            previous = entropy
+        
+        entropy_rate = conditional_entropies[reliable_length]
+        return {
+            'block_entropies': block_entropies,
+            'corrected_block_entropies': corrected_block_entropies,
+            'conditional_entropies': conditional_entropies,
+            'block_entropy_rates': {k: entropy / k for k, entropy in block_entropies.items()},
+            'distinct_blocks': distinct_blocks,
+            'reliable_length': reliable_length,
+            'entropy_rate': entropy_rate,
+            'redundancy': max(0.0, 1 - entropy_rate / float(np.log2(10))),
+            'total_digits': n
+        }
+    
+    def analyze_context(self, context: AnalysisContext) -> Dict[str, Any]:
+        """
+        使用共享的分析上下文分析（复用上下文中的n元组频谱）
+        
+        Args:
+            context: 分析上下文
+        
+        Returns:
+            分析结果
+        """
+        if context.length == 0:
+            return self._create_error_response()
+        return self.analyze(context.sequence, context.spectrum)
+    
+    def _shannon_entropy(self, counts: np.ndarray, total: int) -> float:
+        """由计数计算香农熵（比特）"""
+        if total <= 0:
+            return 0.0
+        probabilities = counts[counts > 0] / total
+        return max(0.0, float(-np.dot(probabilities, np.log2(probabilities))))
+    
+    def _miller_madow_correction(self, distinct: int, total: int) -> float:
+        """插入估计的一阶偏差修正 (K-1)/(2N ln 2)（比特）"""
+        if total <= 0 or distinct <= 1:
+            return 0.0
+        return (distinct - 1) / (2 * total * float(np.log(2)))
+    
+    def _create_error_response(self) -> Dict[str, Any]:
+        """创建无效输入的结果"""
+        return {
+            'error': 'Invalid input',
+            'block_entropies': {},
+            'conditional_entropies': {},
+            'entropy_rate': 0
+        }
+    
+    def get_name(self) -> str:
+        """获取分析器名称"""
+        return "BlockEntropyAnalyzer"
+    
+    def get_version(self) -> str:
+        """获取分析器版本"""
+        return "1.1.0"
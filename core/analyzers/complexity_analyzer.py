@@ -0,0 +1,277 @@
+# core/analyzers/complexity_analyzer.py
+# 复杂度分析器（LZ76复杂度与压缩率）
+
+import lzma
+import zlib
+from typing import Dict, List, Any, Tuple, Union
+import numpy as np
+from core.analyzers.base_analyzer import BaseAnalyzer
+from core.analyzers.suffix_array import common_prefix_length, previous_factor_sources
+from core.data.data_reader import DataReader
+from core.data.digit_sequence import DigitSequence, as_digit_array
+
+# 随机十进制数字的熵下界（字节/位）
+DIGIT_ENTROPY_BYTES = float(np.log2(10)) / 8
+
+class ComplexityStream:
+    """
+    复杂度流式分析的状态
+    
+    保存未满一块的待处理数字、上一块（下一块LZ76分解的历史）、已完成的LZ76短语数，
+    以及 zlib/lzma 压缩器。压缩器逐块输入，只累计输出字节数，不保留压缩结果。
+    """
+    
+    def __init__(self, zlib_level: int, lzma_preset: int, compress: bool):
+        """
+        初始化流式状态
+        
+        Args:
+            zlib_level: zlib 压缩级别
+            lzma_preset: lzma 预设级别
+            compress: 是否计算压缩率
+        """
+        self.length = 0
+        self.phrases = 0
+        # 各块的 短语数 * log10(块长) 之和，用于归一化
+        self.weighted_phrases = 0.0
+        self.blocks = 0
+        self.history = np.zeros(0, dtype=np.uint8)
+        # 下一块的分解起点（相对下一块开头）；为负时上一块末尾有一个延续到下一块的未完成短语
+        self.resume = 0
+        self.pending: List[np.ndarray] = []
+        self.pending_length = 0
+        self.zlib_compressor = zlib.compressobj(zlib_level) if compress else None
+        self.lzma_compressor = lzma.LZMACompressor(preset=lzma_preset) if compress else None
+        self.zlib_bytes = 0
+        self.lzma_bytes = 0
+
+class ComplexityAnalyzer(BaseAnalyzer):
+    """
+    复杂度分析器
+    
+    LZ76复杂度为按 Lempel-Ziv (1976) 穷举历史分解得到的短语数：
+    每个短语是在更早位置出现过的最长子串再加一位。后缀数组（O(n) 内存）给出每个位置的
+    两个候选来源，分解时只在短语起点比较候选来源，比较的总长度为 O(n)。
+    超过 block_size 的输入逐块分解，每块以前一块为历史，短语跨块延续：
+    输入不超过两块时与整体分解一致（lz76_exact 为 True），更长时更早的历史不可见，
+    结果为整体分解短语数的上界。
+    压缩率由 zlib/lzma 压缩器逐块输入得到，内存占用只与块长有关。
+    """
+    
+    # 结果字段
+    outputs = ('lz76_complexity', 'lz76_normalized', 'lz76_exact', 'blocks', 'total_digits', 'zlib_ratio', 'lzma_ratio',
+               'zlib_normalized', 'lzma_normalized')
+    
+    def __init__(self, block_size: int = 1 << 20, zlib_level: int = 6, lzma_preset: int = 1,
+                 compress: bool = True):
+        """
+        初始化复杂度分析器
+        
+        Args:
+            block_size: LZ76分解的块长度
+            zlib_level: zlib 压缩级别
+            lzma_preset: lzma 预设级别（越高越慢，压缩率越接近熵下界）
+            compress: 是否计算压缩率
+        """
+        if block_size < 1:
+            raise ValueError(f"block_size 必须为正数: {block_size}")
+        self.block_size = block_size
+        self.zlib_level = zlib_level
+        self.lzma_preset = lzma_preset
+        self.compress = compress
+        self._stream_state = None
+    
+    def analyze(self, digits: Union[List[int], DigitSequence]) -> Dict[str, Any]:
+        """
+        分析数字序列的LZ76复杂度和压缩率
+        
+        Args:
+            digits: 数字序列
+        
+        Returns:
+            分析结果
+        """
+        if not self.validate_input(digits):
+            return self._create_error_response()
+        
+        self.begin()
+        self.feed(DigitSequence(self.preprocess(digits)))
+        return self.finish()
+    
+    def begin(self) -> None:
+        """开始流式分析，之后通过 feed() 逐块输入，最后调用 finish() 获取结果"""
+        self._stream_state = ComplexityStream(self.zlib_level, self.lzma_preset, self.compress)
+    
+    def feed(self, chunk: Union[List[int], DigitSequence]) -> None:
+        """
+        输入一块数字
+        
+        凑满 block_size 位即做一次LZ76分解，待处理数字不超过一块。
+        
+        Args:
+            chunk: 数字块
+        
+        Raises:
+            RuntimeError: 未调用 begin()
+            ValueError: 数字块包含非法数字
+        """
+        state = self._stream_state
+        if state is None:
+            raise RuntimeError("请先调用 begin() 开始流式分析")
+        digits_array = as_digit_array(DigitSequence(chunk))
+        if len(digits_array) == 0:
+            return
+        
+        state.length += len(digits_array)
+        if state.zlib_compressor is not None:
+            text = (digits_array + ord('0')).tobytes()
+            state.zlib_bytes += len(state.zlib_compressor.compress(text))
+            state.lzma_bytes += len(state.lzma_compressor.compress(text))
+        
+        state.pending.append(digits_array)
+        state.pending_length += len(digits_array)
+        if state.pending_length >= self.block_size:
+            buffer = np.concatenate(state.pending)
+            full = len(buffer) - len(buffer) % self.block_size
+            for start in range(0, full, self.block_size):
+                self._add_block(state, buffer[start:start + self.block_size])
+            state.pending = [buffer[full:]]
+            state.pending_length = len(buffer) - full
+    
+    def finish(self) -> Dict[str, Any]:
+        """
+        结束流式分析
+        
+        Returns:
+            分析结果（没有输入数字时返回错误结果）
+        """
+        state = self._stream_state
+        if state is None:
+            raise RuntimeError("请先调用 begin() 开始流式分析")
+        self._stream_state = None
+        if state.length == 0:
+            return self._create_error_response()
+        if state.pending_length:
+            self._add_block(state, np.concatenate(state.pending), final=True)
+        elif state.resume < 0:
+            # 未完成的短语一直匹配到输入末尾，即最后一个短语
+            state.phrases += 1
+            state.weighted_phrases += float(np.log10(len(state.history))) if len(state.history) > 1 else 1
+        
+        result = {
+            'lz76_complexity': state.phrases,
+            'lz76_normalized': state.weighted_phrases / state.length,
+            'lz76_exact': state.blocks <= 2,
+            'blocks': state.blocks,
+            'total_digits': state.length
+        }
+        if state.zlib_compressor is not None:
+            zlib_ratio = (state.zlib_bytes + len(state.zlib_compressor.flush())) / state.length
+            lzma_ratio = (state.lzma_bytes + len(state.lzma_compressor.flush())) / state.length
+            result.update({
+                'zlib_ratio': zlib_ratio,
+                'lzma_ratio': lzma_ratio,
+                'zlib_normalized': zlib_ratio / DIGIT_ENTROPY_BYTES,
+                'lzma_normalized': lzma_ratio / DIGIT_ENTROPY_BYTES
+            })
+        return result
+    
+    def analyze_file(self, file_path: str, max_digits: int = None) -> Dict[str, Any]:
+        """
+        流式分析数据文件
+        
+        Args:
+            file_path: 数据文件路径
+            max_digits: 最大分析位数（None表示整个文件）
+        
+        Returns:
+            分析结果
+        """
+        self.begin()
+        for chunk in DataReader().iter_file_chunks(file_path, max_digits):
+            self.feed(chunk)
+        return self.finish()
+    
+    def lz76_complexity(self, digits: Union[List[int], DigitSequence]) -> int:
+        """
+        计算整个序列的LZ76复杂度（不分块）
+        
+        Args:
+            digits: 数字序列
+        
+        Returns:
+            短语数
+        """
+        return self._count_phrases(as_digit_array(DigitSequence(digits)))[0]
+    
+    def _add_block(self, state: ComplexityStream, block: np.ndarray, final: bool = False) -> None:
+        """
+        以上一块为历史分解一块数字并累加短语数
+        
+        Args:
+            state: 流式状态
+            block: 数字块
+            final: 是否为最后一块（否则末尾匹配到块尾的短语留到下一块继续）
+        """
+        offset = len(state.history)
+        text = np.concatenate((state.history, block)) if offset else block
+        start = offset + state.resume
+        carried = 0
+        if start == 0 and state.blocks >= 2:
+            # 短语从历史块开头一直延续到现在，其来源已移出窗口，在块边界处结束
+            carried, start = 1, offset
+        phrases, stop = self._count_phrases(text, start, None if final else offset)
+        phrases += carried
+        state.phrases += phrases
+        # 随机序列的短语数约为 n / log10(n)，归一化后约为1
+        state.weighted_phrases += phrases * float(np.log10(len(text))) if len(text) > 1 else phrases
+        state.blocks += 1
+        state.history = block
+        state.resume = stop - len(text)
+    
+    def _count_phrases(self, digits_array: np.ndarray, start: int = 0,
+                       carry_from: int = None) -> Tuple[int, int]:
+        """
+        LZ76分解：每个短语为最长前置因子再加一位
+        
+        Args:
+            digits_array: 数字数组（start 之前的部分只作为历史）
+            start: 分解起点
+            carry_from: 起点不小于该位置、且匹配到数组末尾的短语不计数，留到下一块继续（None表示不保留）
+        
+        Returns:
+            (短语数, 分解停止的位置)
+        """
+        n = len(digits_array)
+        data = digits_array.astype(np.uint8, copy=False).tobytes()
+        left, right = previous_factor_sources(digits_array)
+        left, right = left.tolist(), right.tolist()
+        position = start
+        phrases = 0
+        while position < n:
+            longest = common_prefix_length(data, position, left[position]) if left[position] >= 0 else 0
+            source = right[position]
+            # 右侧来源只有更长时才需要比较全长
+            if source >= 0 and data[position:position + longest + 1] == data[source:source + longest + 1]:
+                longest = common_prefix_length(data, position, source)
+            if carry_from is not None and position >= carry_from and position + longest >= n:
+                return phrases, position
+            phrases += 1
+            position = min(position + longest + 1, n)
+        return phrases, n
+    
+    def _create_error_response(self) -> Dict[str, Any]:
+        """创建无效输入的结果"""
+        return {
+            'error': 'Invalid input',
+            'lz76_complexity': 0,
+            'lz76_normalized': 0
+        }
+    
+    def get_name(self) -> str:
+        """获取分析器名称"""
+        return "ComplexityAnalyzer"
+    
+    def get_version(self) -> str:
+        """获取分析器版本"""
+        return "1.0.0"
@@ -1,76 +1,341 @@
 # core/analyzers/composite_analyzer.py
 # 复合分析器
 
-from typing import Dict, List, Any
+import time
+from typing import Callable, Dict, Iterable, List, Any, Optional, Set, Tuple, Union
+from core.analyzers.analysis_context import AnalysisContext
+from core.analyzers.analysis_memo import config_fingerprint, content_hash, get_analysis_memo
+from core.analyzers.analysis_scheduler import EXECUTORS, analyzer_dependencies, run_plan, topological_order
+from core.analyzers.analyzer_registry import create_analyzer, create_default_analyzers
 from core.analyzers.base_analyzer import BaseAnalyzer
-from core.analyzers.four_track_analyzer import FourTrackAnalyzer
-from core.analyzers.pattern_analyzer import PatternAnalyzer
-from core.analyzers.statistical_analyzer import StatisticalAnalyzer
+from core.analyzers.incremental_analysis import IncrementalAnalysis
+from core.analyzers.sharding import MIN_SHARD_SIZE
+from core.data.digit_sequence import DigitSequence
+
+# 综合结果中始终存在的子分析器键（对应分析器被移除时为空字典）
+BASE_RESULT_KEYS = ('four_track', 'pattern', 'statistical', 'spectral', 'complexity')
+
+# 综合部分的字段依赖的子分析器字段（'子分析器.结果字段'）
+_SCORE_BASE_FIELDS = {
+    'randomness': ('statistical.entropy',),
+    'pattern_complexity': ('pattern.pattern_density', 'pattern.total_patterns'),
+    'symmetry': ('four_track.track1',),
+    'predictability': ('statistical.correlation', 'pattern.pattern_density')
+}
+DERIVED_FIELDS = {
+    'summary': ('statistical.entropy', 'statistical.digit_distribution', 'statistical.correlation',
+                'pattern.pattern_density', 'pattern.total_patterns', 'four_track.track1'),
+    **{f'scores.{name}': dependencies for name, dependencies in _SCORE_BASE_FIELDS.items()},
+    'scores.lz76_complexity': ('complexity.lz76_normalized',),
+    'scores.compression_ratio': ('complexity.lzma_normalized',),
+    'scores.overall': tuple(field for dependencies in _SCORE_BASE_FIELDS.values() for field in dependencies),
+    'fingerprint': ('statistical.entropy', 'statistical.mean', 'statistical.std', 'statistical.skewness',
+                    'statistical.kurtosis', 'pattern.repetition_score', 'pattern.pair_score',
+                    'pattern.sequential_score', 'pattern.pattern_density', 'four_track.track1',
+                    'four_track.track2', 'four_track.track3', 'four_track.track4',
+                    'spectral.lag1_autocorrelation', 'spectral.spectral_flatness', 'spectral.significant_lags'),
+    'consistency': ('statistical.entropy', 'statistical.correlation', 'pattern.pattern_density',
+                    'four_track.track1')
+}
+
+# scores 部分依赖的全部字段（各项评分的依赖见 DERIVED_FIELDS 中的 'scores.*'）
+SCORE_FIELDS = tuple(dict.fromkeys(field for name, dependencies in DERIVED_FIELDS.items()
+                                   if name.startswith('scores.') for field in dependencies))
 
 class CompositeAnalyzer(BaseAnalyzer):
-    """复合分析器"""
-    
-    def __init__(self):
-        """初始化复合分析器"""
-        self.analyzers = {
-            'four_track': FourTrackAnalyzer(),
-            'pattern': PatternAnalyzer(),
-            'statistical': StatisticalAnalyzer()
+    """
+    复合分析器
+    
+    子分析器来自插件注册表（见 core.analyzers.analyzer_registry），每个分析器用 inputs 声明
+    依赖的其他分析器字段、用 outputs 声明产生的字段；综合部分（summary、scores、fingerprint、
+    consistency 以及 add_section() 添加的部分）同样声明依赖的字段。
+    分析时按依赖图调度：依赖都已完成的分析器即可运行，executor 为 'thread' 时互不依赖的分析器
+    在线程池中并行；'process' 另外把 parallel_backend 为 'process' 的纯 Python 分析器放到进程池中，
+    输入通过共享内存传递。每个子分析器的耗时记录在结果的 'timings' 中。
+    
+    analyze() 可以只请求部分字段：沿依赖图展开后，只运行用到的子分析器，
+    并只让它们计算需要的结果字段（例如不需要模式列表时模式分析器只做计数）。
+    
+    结果保存在进程内共享的分析结果备忘中（键为输入内容哈希、各分析器的版本和配置、综合部分和请求字段），
+    同一输入再次分析时直接返回副本；已有完整结果时，按字段的请求也由完整结果生成。
+    来自备忘的结果与首次分析的结果格式相同，'timings' 为首次分析时记录的耗时；
+    命中次数见 self.memo.get_stats()。
+    """
+    
+    def __init__(self, executor: str = None, max_workers: int = None,
+                 min_process_size: int = MIN_SHARD_SIZE, use_memo: bool = True,
+                 analyzers: Iterable[str] = None):
+        """
+        初始化复合分析器
+        
+        Args:
+            executor: 子分析器的执行方式（None表示依次运行，'thread' 或 'process'）
+            max_workers: 线程池和进程池的最大工作数（None表示每个子分析器一个）
+            min_process_size: 使用进程池的最小序列长度，较短的序列在线程中运行
+            use_memo: 是否使用进程内共享的分析结果备忘
+            analyzers: 使用的已注册分析器名称（None表示全部默认分析器）
+        
+        Raises:
+            ValueError: 不支持的执行方式
+            KeyError: 分析器未注册
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"不支持的执行方式: {executor}，可选: {EXECUTORS}")
+        self.executor = executor
+        self.max_workers = max_workers
+        self.min_process_size = min_process_size
+        self.memo = get_analysis_memo() if use_memo else None
+        if analyzers is None:
+            self.analyzers = create_default_analyzers()
+        else:
+            self.analyzers = {name: create_analyzer(name) for name in analyzers}
+        
+        # 综合部分：名称 -> (由子分析器结果计算该部分的函数, 依赖的字段)
+        self.sections: Dict[str, Tuple[Callable[[Dict[str, Any]], Any], Tuple[str, ...]]] = {
+            'summary': (self._generate_summary, DERIVED_FIELDS['summary']),
+            'scores': (self._calculate_scores, SCORE_FIELDS),
+            'fingerprint': (self._generate_composite_fingerprint, DERIVED_FIELDS['fingerprint']),
+            'consistency': (self._analyze_consistency, DERIVED_FIELDS['consistency'])
         }
     
-    def analyze(self, digits: List[int]) -> Dict[str, Any]:
+    def analyze(self, digits: Union[List[int], DigitSequence],
+                fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         综合分析数字序列
         
         Args:
             digits: 数字序列
+            fields: 需要的字段（None表示全部）。子分析器字段写作 '子分析器.结果字段'
+                （如 'statistical.entropy'、'four_track.track1'），只写子分析器名表示其完整结果；
+                综合部分写作 'summary'、'scores.randomness'、'fingerprint'、'consistency' 等
             
         Returns:
-            综合分析结果
+            综合分析结果。指定 fields 时只包含运行过的子分析器结果和请求的综合部分，
+            其中的取值与完整分析一致
+        
+        Raises:
+            ValueError: 未知字段
         """
+        plan = self.plan_fields(fields) if fields is not None else None
+        
         if not self.validate_input(digits):
             return {
                 'error': 'Invalid input',
                 'four_track': {},
                 'pattern': {},
                 'statistical': {},
+                'spectral': {},
+                'complexity': {},
                 'summary': {}
             }
         
         digits = self.preprocess(digits)
         
+        # 构建一次分析上下文：输入只校验一次，直方图、数字对计数和n元组频谱在子分析器间共享
+        context = AnalysisContext(digits)
+        
+        memo_key = None
+        if self.memo is not None:
+            memo_key = self._memo_key(context, fields)
+            cached = self._lookup_memo(memo_key, plan, fields)
+            if cached is not None:
+                return cached
+        
         # 运行所有分析器
-        results = {}
-        for name, analyzer in self.analyzers.items():
-            results[name] = analyzer.analyze(digits)
+        results, timings = self._run_analyzers(context, plan)
         
-        # 生成综合摘要
-        summary = self._generate_summary(results)
+        if plan is None:
+            composed = self._compose_results(results, timings)
+        else:
+            composed = self._compose_fields(results, timings, fields)
+        if memo_key is not None:
+            self.memo.put(memo_key, composed)
+        return composed
+    
+    def _memo_key(self, context: AnalysisContext, fields: Optional[Iterable[str]]) -> Tuple:
+        """
+        分析结果备忘的键
         
-        # 生成综合评分
-        scores = self._calculate_scores(results)
+        包括输入内容哈希和长度、各分析器的名称、版本和配置指纹、各综合部分的计算函数和依赖，
+        以及请求的字段。内置综合部分（本实例的方法）按函数本身比较，因此不同实例可以共享结果。
+        """
+        analyzers = tuple((name, analyzer.get_name(), analyzer.get_version(),
+                           config_fingerprint(analyzer.get_config()))
+                          for name, analyzer in self.analyzers.items())
+        sections = tuple((name, compute.__func__ if getattr(compute, '__self__', None) is self else compute, inputs)
+                         for name, (compute, inputs) in self.sections.items())
+        requested = tuple(sorted(set(fields))) if fields is not None else None
+        return (content_hash(context.digits), context.length, self.get_version(), analyzers,
+                sections, requested)
+    
+    def _lookup_memo(self, memo_key: Tuple, plan: Optional[Dict[str, Optional[Set[str]]]],
+                     fields: Optional[Iterable[str]]) -> Optional[Dict[str, Any]]:
+        """查询备忘；按字段的请求未命中时尝试由同一输入的完整结果生成（只取出计划中需要的字段）"""
+        cached = self.memo.get(memo_key)
+        if cached is not None or plan is None:
+            return cached
         
-        # 生成综合指纹
-        fingerprint = self._generate_composite_fingerprint(results)
+        full = self.memo.get(memo_key[:-1] + (None,), fields=dict(plan, timings=None))
+        if full is None or any(name not in full for name in plan):
+            return None
+        timings = full.pop('timings', {})
+        return self._compose_fields(full, {name: timings[name] for name in plan if name in timings}, fields)
+    
+    def plan_fields(self, fields: Iterable[str]) -> Dict[str, Optional[Set[str]]]:
+        """
+        根据请求的字段生成依赖计划
         
-        # 分析一致性
-        consistency = self._analyze_consistency(results)
+        综合部分展开为其依赖的字段，子分析器再展开其 inputs 中声明的上游字段，
+        没有被任何请求用到的子分析器不出现在计划中。
         
-        return {
-            'four_track': results['four_track'],
-            'pattern': results['pattern'],
-            'statistical': results['statistical'],
-            'summary': summary,
-            'scores': scores,
-            'fingerprint': fingerprint,
-            'consistency': consistency,
-            'analyzers': {
-                name: {
-                    'version': analyzer.get_version()
-                }
-                for name, analyzer in self.analyzers.items()
+        Args:
+            fields: 需要的字段
+        
+        Returns:
+            需要运行的子分析器名 -> 需要的结果字段集合（None表示完整结果），按 self.analyzers 的顺序
+        
+        Raises:
+            ValueError: 未知字段
+        """
+        needed: Dict[str, Optional[Set[str]]] = {}
+        pending = list(fields)
+        while pending:
+            field = pending.pop()
+            section, _, key = field.partition('.')
+            if section in self.sections:
+                # 子键有单独的依赖时只展开子键的依赖（如 'scores.randomness' 只需要熵）
+                if key and field in DERIVED_FIELDS:
+                    pending.extend(DERIVED_FIELDS[field])
+                else:
+                    pending.extend(self.sections[section][1])
+            elif section in self.analyzers:
+                analyzer = self.analyzers[section]
+                if key and analyzer.outputs and key not in analyzer.outputs:
+                    raise ValueError(f"未知字段: {field}")
+                if section not in needed:
+                    pending.extend(analyzer.inputs)
+                if not key:
+                    needed[section] = None
+                elif needed.get(section, set()) is not None:
+                    needed.setdefault(section, set()).add(key)
+            else:
+                raise ValueError(f"未知字段: {field}")
+        
+        return {name: needed[name] for name in self.analyzers if name in needed}
+    
+    def _compose_fields(self, results: Dict[str, Dict[str, Any]], timings: Dict[str, float],
+                        fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        只生成请求的综合部分
+        
+        依赖的子分析器结果均已计算，未运行的子分析器按空结果处理。
+        只请求了部分子键（如 'scores.randomness'）时，该部分只保留这些子键。
+        """
+        available = {name: {} for name in BASE_RESULT_KEYS + tuple(self.analyzers)}
+        available.update(results)
+        composed = dict(results)
+        requested = {field.partition('.')[0] for field in fields}
+        
+        for name, (compute, _) in self.sections.items():
+            if name not in requested:
+                continue
+            value = compute(available)
+            if name not in fields and isinstance(value, dict):
+                value = {key: item for key, item in value.items() if f'{name}.{key}' in fields}
+            composed[name] = value
+        
+        composed['analyzers'] = {
+            name: {
+                'version': self.analyzers[name].get_version()
+            }
+            for name in results
+        }
+        composed['timings'] = timings
+        return composed
+    
+    def _run_analyzers(self, context: AnalysisContext,
+                       plan: Optional[Dict[str, Optional[Set[str]]]] = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, float]]:
+        """
+        按依赖图和执行方式运行子分析器
+        
+        Args:
+            context: 分析上下文
+            plan: 依赖计划（见 plan_fields，None表示全部子分析器的完整结果）
+        
+        Returns:
+            (各子分析器的结果, 各子分析器的耗时秒数)，均按 self.analyzers 的顺序排列
+        
+        Raises:
+            ValueError: 依赖的分析器不存在或依赖存在环
+        """
+        if plan is None:
+            plan = dict.fromkeys(self.analyzers)
+        outcomes = run_plan(self.analyzers, plan, context, self.executor, self.max_workers,
+                            self.min_process_size)
+        return self._split_outcomes(outcomes)
+    
+    def _split_outcomes(self, outcomes: Dict[str, Tuple[Dict[str, Any], float]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, float]]:
+        """将 (结果, 耗时) 拆分为结果字典和耗时字典"""
+        results = {name: outcome[0] for name, outcome in outcomes.items()}
+        timings = {name: outcome[1] for name, outcome in outcomes.items()}
+        return results, timings
+    
+    def analyze_batch(self, sequences: List[Union[List[int], DigitSequence]]) -> List[Dict[str, Any]]:
+        """
+        批量综合分析多个数字序列
+        
+        每个子分析器对全部有效序列调用一次 analyze_batch()（四轨道和统计分析器按二维矩阵整体计算），
+        再逐个序列生成综合结果。声明了 inputs 的分析器按依赖顺序逐个序列运行，从上下文读取上游结果。
+        结果中的 'timings' 为各子分析器处理整批序列的耗时。
+        
+        Args:
+            sequences: 数字序列列表
+            
+        Returns:
+            与输入顺序一致的综合分析结果列表
+        """
+        results = [self.analyze([]) if not self.validate_input(digits) else None for digits in sequences]
+        valid_rows = [row for row, result in enumerate(results) if result is None]
+        valid_sequences = [DigitSequence(self.preprocess(sequences[row])) for row in valid_rows]
+        
+        dependencies = analyzer_dependencies(self.analyzers, list(self.analyzers))
+        batch_results = {}
+        timings = {}
+        for name in topological_order(dependencies):
+            analyzer = self.analyzers[name]
+            start = time.perf_counter()
+            if analyzer.inputs:
+                batch_results[name] = []
+                for index, sequence in enumerate(valid_sequences):
+                    context = AnalysisContext(sequence)
+                    context.results.update({upstream: batch_results[upstream][index]
+                                            for upstream in dependencies[name]})
+                    batch_results[name].append(analyzer.analyze_context(context))
+            else:
+                batch_results[name] = analyzer.analyze_batch(valid_sequences)
+            timings[name] = time.perf_counter() - start
+        for index, row in enumerate(valid_rows):
+            results[row] = self._compose_results({name: batch_results[name][index] for name in self.analyzers},
+                                                 {name: timings[name] for name in self.analyzers})
+        
+        return results
+    
+    def _compose_results(self, results: Dict[str, Dict[str, Any]], timings: Dict[str, float]) -> Dict[str, Any]:
+        """由各子分析器的结果和耗时生成综合结果（各综合部分按 self.sections 的顺序计算）"""
+        composed = {name: {} for name in BASE_RESULT_KEYS}
+        composed.update(results)
+        
+        for name, (compute, _) in self.sections.items():
+            composed[name] = compute(composed)
+        
+        composed['analyzers'] = {
+            name: {
+                'version': analyzer.get_version()
             }
+            for name, analyzer in self.analyzers.items()
         }
+        composed['timings'] = timings
+        return composed
     
     def _generate_summary(self, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """生成综合摘要"""
@@ -127,6 +392,8 @@ class CompositeAnalyzer(BaseAnalyzer):
             'pattern_complexity': self._calculate_pattern_complexity_score(results),
             'symmetry': self._calculate_symmetry_score(results),
             'predictability': self._calculate_predictability_score(results),
+            'lz76_complexity': self._calculate_lz76_score(results),
+            'compression_ratio': self._calculate_compression_score(results),
             'overall': 0
         }
         
@@ -177,6 +444,14 @@ class CompositeAnalyzer(BaseAnalyzer):
         predictability = (correlation + min(pattern_density * 10, 1.0)) / 2
         return min(predictability, 1.0)
     
+    def _calculate_lz76_score(self, results: Dict[str, Dict[str, Any]]) -> float:
+        """计算LZ76复杂度评分（随机序列约为1，结构越强越接近0）"""
+        return min(results.get('complexity', {}).get('lz76_normalized', 0), 1.0)
+    
+    def _calculate_compression_score(self, results: Dict[str, Dict[str, Any]]) -> float:
+        """计算压缩率评分（lzma 压缩率相对熵下界，越可压缩越接近0）"""
+        return min(results.get('complexity', {}).get('lzma_normalized', 0), 1.0)
+    
     def _generate_composite_fingerprint(self, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
         """生成综合指纹"""
         fingerprint = {
@@ -199,6 +474,11 @@ class CompositeAnalyzer(BaseAnalyzer):
                 'track3_pair_ratio': results['four_track'].get('track3', {}).get('symbol_pairs', {}).get('pair_ratio', 0),
                 'track4_pair_ratio': results['four_track'].get('track4', {}).get('symbol_pairs', {}).get('pair_ratio', 0),
                 'yinyang_ratio': results['four_track'].get('track1', {}).get('yinyang', {}).get('ratio', 0)
+            },
+            'spectral': {
+                'lag1_autocorrelation': results.get('spectral', {}).get('lag1_autocorrelation', 0),
+                'spectral_flatness': results.get('spectral', {}).get('spectral_flatness', 0),
+                'significant_lags': results.get('spectral', {}).get('significant_lags', 0)
             }
         }
         
@@ -236,15 +516,56 @@ class CompositeAnalyzer(BaseAnalyzer):
         """获取分析器版本"""
         return "2.0.0"
     
-    def add_analyzer(self, name: str, analyzer: BaseAnalyzer) -> None:
+    def incremental(self, digits: Union[List[int], DigitSequence] = None) -> IncrementalAnalysis:
+        """
+        创建增量分析句柄（四轨道和统计部分），用于只追加的序列
+        
+        Args:
+            digits: 初始数字序列（可选）
+            
+        Returns:
+            使用本分析器中四轨道和统计分析器的增量分析句柄
+        """
+        return IncrementalAnalysis(digits,
+                                   four_track_analyzer=self.analyzers['four_track'],
+                                   statistical_analyzer=self.analyzers['statistical'])
+    
+    def add_analyzer(self, name: str, analyzer: BaseAnalyzer = None) -> None:
         """
         添加自定义分析器
         
+        分析时通过 analyze_fields() / analyze_context() 调用，分析器可重写这两个方法以使用
+        共享的分析上下文；声明了 inputs 的分析器在上游分析器完成后运行，
+        从 context.results 读取上游结果。
+        
         Args:
             name: 分析器名称
-            analyzer: 分析器实例
+            analyzer: 分析器实例（None表示创建同名的已注册分析器）
+        
+        Raises:
+            KeyError: 未提供实例且名称未注册
+        """
+        self.analyzers[name] = analyzer if analyzer is not None else create_analyzer(name)
+    
+    def add_section(self, name: str, compute: Callable[[Dict[str, Any]], Any], inputs: Iterable[str] = ()) -> None:
+        """
+        添加综合部分
+        
+        Args:
+            name: 综合结果中的键
+            compute: 由子分析器结果（名称 -> 结果）计算该部分的函数
+            inputs: 依赖的字段（'子分析器.结果字段' 或其他综合部分）
+        """
+        self.sections[name] = (compute, tuple(inputs))
+    
+    def remove_section(self, name: str) -> None:
+        """
+        移除综合部分
+        
+        Args:
+            name: 综合部分名称
         """
-        self.analyzers[name] = analyzer
+        self.sections.pop(name, None)
     
     def remove_analyzer(self, name: str) -> None:
         """
@@ -0,0 +1,394 @@
+# core/analyzers/dna_track_analyzer.py
+# DNA分析脚本使用的四轨道分析器
+
+from typing import Dict, List, Any
+import numpy as np
+from core.analyzers.track_spec import DEFAULT_TRACK_SPECS, WINDOW_SIZE, compile_track_specs
+from core.data.digit_sequence import stack_digit_sequences
+
+# 轨道1窗口的滑动步长
+WINDOW_STRIDE = 5
+
+# 子序列长度（每个窗口分为4个3位子序列）
+SUBSEQ_SIZE = 3
+
+class DNATrackAnalyzer:
+    """
+    DNA四轨道分析器
+    
+    dna_four_track_enhanced.py 和 dna_universal_analyzer.py（及 src/ 下的副本）共用的分析器。
+    轨道规则全部来自 compile_track_specs(DEFAULT_TRACK_SPECS)，与 core 的 FourTrackAnalyzer 相同；
+    但保留这些脚本原有的算法和结果格式：轨道1窗口步长为5，结果字段为 valid/total/ratio、yang/yin，
+    对称性为 overall，并附带 summary。
+    """
+    
+    def __init__(self):
+        """初始化DNA四轨道分析器"""
+        self.tracks = compile_track_specs(DEFAULT_TRACK_SPECS)
+        self.track_names = list(self.tracks.keys())
+        self.window_tracks = [name for name, track in self.tracks.items() if track.kind == 'window']
+        # 窗口型轨道的子序列配对表：两个3位子序列（各编码为0-999）在多少个维度上状态配对
+        self.subseq_match_luts = {name: self._build_subseq_match_lut(self.tracks[name]) for name in self.window_tracks}
+    
+    def _build_subseq_match_lut(self, track) -> np.ndarray:
+        """
+        生成窗口型轨道的子序列配对表
+        
+        Args:
+            track: 编译后的窗口型轨道
+        
+        Returns:
+            长度为1000*1000的uint8数组，下标为 子序列a编码*1000 + 子序列b编码
+        """
+        triples = np.arange(10 ** SUBSEQ_SIZE)
+        digits = [triples // 100, triples // 10 % 10, triples % 10]
+        matches = np.zeros((len(triples), len(triples)), dtype=np.uint8)
+        for plane in track.attribute_planes:
+            states = track.state_lut[plane[digits[0]] * 4 + plane[digits[1]] * 2 + plane[digits[2]]]
+            matches += track.pairing_lut[states][:, None] == states[None, :]
+        return matches.reshape(-1)
+    
+    def analyze(self, digits: List[int]) -> Dict[str, Any]:
+        """
+        分析数字序列
+        
+        Args:
+            digits: 数字序列（0-9）
+        
+        Returns:
+            各轨道的正向、反向和对称性结果及摘要；出错时返回 {'error': 错误信息}
+        """
+        return self.analyze_batch([digits])[0]
+    
+    def analyze_batch(self, sequences: List[List[int]]) -> List[Dict[str, Any]]:
+        """
+        批量分析多个数字序列
+        
+        所有序列堆叠为一个二维 uint8 矩阵（较短的行补齐后屏蔽），数字直方图、
+        首次出现位置、轨道1窗口配对和数字对计数对正反两个方向各一次算出，再逐行生成结果。
+        
+        Args:
+            sequences: 数字序列列表
+        
+        Returns:
+            与输入顺序一致的结果列表，每项与单独调用 analyze() 的结果一致
+        """
+        results = [None] * len(sequences)
+        valid_rows = []
+        arrays = []
+        for row, digits in enumerate(sequences):
+            try:
+                values = np.asarray(digits, dtype=np.int64).reshape(-1)
+            except Exception as e:
+                results[row] = {'error': f'分析错误: {str(e)}'}
+                continue
+            # 验证输入
+            invalid = (values < 0) | (values > 9)
+            if invalid.any():
+                results[row] = {'error': f'无效数字: {digits[int(np.argmax(invalid))]}，必须在0-9范围内'}
+                continue
+            valid_rows.append(row)
+            arrays.append(values.astype(np.uint8))
+        
+        if not arrays:
+            return results
+        
+        try:
+            matrix, lengths = stack_digit_sequences(arrays)
+            digit_counts = self._digit_counts(matrix, lengths)
+            forward = self._direction_stats(matrix, lengths)
+            backward = self._direction_stats(self._reverse_rows(matrix, lengths), lengths)
+            
+            for index, row in enumerate(valid_rows):
+                row_result = {}
+                for track_name in self.track_names:
+                    forward_result = self._track_result(track_name, index, lengths, digit_counts, forward)
+                    backward_result = self._track_result(track_name, index, lengths, digit_counts, backward)
+                    row_result[track_name] = {
+                        'forward': forward_result,
+                        'backward': backward_result,
+                        'symmetry': self._calculate_symmetry(forward_result, backward_result)
+                    }
+                
+                # 全局结果
+                row_result['summary'] = self._generate_summary(row_result)
+                results[row] = row_result
+        
+        except Exception as e:
+            for row in valid_rows:
+                results[row] = {'error': f'分析错误: {str(e)}'}
+        
+        return results
+    
+    def _empty_track_result(self) -> Dict[str, Any]:
+        """单个轨道的空结果"""
+        return {
+            'window_count': 0,
+            'symbol_pairs': {'valid': 0, 'total': 0, 'ratio': 0},
+            'digit_pairs': {'valid': 0, 'total': 0, 'ratio': 0},
+            'global_digit_pairs': {'valid': 0, 'total': 0, 'ratio': 0, 'pair_types': {}, 'unpaired': {}},
+            'yinyang': {'yang': 0, 'yin': 0, 'ratio': 0, 'yang_percent': 0}
+        }
+    
+    def _digit_counts(self, matrix: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        按行统计数字直方图
+        
+        Args:
+            matrix: 形状为 (行数, 宽度) 的uint8矩阵
+            lengths: 每行的实际长度
+        
+        Returns:
+            形状为 (行数, 10) 的计数矩阵
+        """
+        row_count, width = matrix.shape
+        row_index = np.arange(row_count, dtype=np.intp)[:, None]
+        mask = np.arange(width) < lengths[:, None]
+        return np.bincount((row_index * 10 + matrix)[mask], minlength=row_count * 10).reshape(row_count, 10)
+    
+    def _reverse_rows(self, matrix: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+        """
+        逐行反转实际长度内的数字（补齐部分仍在行尾）
+        
+        Args:
+            matrix: 形状为 (行数, 宽度) 的uint8矩阵
+            lengths: 每行的实际长度
+        
+        Returns:
+            反转后的矩阵
+        """
+        row_count, width = matrix.shape
+        source = lengths[:, None] - 1 - np.arange(width)
+        reversed_matrix = matrix[np.arange(row_count)[:, None], np.maximum(source, 0)]
+        reversed_matrix[source < 0] = 0
+        return reversed_matrix
+    
+    def _direction_stats(self, matrix: np.ndarray, lengths: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        计算一个方向上与顺序有关的按行统计量
+        
+        Args:
+            matrix: 形状为 (行数, 宽度) 的uint8矩阵
+            lengths: 每行的实际长度
+        
+        Returns:
+            包含以下数组的字典：
+            first_index: (行数, 10) 各数字首次出现的位置（未出现为宽度）
+            window_count / window_valid: 每行的轨道1窗口数和窗口配对数
+            pair_valid: (轨道数, 行数) 从第0位起每两位一对的有效数字对数
+        """
+        row_count, width = matrix.shape
+        positions = np.arange(width)
+        mask = positions < lengths[:, None]
+        
+        first_index = np.full((row_count, 10), width, dtype=np.int64)
+        for digit in range(10):
+            hits = (matrix == digit) & mask
+            if width:
+                first_index[:, digit] = np.where(hits.any(axis=1), hits.argmax(axis=1), width)
+        
+        # 轨道1窗口：只统计完整落在各行实际长度内的窗口
+        starts = np.arange(0, max(width - WINDOW_SIZE + 1, 0), WINDOW_STRIDE)
+        window_mask = starts <= (lengths - WINDOW_SIZE)[:, None]
+        subseqs = [
+            (matrix[:, starts + offset].astype(np.intp) * 100
+             + matrix[:, starts + offset + 1] * 10 + matrix[:, starts + offset + 2])
+            for offset in range(0, WINDOW_SIZE, SUBSEQ_SIZE)
+        ]
+        window_valid = {}
+        pair_valid = {}
+        for track_name in self.window_tracks:
+            # 子序列1与3、2与4
+            lut = self.subseq_match_luts[track_name]
+            matches = lut[subseqs[0] * 1000 + subseqs[2]] + lut[subseqs[1] * 1000 + subseqs[3]]
+            window_valid[track_name] = (matches * window_mask).sum(axis=1)
+            
+            # 从第0位起每两位一对
+            pair_mask = np.arange(width // 2) < (lengths // 2)[:, None]
+            pairs = matrix[:, 0:width // 2 * 2:2].astype(np.intp) * 10 + matrix[:, 1:width // 2 * 2:2]
+            pair_valid[track_name] = (self.tracks[track_name].pair_table.reshape(-1)[pairs] & pair_mask).sum(axis=1)
+        
+        return {
+            'first_index': first_index,
+            'window_count': window_mask.sum(axis=1),
+            'window_valid': window_valid,
+            'pair_valid': pair_valid
+        }
+    
+    def _track_result(self, track_name: str, row: int, lengths: np.ndarray,
+                      digit_counts: np.ndarray, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        生成单个轨道一个方向的结果
+        
+        Args:
+            track_name: 轨道名称
+            row: 行号
+            lengths: 每行的实际长度
+            digit_counts: 按行的数字直方图
+            stats: _direction_stats 的结果
+        
+        Returns:
+            轨道结果
+        """
+        track = self.tracks[track_name]
+        length = int(lengths[row])
+        counts = digit_counts[row]
+        result = self._empty_track_result()
+        
+        if track.kind == 'window':
+            # 不足一个窗口时保持空结果
+            if length < WINDOW_SIZE:
+                return result
+            
+            window_count = int(stats['window_count'][row])
+            valid = int(stats['window_valid'][track_name][row])
+            total = 2 * len(track.attribute_planes) * window_count
+            result['window_count'] = window_count
+            if total > 0:
+                result['symbol_pairs'] = {'valid': valid, 'total': total, 'ratio': valid / total}
+            
+            # 数字直接配对
+            pair_total = length // 2
+            if pair_total > 0:
+                pair_valid = int(stats['pair_valid'][track_name][row])
+                result['digit_pairs'] = {'valid': pair_valid, 'total': pair_total, 'ratio': pair_valid / pair_total}
+        
+        result['global_digit_pairs'] = self._analyze_global_pairs(counts, stats['first_index'][row], length, track_name)
+        
+        # 阴阳计算：轨道1按数字分类，符号型轨道按符号分类
+        yang_count = int(counts @ track.yang_lut)
+        yin_count = int(counts @ track.yin_lut)
+        result['yinyang'] = {
+            'yang': yang_count,
+            'yin': yin_count,
+            'ratio': yang_count / yin_count if yin_count > 0 else 0,
+            'yang_percent': yang_count / (yang_count + yin_count) if (yang_count + yin_count) > 0 else 0
+        }
+        
+        return result
+    
+    def _analyze_global_pairs(self, digit_counts: np.ndarray, first_index: np.ndarray,
+                              length: int, track_name: str) -> Dict[str, Any]:
+        """
+        分析全局数字配对
+        
+        按配对规则的顺序贪心地从剩余数字中配对。
+        
+        Args:
+            digit_counts: 长度为10的数字直方图
+            first_index: 各数字首次出现的位置
+            length: 序列长度
+            track_name: 轨道名称
+        
+        Returns:
+            配对数、总对数、配对率、各配对类型的数量和未配对数字
+        """
+        remaining = digit_counts.astype(np.int64)
+        
+        valid_pairs = 0
+        pair_types = {}
+        total_pairs = length // 2
+        
+        for (d1, d2), pair_type, yinyang in self.tracks[track_name].pair_rules:
+            if d1 == d2:
+                pair_count = int(remaining[d1] // 2)
+            else:
+                pair_count = int(min(remaining[d1], remaining[d2]))
+            
+            if pair_count > 0:
+                valid_pairs += pair_count
+                
+                # 记录配对类型
+                if pair_type not in pair_types:
+                    pair_types[pair_type] = {'count': 0, 'yinyang': yinyang}
+                pair_types[pair_type]['count'] += pair_count
+                
+                # 更新剩余数字
+                remaining[d1] -= pair_count
+                remaining[d2] -= pair_count
+        
+        # 未配对的数字按首次出现的顺序列出
+        unpaired = {
+            int(d): int(remaining[d])
+            for d in np.argsort(first_index, kind='stable') if remaining[d] > 0
+        }
+        
+        return {
+            'valid': valid_pairs,
+            'total': total_pairs,
+            'ratio': valid_pairs / total_pairs if total_pairs > 0 else 0,
+            'pair_types': pair_types,
+            'unpaired': unpaired
+        }
+    
+    def _calculate_symmetry(self, forward: Dict[str, Any], backward: Dict[str, Any]) -> Dict[str, Any]:
+        """计算对称性"""
+        # 配对率相似度
+        forward_pair = forward.get('symbol_pairs', {}).get('ratio', 0)
+        backward_pair = backward.get('symbol_pairs', {}).get('ratio', 0)
+        pair_sim = 1 - abs(forward_pair - backward_pair)
+        
+        # 全局配对相似度
+        forward_global = forward.get('global_digit_pairs', {}).get('ratio', 0)
+        backward_global = backward.get('global_digit_pairs', {}).get('ratio', 0)
+        global_sim = 1 - abs(forward_global - backward_global)
+        
+        # 阴阳相似度
+        forward_yang = forward.get('yinyang', {}).get('yang_percent', 0)
+        backward_yang = backward.get('yinyang', {}).get('yang_percent', 0)
+        yang_sim = 1 - abs(forward_yang - backward_yang)
+        
+        return {
+            'pair_similarity': pair_sim,
+            'global_similarity': global_sim,
+            'yang_similarity': yang_sim,
+            'overall': (pair_sim + global_sim + yang_sim) / 3
+        }
+    
+    def _generate_summary(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """生成摘要"""
+        summary = {
+            'best_track': None,
+            'worst_track': None,
+            'average_symmetry': 0,
+            'track_scores': {}
+        }
+        
+        track_scores = []
+        for track_name, track_data in results.items():
+            if track_name == 'summary':
+                continue
+            
+            symmetry = track_data['symmetry']['overall']
+            forward = track_data['forward']
+            
+            # 窗口型轨道按符号配对率评分，符号型轨道按全局配对率评分
+            if self.tracks[track_name].kind == 'window':
+                pair_score = forward['symbol_pairs']['ratio']
+            else:
+                pair_score = forward['global_digit_pairs']['ratio']
+            
+            yang_score = 1 - abs(forward['yinyang']['yang_percent'] - 0.5) * 2
+            
+            track_score = (pair_score * 0.4 + symmetry * 0.4 + yang_score * 0.2)
+            
+            summary['track_scores'][track_name] = {
+                'score': track_score,
+                'symmetry': symmetry,
+                'pairing': pair_score
+            }
+            
+            track_scores.append((track_name, track_score))
+        
+        # 找出最佳和最差轨道
+        if track_scores:
+            track_scores.sort(key=lambda x: x[1], reverse=True)
+            summary['best_track'] = track_scores[0][0]
+            summary['worst_track'] = track_scores[-1][0]
+            
+            # 平均对称性
+            symmetries = [results[track]['symmetry']['overall']
+                          for track in results if track != 'summary']
+            summary['average_symmetry'] = sum(symmetries) / len(symmetries)
+        
+        return summary
@@ -1,71 +1,315 @@
 # core/analyzers/four_track_analyzer.py
 # 四轨道分析器
 
-from typing import Dict, List, Any
+import copy
+from collections import Counter
+from typing import Dict, List, Any, Tuple, Union
+import numpy as np
+from core.analyzers.analysis_context import AnalysisContext
 from core.analyzers.base_analyzer import BaseAnalyzer
+from core.analyzers.sharding import MIN_SHARD_SIZE, sharded_partial_state
+from core.analyzers.track_spec import compile_track_specs, merge_track_specs
+from core.data.digit_sequence import DigitSequence, as_digit_array, stack_digit_sequences
+
+# 轨道1窗口长度，以及分块时需要携带的重叠位数
+TRACK1_WINDOW_SIZE = 12
+TRACK1_OVERLAP = TRACK1_WINDOW_SIZE - 1
+
+class FourTrackPartialState:
+    """
+    四轨道分析的可合并部分状态
+    
+    只保存与输入长度无关的计数器：数字直方图、按起始位置奇偶区分的相邻数字对直方图、
+    轨道1正反向窗口配对数，以及首尾各11位（用于统计跨越块边界的窗口和数字对）。
+    两个相邻片段的状态可以通过 FourTrackAnalyzer.merge_states 合并，合并满足结合律。
+    """
+    
+    def __init__(self):
+        """初始化空状态"""
+        self.length = 0
+        self.digit_counts = np.zeros(10, dtype=np.int64)
+        # pair_counts[p][10*a+b]：起始位置奇偶为p的相邻数字对(a, b)的数量
+        self.pair_counts = np.zeros((2, 100), dtype=np.int64)
+        # 轨道1窗口配对数：[正向, 反向]
+        self.window_matches = np.zeros(2, dtype=np.int64)
+        self.head = np.zeros(0, dtype=np.uint8)
+        self.tail = np.zeros(0, dtype=np.uint8)
+    
+    def copy(self) -> 'FourTrackPartialState':
+        """复制状态"""
+        state = FourTrackPartialState()
+        state.length = self.length
+        state.digit_counts = self.digit_counts.copy()
+        state.pair_counts = self.pair_counts.copy()
+        state.window_matches = self.window_matches.copy()
+        state.head = self.head.copy()
+        state.tail = self.tail.copy()
+        return state
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        return {
+            'length': self.length,
+            'digit_counts': self.digit_counts.tolist(),
+            'pair_counts': self.pair_counts.tolist(),
+            'window_matches': self.window_matches.tolist(),
+            'head': self.head.tolist(),
+            'tail': self.tail.tolist()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FourTrackPartialState':
+        """从 to_dict() 的结果恢复状态"""
+        state = cls()
+        state.length = int(data['length'])
+        state.digit_counts = np.array(data['digit_counts'], dtype=np.int64)
+        state.pair_counts = np.array(data['pair_counts'], dtype=np.int64).reshape(2, 100)
+        state.window_matches = np.array(data['window_matches'], dtype=np.int64)
+        state.head = np.array(data['head'], dtype=np.uint8)
+        state.tail = np.array(data['tail'], dtype=np.uint8)
+        return state
+
+class TrackProfile:
+    """
+    四轨道区间剖面
+    
+    预先计算逐位置的指示数组（有效相邻数字对、阳数字、轨道1每个窗口的八卦配对数）的前缀和，
+    之后任意 [start, end) 区间、任意轨道的查询都是O(1)，固定大小窗口的剖面也无需逐窗口重新分析。
+    各轨道的前缀和在首次查询该轨道时计算。只统计正向结果。
+    """
+    
+    def __init__(self, analyzer: 'FourTrackAnalyzer', digits: Union[List[int], DigitSequence]):
+        """
+        初始化区间剖面
+        
+        Args:
+            analyzer: 提供映射规则的四轨道分析器
+            digits: 数字序列
+        """
+        self.analyzer = analyzer
+        self.digits = as_digit_array(DigitSequence(digits))
+        self.length = len(self.digits)
+        # 前缀和最大为序列长度，短于2^31时使用int32减半内存
+        self._prefix_dtype = np.int32 if self.length < 2 ** 31 - 1 else np.int64
+        self._prefixes = {}
+    
+    def _prefix_sum(self, indicator: np.ndarray) -> np.ndarray:
+        """计算前缀和，结果长度为 len(indicator) + 1，首元素为0"""
+        prefix = np.zeros(len(indicator) + 1, dtype=self._prefix_dtype)
+        np.cumsum(indicator, dtype=self._prefix_dtype, out=prefix[1:])
+        return prefix
+    
+    def _track_prefixes(self, track_name: str) -> Dict[str, np.ndarray]:
+        """获取（必要时计算）轨道的前缀和数组"""
+        if track_name in self._prefixes:
+            return self._prefixes[track_name]
+        if track_name not in self.analyzer.tracks:
+            raise ValueError(f"未知轨道: {track_name}")
+        
+        prefixes = {'yang': self._prefix_sum(self.analyzer._yang_table(track_name)[self.digits])}
+        
+        if track_name == 'track1':
+            # windows[k]：起始于k的窗口（即[k, k+12)）的有效八卦配对数
+            forward_matches, _ = self.analyzer._track1_window_matches(self.digits)
+            windows = np.zeros(self.length, dtype=np.uint8)
+            windows[:len(forward_matches)] = forward_matches
+            prefixes['windows'] = self._prefix_sum(windows)
+        else:
+            # pairs[p][k]：起始位置 < k 且奇偶为 p 的有效相邻数字对个数
+            valid = np.zeros(self.length, dtype=np.uint8)
+            if self.length >= 2:
+                pair_codes = self.digits[:-1].astype(np.intp) * 10 + self.digits[1:]
+                valid[:-1] = self.analyzer._pair_validity(track_name)[pair_codes]
+            parity = np.arange(self.length) % 2
+            prefixes['pairs'] = np.stack([self._prefix_sum(valid * (parity == p)) for p in (0, 1)])
+        
+        self._prefixes[track_name] = prefixes
+        return prefixes
+    
+    def _range_counts(self, track_name: str, starts: np.ndarray, ends: np.ndarray) -> Dict[str, np.ndarray]:
+        """向量化计算一组区间的计数"""
+        prefixes = self._track_prefixes(track_name)
+        lengths = ends - starts
+        counts = {
+            'length': lengths,
+            'yang_count': prefixes['yang'][ends].astype(np.int64) - prefixes['yang'][starts]
+        }
+        
+        if track_name == 'track1':
+            # 完全落在区间内的窗口：起始位置属于 [start, end-11)
+            window_ends = np.maximum(ends - TRACK1_OVERLAP, starts)
+            counts['window_count'] = window_ends - starts
+            counts['valid_symbol_pairs'] = prefixes['windows'][window_ends].astype(np.int64) - prefixes['windows'][starts]
+        else:
+            # 区间内的配对从 start 开始：起始位置属于 [start, end-1) 且与 start 同奇偶
+            pair_ends = np.maximum(ends - 1, starts)
+            parity = starts % 2
+            pairs = prefixes['pairs']
+            counts['total_pairs'] = lengths // 2
+            counts['valid_pairs'] = pairs[parity, pair_ends].astype(np.int64) - pairs[parity, starts]
+        
+        return counts
+    
+    def query(self, track_name: str, start: int = 0, end: int = None) -> Dict[str, Any]:
+        """
+        查询区间 [start, end) 的轨道统计
+        
+        Args:
+            track_name: 轨道名称（track1-track4）
+            start: 起始位置
+            end: 结束位置（不包含），默认为序列末尾
+            
+        Returns:
+            区间统计结果
+        """
+        start, end, _ = slice(start, end).indices(self.length)
+        end = max(start, end)
+        counts = {key: int(value[0]) for key, value in
+                  self._range_counts(track_name, np.array([start]), np.array([end])).items()}
+        return self._format_range(track_name, start, end, counts)
+    
+    def _format_range(self, track_name: str, start: int, end: int, counts: Dict[str, int]) -> Dict[str, Any]:
+        """将区间计数整理为与 analyze() 结果一致的字段"""
+        length = counts['length']
+        yang_count = counts['yang_count']
+        yin_count = length - yang_count
+        result = {
+            'start': start,
+            'end': end,
+            'yinyang': {
+                'yang_count': yang_count,
+                'yin_count': yin_count,
+                'ratio': yang_count / yin_count if yin_count > 0 else float('inf'),
+                'yang_percent': yang_count / length if length else 0
+            }
+        }
+        
+        if track_name == 'track1':
+            total_pairs = counts['window_count'] * len(self.analyzer._attribute_planes) * 2
+            result['window_count'] = counts['window_count']
+            result['symbol_pairs'] = {
+                'valid_pairs': counts['valid_symbol_pairs'],
+                'total_pairs': total_pairs,
+                'pair_ratio': counts['valid_symbol_pairs'] / total_pairs if total_pairs > 0 else 0
+            }
+        else:
+            result['direct_pairing'] = {
+                'valid_pairs': counts['valid_pairs'],
+                'total_pairs': counts['total_pairs'],
+                'pair_ratio': counts['valid_pairs'] / counts['total_pairs'] if counts['total_pairs'] > 0 else 0
+            }
+        return result
+    
+    def window_profile(self, track_name: str, window_size: int, step: int = None) -> Dict[str, Any]:
+        """
+        计算固定大小窗口的剖面（用于绘图）
+        
+        Args:
+            track_name: 轨道名称（track1-track4）
+            window_size: 窗口大小
+            step: 窗口步长，默认等于窗口大小（不重叠）
+            
+        Returns:
+            各窗口的起始位置以及配对比例、阳数字比例等数组
+        """
+        if window_size <= 0:
+            raise ValueError(f"窗口大小必须为正数: {window_size}")
+        step = step or window_size
+        starts = np.arange(0, max(self.length - window_size + 1, 0), step, dtype=np.int64)
+        ends = starts + window_size
+        counts = self._range_counts(track_name, starts, ends)
+        
+        profile = {
+            'track': track_name,
+            'window_size': window_size,
+            'step': step,
+            'starts': starts,
+            'yang_percent': counts['yang_count'] / window_size
+        }
+        if track_name == 'track1':
+            total_pairs = counts['window_count'] * len(self.analyzer._attribute_planes) * 2
+            profile['symbol_pair_ratio'] = np.divide(counts['valid_symbol_pairs'], total_pairs,
+                                                     out=np.zeros(len(starts)), where=total_pairs > 0)
+        else:
+            profile['pair_ratio'] = np.divide(counts['valid_pairs'], counts['total_pairs'],
+                                              out=np.zeros(len(starts)), where=counts['total_pairs'] > 0)
+        return profile
 
 class FourTrackAnalyzer(BaseAnalyzer):
     """四轨道分析器"""
     
-    def __init__(self):
-        """初始化四轨道分析器"""
+    def __init__(self, workers: int = 1, min_shard_size: int = MIN_SHARD_SIZE,
+                 track_specs: Dict[str, Dict[str, Any]] = None):
+        """
+        初始化四轨道分析器
+        
+        Args:
+            workers: 分析长序列时使用的进程数（1表示单进程）
+            min_shard_size: 每个分片的最小长度，序列不足两个分片时仍在单进程中分析
+            track_specs: 额外的轨道定义（格式见 core.analyzers.track_spec），
+                可以新增符号型轨道（如 track5）或覆盖默认轨道
+            
+        Raises:
+            ValueError: 轨道定义不合法
+        """
+        self.workers = max(1, int(workers))
+        self.min_shard_size = min_shard_size
+        
+        # 编译轨道定义（默认的轨道1-4，加上 track_specs 中新增或覆盖的轨道）
+        self.track_specs = merge_track_specs(track_specs)
+        self.tracks = compile_track_specs(self.track_specs)
+        self.track_names = list(self.tracks.keys())
+        # 结果字段（随轨道定义变化）
+        self.outputs = tuple(self.track_names) + ('direct_pairing', 'fingerprint', 'reverse_analysis')
+        self.symbol_tracks = [name for name, track in self.tracks.items() if track.kind == 'symbol']
+        window_tracks = [name for name, track in self.tracks.items() if track.kind == 'window']
+        if window_tracks != ['track1']:
+            raise ValueError(f"窗口型轨道必须且只能是 track1，实际为: {window_tracks}")
+        window_track = self.tracks['track1']
+        
+        # 以下映射表由轨道定义生成，保持原有属性名供外部和逐项分析代码使用
         # 数字属性映射表（用于轨道1）
         self.number_attributes = {
-            0: {'small_large': 0, 'up_down': 0, 'odd_even': 0, 'ab_relation': 0},
-            1: {'small_large': 1, 'up_down': 1, 'odd_even': 1, 'ab_relation': 1},
-            2: {'small_large': 1, 'up_down': 1, 'odd_even': 0, 'ab_relation': 1},
-            3: {'small_large': 1, 'up_down': 1, 'odd_even': 1, 'ab_relation': 1},
-            4: {'small_large': 1, 'up_down': 0, 'odd_even': 0, 'ab_relation': 1},
-            5: {'small_large': 1, 'up_down': 0, 'odd_even': 1, 'ab_relation': 0},
-            6: {'small_large': 1, 'up_down': 1, 'odd_even': 0, 'ab_relation': 0},
-            7: {'small_large': 1, 'up_down': 1, 'odd_even': 1, 'ab_relation': 0},
-            8: {'small_large': 0, 'up_down': 1, 'odd_even': 0, 'ab_relation': 0},
-            9: {'small_large': 0, 'up_down': 0, 'odd_even': 1, 'ab_relation': 1}
+            num: {dim: int(window_track.attribute_planes[row][num]) for row, dim in enumerate(window_track.dimensions)}
+            for num in range(10)
         }
         
         # 八卦系统九和配对规则
-        self.bagua_pairing = {
-            1: 8,
-            2: 7,
-            3: 6,
-            4: 5,
-            5: 4,
-            6: 3,
-            7: 2,
-            8: 1
-        }
+        self.bagua_pairing = dict(window_track.pairing)
         
         # 八态编码表（二进制到状态ID映射）
-        self.state_encoding = {
-            '111': 1, '110': 2, '101': 3, '100': 4,
-            '011': 5, '010': 6, '001': 7, '000': 8
-        }
+        self.state_encoding = dict(window_track.state_encoding)
         
-        # 轨道2-4的映射规则
+        # 符号型轨道的映射规则
         self.track_mappings = {
-            'track2': {0: 'E', 1: 'A', 2: 'B', 3: 'C', 4: 'D', 5: 'D', 6: 'C', 7: 'B', 8: 'A', 9: 'E'},
-            'track3': {0: '戊', 1: '甲', 2: '乙', 3: '丙', 4: '丁', 5: '戊', 6: '丁', 7: '丙', 8: '乙', 9: '甲'},
-            'track4': {0: '五', 1: '一', 2: '二', 3: '三', 4: '四', 5: '二', 6: '三', 7: '四', 8: '一', 9: '五'}
+            name: dict(enumerate(self.tracks[name].symbols)) for name in self.symbol_tracks
         }
         
-        # 轨道2-4的阴阳分类
+        # 符号型轨道的阴阳分类
         self.yinyang_classifications = {
-            'track2': {'yang': {'A', 'C', 'E'}, 'yin': {'B', 'D'}},
-            'track3': {'yang': {'甲', '丙', '戊'}, 'yin': {'乙', '丁'}},
-            'track4': {'yang': {'一', '三', '五'}, 'yin': {'二', '四'}}
+            name: {'yang': set(self.tracks[name].yang_symbols), 'yin': set(self.tracks[name].yin_symbols)}
+            for name in self.symbol_tracks
         }
         
+        # 符号型轨道的数字配对规则：((数字1, 数字2), 配对类型, 阴阳)
+        self.pair_rules = {name: list(self.tracks[name].pair_rules) for name in self.symbol_tracks}
+        
         # 预计算符号缓存
-        self._cached_symbols = {}
-        for track_name in ['track2', 'track3', 'track4']:
-            self._cached_symbols[track_name] = [
-                self.track_mappings[track_name][i] for i in range(10)
-            ]
+        self._cached_symbols = {name: list(self.tracks[name].symbols) for name in self.symbol_tracks}
         
         # 验证配置
         self._validate_initialization()
+        
+        # 编译轨道1的查找表（NumPy向量化引擎使用）
+        self._compile_track1_tables()
+        
+        # 编译数字配对有效性表
+        self._compile_pair_tables()
+        
+        # 流式分析的当前状态
+        self._stream_state = None
     
-    def analyze(self, digits: List[int]) -> Dict[str, Any]:
+    def analyze(self, digits: Union[List[int], DigitSequence]) -> Dict[str, Any]:
         """
         分析数字序列
         
@@ -87,51 +331,457 @@ class FourTrackAnalyzer(BaseAnalyzer):
             
             digits = self.preprocess(digits)
             
-            # 生成反向序列
-            reversed_digits = digits[::-1]
+            # 长序列分片并行计算部分状态，合并后与单进程结果一致
+            if self.workers > 1 and len(digits) >= 2 * self.min_shard_size:
+                state = sharded_partial_state(self, DigitSequence(digits), self.workers, self.min_shard_size)
+                return self.finalize_state(state)
+            
+            # 反向结果直接由正向数组推导，不再复制整个列表
+            digits_array = as_digit_array(digits)
+            
+            # 所有轨道的配对都由同一组相邻数字对直方图查表得出
+            if len(digits_array) > TRACK1_OVERLAP:
+                return self.finalize_state(self.partial_state(DigitSequence(digits)))
+            
+            # 不足一个窗口的短序列走逐项分析，DigitSequence 在此物化为列表
+            if isinstance(digits, DigitSequence):
+                digits = digits.tolist()
             
             # 分析所有轨道（正向和反向）
-            results = {}
-            for track in ['track1', 'track2', 'track3', 'track4']:
-                # 正向分析
-                forward_result = self._analyze_track(digits, track)
-                # 反向分析
-                backward_result = self._analyze_track(reversed_digits, track)
-                # 计算对称性指标
-                symmetry = self._calculate_symmetry(forward_result, backward_result)
-                
-                # 整合结果
-                results[track] = {
-                    'forward': forward_result,
-                    'backward': backward_result,
-                    'symmetry': symmetry
-                }
+            # 与顺序无关的部分（全局配对、阴阳计数）只计算一次，正反向共享
+            track_results = {}
+            for track in self.track_names:
+                track_results[track] = self._analyze_track_bidirectional(digits, digits_array, track)
             
-            # 分析数字本身的直接配对（正向和反向）
-            direct_results = {}
-            for track in ['track2', 'track3', 'track4']:
-                # 正向分析
-                forward_pairing = self._analyze_direct_pairing(digits, track)
-                # 反向分析
-                backward_pairing = self._analyze_direct_pairing(reversed_digits, track)
-                # 计算对称性指标
-                pairing_symmetry = self._calculate_pairing_symmetry(forward_pairing, backward_pairing)
-                
-                # 整合结果
-                direct_results[track] = {
-                    'forward': forward_pairing,
-                    'backward': backward_pairing,
-                    'symmetry': pairing_symmetry
-                }
+            # 分析数字本身的直接配对（正向和反向在同一遍扫描中完成）
+            pairing_results = {}
+            for track in self.symbol_tracks:
+                pairing_results[track] = self._analyze_direct_pairing_bidirectional(digits, track)
             
-            results['direct_pairing'] = direct_results
-            results['fingerprint'] = self._generate_digital_fingerprint(results)
-            results['reverse_analysis'] = self._generate_reverse_analysis_summary(results)
+            results = self._assemble_results(track_results, pairing_results)
             
             return results
         except Exception as e:
             return self._create_error_response(f"分析过程中发生错误: {str(e)}")
     
+    def analyze_context(self, context: AnalysisContext) -> Dict[str, Any]:
+        """
+        使用共享的分析上下文分析（数字直方图和按奇偶区分的数字对计数直接取自上下文）
+        
+        Args:
+            context: 分析上下文
+        
+        Returns:
+            分析结果，与 analyze() 一致
+        """
+        if context.length <= TRACK1_OVERLAP or self.workers > 1:
+            return self.analyze(context.sequence)
+        
+        state = FourTrackPartialState()
+        state.length = context.length
+        state.digit_counts = context.histogram
+        state.pair_counts = context.parity_bigrams
+        forward_matches, backward_matches = self._track1_window_matches(context.digits)
+        state.window_matches[0] = int(forward_matches.sum())
+        state.window_matches[1] = int(backward_matches.sum())
+        state.head = context.digits[:TRACK1_OVERLAP].copy()
+        state.tail = context.digits[-TRACK1_OVERLAP:].copy()
+        return self.finalize_state(state)
+    
+    def begin(self) -> None:
+        """开始流式分析，之后通过 feed() 逐块输入，最后调用 finish() 获取结果"""
+        self._stream_state = FourTrackPartialState()
+    
+    def feed(self, chunk: Union[List[int], DigitSequence]) -> None:
+        """
+        输入一块数字
+        
+        Args:
+            chunk: 数字块
+            
+        Raises:
+            RuntimeError: 未调用 begin()
+            ValueError: 数字块包含非法数字
+        """
+        if self._stream_state is None:
+            raise RuntimeError("请先调用 begin() 开始流式分析")
+        self._stream_state = self.merge_states(self._stream_state, self.partial_state(chunk))
+    
+    def finish(self) -> Dict[str, Any]:
+        """
+        结束流式分析
+        
+        Returns:
+            分析结果，与对所有块拼接后的序列调用 analyze() 的结果一致
+        """
+        if self._stream_state is None:
+            raise RuntimeError("请先调用 begin() 开始流式分析")
+        state = self._stream_state
+        self._stream_state = None
+        return self.finalize_state(state)
+    
+    def partial_state(self, digits: Union[List[int], DigitSequence]) -> FourTrackPartialState:
+        """
+        计算一段数字的部分状态
+        
+        Args:
+            digits: 数字序列片段
+            
+        Returns:
+            部分状态
+        """
+        digits_array = as_digit_array(DigitSequence(digits))
+        length = len(digits_array)
+        
+        state = FourTrackPartialState()
+        state.length = length
+        state.digit_counts = np.bincount(digits_array, minlength=10).astype(np.int64)
+        
+        state.pair_counts = self._pair_histograms(digits_array)
+        
+        forward_matches, backward_matches = self._track1_window_matches(digits_array)
+        state.window_matches[0] = int(forward_matches.sum())
+        state.window_matches[1] = int(backward_matches.sum())
+        
+        state.head = digits_array[:TRACK1_OVERLAP].copy()
+        state.tail = digits_array[-TRACK1_OVERLAP:].copy()
+        return state
+    
+    def analyze_batch(self, sequences: List[Union[List[int], DigitSequence]]) -> List[Dict[str, Any]]:
+        """
+        批量分析多个数字序列
+        
+        所有序列堆叠为一个二维 uint8 矩阵（较短的行补齐后屏蔽），
+        直方图、数字对计数和轨道1窗口状态沿行一次算出，再逐行生成结果。
+        
+        Args:
+            sequences: 数字序列列表
+            
+        Returns:
+            与输入顺序一致的分析结果列表，每项与单独调用 analyze() 的结果一致
+        """
+        results = [None] * len(sequences)
+        valid_rows = []
+        valid_sequences = []
+        for row, digits in enumerate(sequences):
+            if not self.validate_input(digits):
+                results[row] = self._create_error_response("输入验证失败")
+                continue
+            valid_rows.append(row)
+            valid_sequences.append(self.preprocess(digits))
+        
+        if valid_sequences:
+            matrix, lengths = stack_digit_sequences(valid_sequences)
+            for row, state in zip(valid_rows, self._batch_partial_states(matrix, lengths)):
+                results[row] = self.finalize_state(state)
+        
+        return results
+    
+    def _batch_partial_states(self, matrix: np.ndarray, lengths: np.ndarray) -> List[FourTrackPartialState]:
+        """
+        按行计算二维数字矩阵的部分状态
+        
+        Args:
+            matrix: 形状为 (行数, 宽度) 的uint8矩阵
+            lengths: 每行的实际长度
+            
+        Returns:
+            每行的部分状态
+        """
+        row_count, width = matrix.shape
+        row_index = np.arange(row_count, dtype=np.intp)[:, None]
+        positions = np.arange(width)
+        
+        # 数字直方图：每行占10个桶
+        digit_mask = positions < lengths[:, None]
+        digit_counts = np.bincount((row_index * 10 + matrix)[digit_mask],
+                                   minlength=row_count * 10).reshape(row_count, 10)
+        
+        # 相邻数字对直方图：每行按起始位置奇偶占 2*100 个桶
+        pair_counts = np.zeros((row_count, 2, 100), dtype=np.int64)
+        if width >= 2:
+            pair_mask = positions[:-1] < (lengths - 1)[:, None]
+            pair_index = (row_index * 200 + (positions[:-1] % 2) * 100
+                          + matrix[:, :-1].astype(np.intp) * 10 + matrix[:, 1:])
+            pair_counts = np.bincount(pair_index[pair_mask],
+                                      minlength=row_count * 200).reshape(row_count, 2, 100)
+        
+        # 轨道1窗口：只统计完整落在各行实际长度内的窗口
+        forward_matches, backward_matches = self._track1_window_matches(matrix)
+        window_mask = positions[:forward_matches.shape[1]] < (lengths - TRACK1_OVERLAP)[:, None]
+        forward_totals = np.where(window_mask, forward_matches, 0).sum(axis=1)
+        backward_totals = np.where(window_mask, backward_matches, 0).sum(axis=1)
+        
+        states = []
+        for row in range(row_count):
+            length = int(lengths[row])
+            state = FourTrackPartialState()
+            state.length = length
+            state.digit_counts = digit_counts[row].astype(np.int64)
+            state.pair_counts = pair_counts[row].astype(np.int64)
+            state.window_matches = np.array([forward_totals[row], backward_totals[row]], dtype=np.int64)
+            state.head = matrix[row, :min(length, TRACK1_OVERLAP)].copy()
+            state.tail = matrix[row, max(length - TRACK1_OVERLAP, 0):length].copy()
+            states.append(state)
+        return states
+    
+    def merge_states(self, left: FourTrackPartialState, right: FourTrackPartialState) -> FourTrackPartialState:
+        """
+        合并两个相邻片段的部分状态（left 在前，right 在后）
+        
+        Args:
+            left: 前一片段的状态
+            right: 后一片段的状态
+            
+        Returns:
+            合并后的状态
+        """
+        if left.length == 0:
+            return right.copy()
+        if right.length == 0:
+            return left.copy()
+        
+        merged = FourTrackPartialState()
+        merged.length = left.length + right.length
+        merged.digit_counts = left.digit_counts + right.digit_counts
+        
+        # right 中的位置整体偏移 left.length，奇偶随之调整
+        shift = left.length % 2
+        merged.pair_counts = left.pair_counts + right.pair_counts[[shift, 1 - shift]]
+        
+        # 跨越边界的数字对
+        boundary_pair = int(left.tail[-1]) * 10 + int(right.head[0])
+        merged.pair_counts[(left.length - 1) % 2, boundary_pair] += 1
+        
+        # 跨越边界的窗口：起始于 left 末尾11位之内、结束于 right 之内
+        junction = np.concatenate([left.tail, right.head])
+        forward_matches, backward_matches = self._track1_window_matches(junction)
+        first = max(len(left.tail) - TRACK1_OVERLAP, 0)
+        last = len(left.tail)
+        merged.window_matches = left.window_matches + right.window_matches + np.array([
+            int(forward_matches[first:last].sum()),
+            int(backward_matches[first:last].sum())
+        ], dtype=np.int64)
+        
+        merged.head = np.concatenate([left.head, right.head])[:TRACK1_OVERLAP]
+        merged.tail = np.concatenate([left.tail, right.tail])[-TRACK1_OVERLAP:]
+        return merged
+    
+    def finalize_state(self, state: FourTrackPartialState) -> Dict[str, Any]:
+        """
+        由部分状态生成完整分析结果
+        
+        Args:
+            state: 覆盖整个序列的部分状态
+            
+        Returns:
+            分析结果
+        """
+        if state.length == 0:
+            return self._create_error_response("输入验证失败")
+        
+        # 短序列的首部即完整序列，直接走常规分析
+        if state.length <= TRACK1_OVERLAP:
+            return self.analyze(state.head.tolist())
+        
+        try:
+            # 验证配置
+            config_valid, config_errors = self.validate_configuration()
+            if not config_valid:
+                return self._create_error_response(f"配置错误: {config_errors}")
+            
+            length = state.length
+            window_count = length - TRACK1_OVERLAP
+            digit_counter = Counter({num: int(count) for num, count in enumerate(state.digit_counts) if count > 0})
+            # 反向序列的数字对对应原序列中与长度同奇偶的起始位置
+            backward_parity = length % 2
+            
+            track_results = {}
+            for track in self.track_names:
+                yinyang_result = self._yinyang_from_counts(state.digit_counts, length, track)
+                
+                if track == 'track1':
+                    symbol_total = window_count * len(self._attribute_planes) * 2
+                    directional_results = []
+                    for direction, parity, validity in ((0, 0, self._pair_validity(track)),
+                                                        (1, backward_parity, self._pair_validity(track, reverse=True))):
+                        symbol_valid = int(state.window_matches[direction])
+                        digit_valid = int(state.pair_counts[parity][validity].sum())
+                        directional_results.append({
+                            'window_count': window_count,
+                            'symbol_pairs': {
+                                'valid_pairs': symbol_valid,
+                                'total_pairs': symbol_total,
+                                'pair_ratio': symbol_valid / symbol_total if symbol_total > 0 else 0
+                            },
+                            'digit_pairs': {
+                                'valid_pairs': digit_valid,
+                                'total_pairs': length // 2,
+                                'pair_ratio': digit_valid / (length // 2)
+                            },
+                            'global_digit_pairs': {'valid_pairs': 0, 'total_pairs': 0, 'pair_ratio': 0, 'pair_types': {}, 'unpaired': {}},
+                            'yinyang': dict(yinyang_result)
+                        })
+                    track_results[track] = (directional_results[0], directional_results[1])
+                else:
+                    forward_result = {
+                        'window_count': 0,
+                        'symbol_pairs': {'valid_pairs': 0, 'total_pairs': 0, 'pair_ratio': 0},
+                        'digit_pairs': {'valid_pairs': 0, 'total_pairs': 0, 'pair_ratio': 0},
+                        'global_digit_pairs': self._global_digit_pairs_from_counts(digit_counter, length, track),
+                        'yinyang': yinyang_result
+                    }
+                    track_results[track] = (forward_result, copy.deepcopy(forward_result))
+            
+            pairing_results = {}
+            for track in self.symbol_tracks:
+                pairing_results[track] = self._direct_pairing_from_histograms(state.pair_counts, length, track)
+            
+            return self._assemble_results(track_results, pairing_results)
+        except Exception as e:
+            return self._create_error_response(f"分析过程中发生错误: {str(e)}")
+    
+    def profile(self, digits: Union[List[int], DigitSequence]) -> TrackProfile:
+        """
+        创建区间剖面，用于查询任意区间的轨道统计和固定窗口剖面
+        
+        Args:
+            digits: 数字序列
+            
+        Returns:
+            区间剖面
+            
+        Raises:
+            ValueError: 包含非法数字
+        """
+        return TrackProfile(self, digits)
+    
+    def _yang_table(self, track_name: str) -> np.ndarray:
+        """
+        获取轨道的阳数字表
+        
+        Returns:
+            长度10的uint8数组，阳数字为1（与 _yinyang_from_counts 的分类一致）
+        """
+        return self.tracks[track_name].yang_lut
+    
+    def _compile_pair_tables(self) -> None:
+        """收集各轨道编译好的10×10数字配对有效性矩阵（轨道1不使用数字配对，全部无效）"""
+        self._pair_tables = {name: track.pair_table for name, track in self.tracks.items()}
+    
+    def _pair_validity(self, track_name: str, reverse: bool = False) -> np.ndarray:
+        """
+        获取轨道的相邻数字对有效性表
+        
+        Args:
+            track_name: 轨道名称
+            reverse: 是否按反向顺序 (d2, d1) 判断
+            
+        Returns:
+            长度100的布尔数组，下标为 10*d1 + d2
+        """
+        table = self._pair_tables.get(track_name)
+        if table is None:
+            return np.zeros(100, dtype=bool)
+        return (table.T if reverse else table).ravel()
+    
+    def _pair_histograms(self, digits_array: np.ndarray) -> np.ndarray:
+        """
+        统计相邻数字对直方图，按起始位置奇偶区分
+        
+        Args:
+            digits_array: 数字序列的uint8数组
+            
+        Returns:
+            形状为 (2, 100) 的计数，[p][10*a+b] 为起始位置奇偶为p的数字对(a, b)的数量
+        """
+        pair_counts = np.zeros((2, 100), dtype=np.int64)
+        if len(digits_array) >= 2:
+            pair_codes = digits_array[:-1].astype(np.intp) * 10 + digits_array[1:]
+            pair_counts[0] = np.bincount(pair_codes[0::2], minlength=100)
+            pair_counts[1] = np.bincount(pair_codes[1::2], minlength=100)
+        return pair_counts
+    
+    def _direct_pairing_from_histograms(self, pair_counts: np.ndarray, length: int,
+                                        track_name: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        由相邻数字对直方图查表得出正向和反向的直接配对结果
+        
+        正向配对为起始位置为偶数的 (d[i], d[i+1])；反向序列的配对对应原序列中
+        起始位置与长度同奇偶的相邻数字，方向相反。
+        
+        Args:
+            pair_counts: _pair_histograms 的结果
+            length: 序列长度
+            track_name: 轨道名称
+            
+        Returns:
+            (正向配对结果, 反向配对结果)
+        """
+        if length < 2:
+            empty = {
+                'valid_pairs': 0,
+                'total_pairs': 0,
+                'pair_ratio': 0,
+                'unpaired_count': 0
+            }
+            return empty, dict(empty)
+        
+        total_pairs = length // 2
+        results = []
+        for parity, validity in ((0, self._pair_validity(track_name)),
+                                 (length % 2, self._pair_validity(track_name, reverse=True))):
+            valid_pairs = int(pair_counts[parity][validity].sum())
+            results.append({
+                'valid_pairs': valid_pairs,
+                'total_pairs': total_pairs,
+                'pair_ratio': valid_pairs / total_pairs,
+                'unpaired_count': length % 2
+            })
+        return results[0], results[1]
+    
+    def _assemble_results(self, track_results: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]],
+                          pairing_results: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        整合各轨道的正反向结果，计算对称性、指纹和反向分析摘要
+        
+        Args:
+            track_results: 轨道名称到 (正向结果, 反向结果) 的映射
+            pairing_results: 轨道名称到 (正向直接配对, 反向直接配对) 的映射
+            
+        Returns:
+            完整的分析结果
+        """
+        results = {}
+        for track, (forward_result, backward_result) in track_results.items():
+            # 计算对称性指标
+            symmetry = self._calculate_symmetry(forward_result, backward_result)
+            
+            # 整合结果
+            results[track] = {
+                'forward': forward_result,
+                'backward': backward_result,
+                'symmetry': symmetry
+            }
+        
+        direct_results = {}
+        for track, (forward_pairing, backward_pairing) in pairing_results.items():
+            # 计算对称性指标
+            pairing_symmetry = self._calculate_pairing_symmetry(forward_pairing, backward_pairing)
+            
+            # 整合结果
+            direct_results[track] = {
+                'forward': forward_pairing,
+                'backward': backward_pairing,
+                'symmetry': pairing_symmetry
+            }
+        
+        results['direct_pairing'] = direct_results
+        results['fingerprint'] = self._generate_digital_fingerprint(results)
+        results['reverse_analysis'] = self._generate_reverse_analysis_summary(results)
+        
+        return results
+    
     def _analyze_track(self, sequence: List[int], track_name: str) -> Dict[str, Any]:
         """分析单个轨道"""
         if len(sequence) < 2:
@@ -143,23 +793,10 @@ class FourTrackAnalyzer(BaseAnalyzer):
                 'yinyang': {'yang_count': 0, 'yin_count': 0, 'ratio': 0, 'yang_percent': 0}
             }
         
-        # 对于轨道1，继续使用原来的窗口分析方法
+        # 对于轨道1，使用窗口分析方法（NumPy向量化实现）
         if track_name == 'track1':
-            # 处理所有窗口
-            windows = []
-            for i in range(0, len(sequence) - 11 + 1):
-                window = sequence[i:i+12]
-                if len(window) == 12:
-                    states = self._process_window(window, track_name)
-                    windows.append(states)
-            
             # 计算符号映射的配对（原九和配对）
-            symbol_valid = 0
-            symbol_total = 0
-            for states in windows:
-                pair_result = self._calculate_nine_sum_pairs(states, track_name)
-                symbol_valid += pair_result['valid_pairs']
-                symbol_total += pair_result['total_pairs']
+            window_count, symbol_valid, symbol_total = self._count_track1_symbol_pairs(sequence)
             
             symbol_result = {
                 'valid_pairs': symbol_valid,
@@ -174,7 +811,7 @@ class FourTrackAnalyzer(BaseAnalyzer):
             yinyang_result = self._calculate_yinyang(sequence, track_name)
             
             return {
-                'window_count': len(windows),
+                'window_count': window_count,
                 'symbol_pairs': symbol_result,
                 'digit_pairs': digit_result,
                 'global_digit_pairs': {'valid_pairs': 0, 'total_pairs': 0, 'pair_ratio': 0, 'pair_types': {}, 'unpaired': {}},
@@ -195,6 +832,118 @@ class FourTrackAnalyzer(BaseAnalyzer):
                 'yinyang': yinyang_result
             }
     
+    def _compile_track1_tables(self) -> None:
+        """取出轨道1编译好的属性位平面、八态编码表和八卦配对表（NumPy向量化引擎使用）"""
+        window_track = self.tracks['track1']
+        
+        # 属性位平面：shape (维度数, 10)，每个维度一行，按数字索引
+        self._attribute_planes = window_track.attribute_planes
+        
+        # 3位二进制值（b0*4 + b1*2 + b2）到状态ID的映射，未定义编码回退为1
+        self._state_lut = window_track.state_lut
+        
+        # 八卦配对表：状态ID到配对状态ID，0表示无配对
+        self._bagua_lut = window_track.pairing_lut
+    
+    def _track1_window_matches(self, digits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        向量化计算轨道1每个12位窗口的八卦配对数（正向和反向）
+        
+        每个3位子序列的状态只计算一次，窗口的p1-p4状态通过步长为3的偏移取得。
+        反向序列中的窗口恰好是正向窗口的逆序：其p1-p4为正向p4-p1各自逆序后的状态，
+        因此反向配对可以在同一组正向窗口上用逆序位编码求得，无需构造反向序列。
+        
+        Args:
+            digits: 数字序列的uint8数组；二维数组按行（最后一维）分别计算
+            
+        Returns:
+            (正向每窗口有效配对数, 反向每窗口有效配对数)，按正向窗口起始位置排列
+        """
+        window_count = max(digits.shape[-1] - TRACK1_OVERLAP, 0)
+        forward = np.zeros(digits.shape[:-1] + (window_count,), dtype=np.uint8)
+        backward = np.zeros(digits.shape[:-1] + (window_count,), dtype=np.uint8)
+        if window_count == 0:
+            return forward, backward
+        
+        for plane in self._attribute_planes:
+            bits = plane[digits]
+            # 每个起始位置的3位编码（正序与逆序）
+            states = self._state_lut[(bits[..., :-2] << 2) | (bits[..., 1:-1] << 1) | bits[..., 2:]]
+            reversed_states = self._state_lut[(bits[..., 2:] << 2) | (bits[..., 1:-1] << 1) | bits[..., :-2]]
+            
+            # 正向：P1与P3、P2与P4配对（八卦系统规则）
+            forward += self._bagua_lut[states[..., 0:window_count]] == states[..., 6:window_count + 6]
+            forward += self._bagua_lut[states[..., 3:window_count + 3]] == states[..., 9:window_count + 9]
+            
+            # 反向：P1'=逆序(P4)、P2'=逆序(P3)、P3'=逆序(P2)、P4'=逆序(P1)
+            backward += self._bagua_lut[reversed_states[..., 9:window_count + 9]] == reversed_states[..., 3:window_count + 3]
+            backward += self._bagua_lut[reversed_states[..., 6:window_count + 6]] == reversed_states[..., 0:window_count]
+        
+        return forward, backward
+    
+    def _count_track1_symbol_pairs(self, sequence: List[int]) -> Tuple[int, int, int]:
+        """
+        向量化计算轨道1所有12位窗口的八卦配对
+        
+        与逐窗口调用 _process_window / _calculate_nine_sum_pairs 的结果完全一致。
+        
+        Args:
+            sequence: 数字序列
+            
+        Returns:
+            (窗口数量, 有效配对数, 总配对数)
+        """
+        forward, _ = self._track1_window_matches(as_digit_array(sequence))
+        window_count = len(forward)
+        total_pairs = window_count * len(self._attribute_planes) * 2
+        return window_count, int(forward.sum()), total_pairs
+    
+    def _analyze_track_bidirectional(self, sequence: List[int], digits_array: np.ndarray,
+                                     track_name: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        同时分析单个轨道的正向和反向结果
+        
+        全局数字配对、阴阳计数和轨道1的数字配对都与顺序无关，只计算一次；
+        轨道1的窗口配对在同一次窗口扫描中同时得到正向和反向结果。
+        结果与分别对 sequence 和 sequence[::-1] 调用 _analyze_track 完全一致。
+        
+        Args:
+            sequence: 数字序列
+            digits_array: 数字序列的uint8数组
+            track_name: 轨道名称
+            
+        Returns:
+            (正向结果, 反向结果)
+        """
+        if track_name != 'track1' or len(sequence) < 2:
+            # 轨道2-4（以及过短序列）的结果完全与顺序无关
+            forward_result = self._analyze_track(sequence, track_name)
+            return forward_result, copy.deepcopy(forward_result)
+        
+        # 轨道1：顺序无关部分共享
+        digit_result = self._calculate_digit_pairs(sequence, track_name)
+        yinyang_result = self._calculate_yinyang(sequence, track_name)
+        
+        forward_matches, backward_matches = self._track1_window_matches(digits_array)
+        window_count = len(forward_matches)
+        symbol_total = window_count * len(self._attribute_planes) * 2
+        
+        directional_results = []
+        for symbol_valid in (int(forward_matches.sum()), int(backward_matches.sum())):
+            directional_results.append({
+                'window_count': window_count,
+                'symbol_pairs': {
+                    'valid_pairs': symbol_valid,
+                    'total_pairs': symbol_total,
+                    'pair_ratio': symbol_valid / symbol_total if symbol_total > 0 else 0
+                },
+                'digit_pairs': dict(digit_result),
+                'global_digit_pairs': {'valid_pairs': 0, 'total_pairs': 0, 'pair_ratio': 0, 'pair_types': {}, 'unpaired': {}},
+                'yinyang': dict(yinyang_result)
+            })
+        
+        return directional_results[0], directional_results[1]
+    
     def _process_window(self, window: List[int], track_name: str) -> Dict[str, Any]:
         """处理单个窗口，生成状态"""
         # 分割为四个3位子序列
@@ -207,7 +956,7 @@ class FourTrackAnalyzer(BaseAnalyzer):
         
         if track_name == 'track1':
             # 轨道1：四个维度
-            dimensions = ['small_large', 'up_down', 'odd_even', 'ab_relation']
+            dimensions = self.tracks['track1'].dimensions
             for dim in dimensions:
                 states[dim] = {
                     'p1': self._generate_track1_states(p1, dim),
@@ -286,20 +1035,10 @@ class FourTrackAnalyzer(BaseAnalyzer):
         }
     
     def _calculate_digit_pairs(self, digits: List[int], track_name: str) -> Dict[str, Any]:
-        """计算数字本身的直接配对"""
-        valid_pairs = 0
-        total_pairs = 0
-        
-        # 每两个数字一对
-        for i in range(0, len(digits) - 1, 2):
-            if i + 1 < len(digits):
-                d1 = digits[i]
-                d2 = digits[i+1]
-                
-                # 根据轨道选择配对规则
-                if self._is_valid_digit_pair(d1, d2, track_name):
-                    valid_pairs += 1
-                total_pairs += 1
+        """计算数字本身的直接配对（每两个数字一对）"""
+        pair_counts = self._pair_histograms(as_digit_array(digits))
+        valid_pairs = int(pair_counts[0][self._pair_validity(track_name)].sum())
+        total_pairs = len(digits) // 2
         
         return {
             'valid_pairs': valid_pairs,
@@ -308,57 +1047,30 @@ class FourTrackAnalyzer(BaseAnalyzer):
         }
     
     def _is_valid_digit_pair(self, d1: int, d2: int, track_name: str) -> bool:
-        """检查数字对是否有效"""
-        if track_name == 'track2':
-            # 轨道2：和=9
-            valid_pairs = {
-                (1, 8): True, (8, 1): True,
-                (2, 7): True, (7, 2): True,
-                (3, 6): True, (6, 3): True,
-                (4, 5): True, (5, 4): True,
-                (9, 0): True, (0, 9): True
-            }
-            return valid_pairs.get((d1, d2), False)
-        
-        elif track_name == 'track3':
-            # 轨道3：和=10
-            valid_pairs = {
-                (1, 9): True, (9, 1): True,
-                (2, 8): True, (8, 2): True,
-                (3, 7): True, (7, 3): True,
-                (4, 6): True, (6, 4): True,
-                (5, 0): True, (0, 5): True
-            }
-            return valid_pairs.get((d1, d2), False)
-        
-        elif track_name == 'track4':
-            # 轨道4：特定组合
-            valid_pairs = {
-                (1, 8): True, (8, 1): True,
-                (2, 5): True, (5, 2): True,
-                (3, 6): True, (6, 3): True,
-                (4, 7): True, (7, 4): True,
-                (9, 0): True, (0, 9): True
-            }
-            return valid_pairs.get((d1, d2), False)
-        
-        else:
-            # 轨道1：不使用数字配对
-            return False
+        """检查数字对是否有效（轨道1不使用数字配对）"""
+        table = self._pair_tables.get(track_name)
+        return bool(table[d1, d2]) if table is not None else False
     
     def _calculate_yinyang(self, sequence: List[int], track_name: str) -> Dict[str, Any]:
         """计算阴阳状态和比例"""
-        if track_name == 'track1':
-            # 轨道1的阴阳计算：小数字(1-7)为阳，大数字(0,8,9)为阴
-            yang_count = sum(1 for num in sequence if 1 <= num <= 7)
-            yin_count = len(sequence) - yang_count
-        else:
-            # 轨道2-4的阴阳计算
-            yinyang_class = self.yinyang_classifications[track_name]
+        digit_counts = np.bincount(as_digit_array(sequence), minlength=10)
+        return self._yinyang_from_counts(digit_counts, len(sequence), track_name)
+    
+    def _yinyang_from_counts(self, digit_counts: np.ndarray, length: int, track_name: str) -> Dict[str, Any]:
+        """
+        基于数字直方图计算阴阳状态和比例（与 _calculate_yinyang 结果一致）
+        
+        Args:
+            digit_counts: 0-9各数字的出现次数
+            length: 序列长度
+            track_name: 轨道名称
             
-            symbols = self._get_symbols(track_name, sequence)
-            yang_count = sum(1 for s in symbols if s in yinyang_class['yang'])
-            yin_count = sum(1 for s in symbols if s in yinyang_class['yin'])
+        Returns:
+            阴阳统计结果
+        """
+        track = self.tracks[track_name]
+        yang_count = int(np.dot(digit_counts, track.yang_lut))
+        yin_count = int(np.dot(digit_counts, track.yin_lut))
         
         ratio = yang_count / yin_count if yin_count > 0 else float('inf')
         
@@ -366,49 +1078,50 @@ class FourTrackAnalyzer(BaseAnalyzer):
             'yang_count': yang_count,
             'yin_count': yin_count,
             'ratio': ratio,
-            'yang_percent': yang_count / len(sequence) if sequence else 0
+            'yang_percent': yang_count / length if length else 0
         }
     
     def _analyze_direct_pairing(self, sequence: List[int], track_name: str) -> Dict[str, Any]:
         """分析数字本身的直接配对"""
-        if len(sequence) < 2:
-            return {
-                'valid_pairs': 0,
-                'total_pairs': 0,
-                'pair_ratio': 0,
-                'unpaired_count': 0
-            }
+        pair_counts = self._pair_histograms(as_digit_array(sequence))
+        forward_result, _ = self._direct_pairing_from_histograms(pair_counts, len(sequence), track_name)
+        return forward_result
+    
+    def _analyze_direct_pairing_bidirectional(self, sequence: List[int],
+                                              track_name: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        同时完成正向和反向的直接配对分析
         
-        # 全局配对分析
-        total_pairs = len(sequence) // 2
-        valid_pairs = 0
+        结果与分别对 sequence 和 sequence[::-1] 调用 _analyze_direct_pairing 完全一致。
         
-        for i in range(0, len(sequence) - 1, 2):
-            d1 = sequence[i]
-            d2 = sequence[i+1]
+        Args:
+            sequence: 数字序列
+            track_name: 轨道名称
             
-            # 根据轨道选择配对规则
-            if self._is_valid_digit_pair(d1, d2, track_name):
-                valid_pairs += 1
-        
-        unpaired_count = len(sequence) % 2
-        
-        return {
-            'valid_pairs': valid_pairs,
-            'total_pairs': total_pairs,
-            'pair_ratio': valid_pairs / total_pairs if total_pairs > 0 else 0,
-            'unpaired_count': unpaired_count
-        }
+        Returns:
+            (正向配对结果, 反向配对结果)
+        """
+        pair_counts = self._pair_histograms(as_digit_array(sequence))
+        return self._direct_pairing_from_histograms(pair_counts, len(sequence), track_name)
     
     def _analyze_global_digit_pairs(self, digits: List[int], track_name: str) -> Dict[str, Any]:
         """分析数字本身的全局直接配对"""
-        from collections import Counter
-        
-        # 统计数字出现次数
-        digit_count = Counter(digits)
+        return self._global_digit_pairs_from_counts(Counter(digits), len(digits), track_name)
+    
+    def _global_digit_pairs_from_counts(self, digit_count: Counter, length: int, track_name: str) -> Dict[str, Any]:
+        """
+        基于数字计数执行全局直接配对（与顺序无关）
         
+        Args:
+            digit_count: 数字计数
+            length: 序列长度
+            track_name: 轨道名称
+            
+        Returns:
+            全局配对结果
+        """
         # 复制计数器用于配对分析
-        remaining_digits = Counter(digits)
+        remaining_digits = Counter(digit_count)
         
         # 配对结果
         valid_pairs = 0
@@ -416,49 +1129,8 @@ class FourTrackAnalyzer(BaseAnalyzer):
         unpaired = {}
         
         # 根据轨道选择配对规则
-        if track_name == 'track2':
-            # 轨道2：和=9的配对
-            pair_rules = [
-                ((1, 8), 'A', '阳'),
-                ((8, 1), 'A', '阳'),
-                ((2, 7), 'B', '阴'),
-                ((7, 2), 'B', '阴'),
-                ((3, 6), 'C', '阳'),
-                ((6, 3), 'C', '阳'),
-                ((4, 5), 'D', '阴'),
-                ((5, 4), 'D', '阴'),
-                ((9, 0), 'E', '阳'),
-                ((0, 9), 'E', '阳')
-            ]
-        elif track_name == 'track3':
-            # 轨道3：和=10的配对
-            pair_rules = [
-                ((1, 9), '甲', '阳'),
-                ((9, 1), '甲', '阳'),
-                ((2, 8), '乙', '阴'),
-                ((8, 2), '乙', '阴'),
-                ((3, 7), '丙', '阳'),
-                ((7, 3), '丙', '阳'),
-                ((4, 6), '丁', '阴'),
-                ((6, 4), '丁', '阴'),
-                ((5, 0), '戊', '阳'),
-                ((0, 5), '戊', '阳')
-            ]
-        elif track_name == 'track4':
-            # 轨道4：特定组合的配对
-            pair_rules = [
-                ((1, 8), '一', '阳'),
-                ((8, 1), '一', '阳'),
-                ((2, 5), '二', '阴'),
-                ((5, 2), '二', '阴'),
-                ((3, 6), '三', '阳'),
-                ((6, 3), '三', '阳'),
-                ((4, 7), '四', '阴'),
-                ((7, 4), '四', '阴'),
-                ((9, 0), '五', '阳'),
-                ((0, 9), '五', '阳')
-            ]
-        else:
+        pair_rules = self.pair_rules.get(track_name)
+        if pair_rules is None:
             return {
                 'valid_pairs': 0,
                 'total_pairs': 0,
@@ -500,7 +1172,7 @@ class FourTrackAnalyzer(BaseAnalyzer):
                 unpaired[digit] = count
         
         # 计算总可能的配对数
-        total_pairs = len(digits) // 2
+        total_pairs = length // 2
         
         return {
             'valid_pairs': valid_pairs,
@@ -597,7 +1269,7 @@ class FourTrackAnalyzer(BaseAnalyzer):
         for i in range(10):
             if i not in self.number_attributes:
                 raise ValueError(f"数字 {i} 缺少属性定义")
-            required_dims = ['small_large', 'up_down', 'odd_even', 'ab_relation']
+            required_dims = self.tracks['track1'].dimensions
             for dim in required_dims:
                 if dim not in self.number_attributes[i]:
                     raise ValueError(f"数字 {i} 缺少维度 {dim}")
@@ -611,7 +1283,7 @@ class FourTrackAnalyzer(BaseAnalyzer):
             if i not in self.number_attributes:
                 errors.append(f"数字 {i} 缺少属性定义")
             else:
-                required_dims = ['small_large', 'up_down', 'odd_even', 'ab_relation']
+                required_dims = self.tracks['track1'].dimensions
                 for dim in required_dims:
                     if dim not in self.number_attributes[i]:
                         errors.append(f"数字 {i} 缺少维度 {dim}")
@@ -629,10 +1301,7 @@ class FourTrackAnalyzer(BaseAnalyzer):
         """创建错误响应"""
         return {
             'error': error_message,
-            'track1': {},
-            'track2': {},
-            'track3': {},
-            'track4': {},
+            **{track: {} for track in self.track_names},
             'direct_pairing': {}
         }
     
@@ -750,7 +1419,7 @@ class FourTrackAnalyzer(BaseAnalyzer):
         
         # 计算每个轨道的对称性
         symmetry_scores = []
-        for track in ['track1', 'track2', 'track3', 'track4']:
+        for track in self.track_names:
             if track in results and 'symmetry' in results[track]:
                 symmetry = results[track]['symmetry']['overall_symmetry']
                 summary['track_symmetry'][track] = symmetry
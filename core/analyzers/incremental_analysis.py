@@ -0,0 +1,275 @@
+# core/analyzers/incremental_analysis.py
+# 增量分析
+
+import os
+import re
+import json
+import hashlib
+from typing import BinaryIO, Dict, List, Any, Optional, Tuple, Union
+from core.analyzers.four_track_analyzer import FourTrackAnalyzer, FourTrackPartialState
+from core.analyzers.statistical_analyzer import StatisticalAnalyzer, StatisticalPartialState
+from core.data.digit_sequence import DigitSequence
+
+# 状态文件格式版本，格式不兼容时递增
+STATE_FORMAT_VERSION = 2
+
+# 读取数据文件时每次读取的字节数
+READ_CHUNK_SIZE = 1 << 20
+
+# 按精度命名的数据文件（DataWriter.write_constant_with_precision 写入的 {name}_{precision}digits.txt）
+PRECISION_FILE_PATTERN = re.compile(r'^(?P<name>.+)_(?P<precision>\d+)digits$')
+
+# 状态文件名后缀
+STATE_FILE_SUFFIX = '_incremental.json'
+
+class IncrementalAnalysis:
+    """
+    只追加序列的增量分析句柄
+    
+    保存四轨道分析和统计分析的运行计数器（以及末尾11位数字），
+    extend() 只处理新追加的数字，耗时与追加长度成正比。
+    状态可以保存在数据文件旁边，之后的进程加载后继续追加；
+    由数据文件得到的状态另记录已分析的字节数和这些字节的 BLAKE2b 摘要（source）。
+    """
+    
+    def __init__(self, digits: Union[List[int], DigitSequence] = None,
+                 four_track_analyzer: FourTrackAnalyzer = None,
+                 statistical_analyzer: StatisticalAnalyzer = None):
+        """
+        初始化增量分析
+        
+        Args:
+            digits: 初始数字序列（可选）
+            four_track_analyzer: 四轨道分析器（可选）
+            statistical_analyzer: 统计分析器（可选）
+        """
+        self.four_track_analyzer = four_track_analyzer or FourTrackAnalyzer()
+        self.statistical_analyzer = statistical_analyzer or StatisticalAnalyzer()
+        self.four_track_state = FourTrackPartialState()
+        self.statistical_state = StatisticalPartialState()
+        # 数据文件中已分析的部分：{'bytes': 字节数, 'blake2b': 摘要}，不是由文件得到时为None
+        self.source: Optional[Dict[str, Any]] = None
+        if digits is not None:
+            self.extend(digits)
+    
+    @property
+    def length(self) -> int:
+        """已分析的数字个数"""
+        return self.four_track_state.length
+    
+    def extend(self, new_digits: Union[List[int], DigitSequence]) -> None:
+        """
+        追加数字并更新运行状态
+        
+        Args:
+            new_digits: 追加的数字序列
+        
+        Raises:
+            ValueError: 包含非法数字
+        """
+        new_digits = DigitSequence(new_digits)
+        if len(new_digits) == 0:
+            return
+        self.four_track_state = self.four_track_analyzer.merge_states(
+            self.four_track_state, self.four_track_analyzer.partial_state(new_digits))
+        self.statistical_state = self.statistical_analyzer.merge_states(
+            self.statistical_state, self.statistical_analyzer.partial_state(new_digits))
+    
+    def result(self) -> Dict[str, Any]:
+        """
+        获取当前结果
+        
+        Returns:
+            四轨道分析和统计分析结果，与对完整序列调用各分析器的 analyze() 一致
+        """
+        return {
+            'four_track': self.four_track_analyzer.finalize_state(self.four_track_state),
+            'statistical': self.statistical_analyzer.finalize_state(self.statistical_state),
+            'total_digits': self.length
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        return {
+            'format_version': STATE_FORMAT_VERSION,
+            'analyzers': {
+                'four_track': self.four_track_analyzer.get_version(),
+                'statistical': self.statistical_analyzer.get_version()
+            },
+            'four_track': self.four_track_state.to_dict(),
+            'statistical': self.statistical_state.to_dict(),
+            'source': self.source
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any],
+                  four_track_analyzer: FourTrackAnalyzer = None,
+                  statistical_analyzer: StatisticalAnalyzer = None) -> 'IncrementalAnalysis':
+        """
+        从 to_dict() 的结果恢复
+        
+        Raises:
+            ValueError: 状态格式或分析器版本不匹配
+        """
+        analysis = cls(four_track_analyzer=four_track_analyzer, statistical_analyzer=statistical_analyzer)
+        if data.get('format_version') != STATE_FORMAT_VERSION:
+            raise ValueError(f"不支持的增量状态格式: {data.get('format_version')}")
+        expected_versions = analysis.to_dict()['analyzers']
+        if data.get('analyzers') != expected_versions:
+            raise ValueError(f"增量状态的分析器版本不匹配: {data.get('analyzers')}")
+        
+        analysis.four_track_state = FourTrackPartialState.from_dict(data['four_track'])
+        analysis.statistical_state = StatisticalPartialState.from_dict(data['statistical'])
+        analysis.source = data.get('source')
+        if analysis.statistical_state.length != analysis.four_track_state.length:
+            raise ValueError("增量状态已损坏：各分析器的长度不一致")
+        return analysis
+    
+    @staticmethod
+    def state_path(data_file: str) -> str:
+        """
+        获取数据文件对应的状态文件路径
+        
+        Args:
+            data_file: 数据文件路径（如 data/pi_100000digits.txt）
+        
+        Returns:
+            状态文件路径（如 data/pi_100000digits_incremental.json）
+        """
+        return f"{os.path.splitext(data_file)[0]}{STATE_FILE_SUFFIX}"
+    
+    @staticmethod
+    def candidate_state_paths(data_file: str) -> List[str]:
+        """
+        获取可用于继续分析数据文件的状态文件路径
+        
+        依次为数据文件自身的状态文件，以及同一常数较低精度文件（{name}_{precision}digits.txt）
+        的状态文件（按精度降序）：较低精度的文件是较高精度文件的前缀。
+        
+        Args:
+            data_file: 数据文件路径
+        
+        Returns:
+            状态文件路径列表（不检查文件是否存在）
+        """
+        candidates = [IncrementalAnalysis.state_path(data_file)]
+        directory, base = os.path.split(os.path.splitext(data_file)[0])
+        match = PRECISION_FILE_PATTERN.match(base)
+        if not match or not os.path.isdir(directory or '.'):
+            return candidates
+        
+        lower = []
+        for filename in os.listdir(directory or '.'):
+            if not filename.endswith(STATE_FILE_SUFFIX):
+                continue
+            other = PRECISION_FILE_PATTERN.match(filename[:-len(STATE_FILE_SUFFIX)])
+            if (other and other.group('name') == match.group('name') and
+                    int(other.group('precision')) < int(match.group('precision'))):
+                lower.append((int(other.group('precision')), os.path.join(directory, filename)))
+        candidates.extend(path for _, path in sorted(lower, reverse=True))
+        return candidates
+    
+    def save(self, path: str) -> bool:
+        """
+        保存状态
+        
+        Args:
+            path: 状态文件路径
+        
+        Returns:
+            是否成功
+        """
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"保存增量状态失败: {e}")
+            return False
+    
+    @classmethod
+    def load(cls, path: str, **analyzers) -> Optional['IncrementalAnalysis']:
+        """
+        加载状态
+        
+        Args:
+            path: 状态文件路径
+            **analyzers: 传给构造函数的分析器（可选）
+        
+        Returns:
+            增量分析句柄，文件不存在或无法使用时返回None
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls.from_dict(json.load(f), **analyzers)
+        except Exception as e:
+            print(f"加载增量状态失败: {e}")
+            return None
+    
+    @classmethod
+    def for_file(cls, data_file: str, **analyzers) -> 'IncrementalAnalysis':
+        """
+        分析数据文件，复用已保存的状态，只处理其后追加的数字
+        
+        按 candidate_state_paths() 的顺序尝试状态（文件自身的状态，其次是同一常数较低精度文件的状态）：
+        按块计算文件开头已分析字节的 BLAKE2b 摘要并与状态中的摘要比较（不解析数字），
+        第一个一致的状态从保存的字节位置继续读取，只解析其后的字节；都不一致时
+        （文件被改写而非追加）从头重新分析。摘要随读取增量更新，结束后状态写回数据文件旁边。
+        
+        Args:
+            data_file: 数据文件路径
+            **analyzers: 传给构造函数的分析器（可选）
+        
+        Returns:
+            覆盖整个文件的增量分析句柄
+        """
+        with open(data_file, 'rb') as f:
+            analysis, digest = cls._resume(f, cls.candidate_state_paths(data_file), analyzers)
+            offset = f.tell()
+            for block in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                digest.update(block)
+                analysis.extend(DigitSequence.from_string(block))
+                offset += len(block)
+        
+        analysis.source = {'bytes': offset, 'blake2b': digest.hexdigest()}
+        analysis.save(cls.state_path(data_file))
+        return analysis
+    
+    @classmethod
+    def _resume(cls, f: BinaryIO, state_files: List[str],
+                analyzers: Dict[str, Any]) -> Tuple['IncrementalAnalysis', Any]:
+        """
+        找到第一个已分析字节与文件开头一致的状态，文件位置停在已分析部分之后
+        
+        Returns:
+            (增量分析句柄, 已分析字节的摘要对象)，没有可用状态时为新的句柄和空摘要（文件位置为0）
+        """
+        for state_file in state_files:
+            analysis = cls.load(state_file, **analyzers)
+            if analysis is None or analysis.source is None:
+                continue
+            f.seek(0)
+            digest = hashlib.blake2b()
+            if cls._hash_prefix(f, analysis.source['bytes'], digest) == analysis.source['blake2b']:
+                return analysis, digest
+        f.seek(0)
+        return cls(**analyzers), hashlib.blake2b()
+    
+    @staticmethod
+    def _hash_prefix(f: BinaryIO, size: int, digest: Any) -> Optional[str]:
+        """
+        按块读取文件开头 size 个字节并更新摘要
+        
+        Returns:
+            摘要（十六进制），文件不足 size 个字节时返回None
+        """
+        remaining = size
+        while remaining > 0:
+            block = f.read(min(remaining, READ_CHUNK_SIZE))
+            if not block:
+                return None
+            digest.update(block)
+            remaining -= len(block)
+        return digest.hexdigest()
@@ -0,0 +1,198 @@
+# core/analyzers/ngram_spectrum.py
+# n元组频谱
+
+from typing import Dict, Iterable, List, Tuple, Union
+import numpy as np
+from core.data.digit_sequence import DigitSequence, as_digit_array
+
+# 不超过该长度的n元组用稠密 bincount 计数（10^6 个计数器），更长的用 np.unique
+DENSE_MAX_LENGTH = 6
+
+# int64 十进制编码最多容纳的n元组长度
+MAX_CODE_LENGTH = 18
+
+class NGramSpectrum:
+    """
+    n元组频谱
+    
+    每个长度为k的n元组编码为十进制整数（d0*10^(k-1) + ... + d(k-1)），
+    由长度k-1的编码滑动得到：codes_k = codes_(k-1)[:-1] * 10 + digits[k-1:]。
+    各长度的计数在第一次查询时计算并缓存，多个使用者查询同一对象时不重复计数。
+    """
+    
+    def __init__(self, digits: Union[List[int], DigitSequence, np.ndarray], max_length: int = 8):
+        """
+        初始化n元组频谱
+        
+        Args:
+            digits: 数字序列
+            max_length: 支持查询的最大n元组长度
+        
+        Raises:
+            ValueError: max_length 超出编码范围
+        """
+        if not 1 <= max_length <= MAX_CODE_LENGTH:
+            raise ValueError(f"n元组最大长度必须在1到{MAX_CODE_LENGTH}之间: {max_length}")
+        self.digits = as_digit_array(digits)
+        self.length = len(self.digits)
+        self.max_length = max_length
+        # 长度k -> (升序编码, 出现次数)
+        self._tables: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        # 长度k -> 各编码（与 _tables 对齐）的首次出现位置
+        self._first_positions: Dict[int, np.ndarray] = {}
+        # 最近一次计算的编码数组，用于按长度递增滑动
+        self._codes: Tuple[int, np.ndarray] = (0, np.zeros(self.length + 1, dtype=np.int64))
+    
+    def codes(self, k: int) -> np.ndarray:
+        """
+        获取所有长度为k的n元组的编码
+        
+        Args:
+            k: n元组长度
+        
+        Returns:
+            长度为 n-k+1 的int64数组，第i项为从位置i开始的n元组编码
+        """
+        self._check_length(k)
+        cached_k, codes = self._codes
+        if cached_k > k:
+            cached_k, codes = 0, np.zeros(self.length + 1, dtype=np.int64)
+        for length in range(cached_k + 1, k + 1):
+            if len(codes) <= 1:
+                codes = np.zeros(0, dtype=np.int64)
+            else:
+                codes = codes[:-1] * 10 + self.digits[length - 1:]
+        self._codes = (k, codes)
+        return codes
+    
+    def table(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        获取长度为k的n元组计数表
+        
+        Args:
+            k: n元组长度
+        
+        Returns:
+            (出现过的编码（升序）, 对应的出现次数)
+        """
+        if k not in self._tables:
+            codes = self.codes(k)
+            if k <= DENSE_MAX_LENGTH:
+                counts = np.bincount(codes, minlength=10 ** k)
+                present = np.flatnonzero(counts)
+                self._tables[k] = (present, counts[present])
+            else:
+                self._tables[k] = np.unique(codes, return_counts=True)
+        return self._tables[k]
+    
+    def count_values(self, k: int) -> np.ndarray:
+        """
+        获取长度为k的各n元组出现次数（不关心编码时使用）
+        
+        已缓存计数表或 k 不超过 DENSE_MAX_LENGTH 时直接取 table(k)；
+        否则排序后按段长计数且不缓存，长序列上查询多个长度时内存只占一份编码。
+        
+        Args:
+            k: n元组长度
+        
+        Returns:
+            出现过的各n元组的出现次数（顺序不保证）
+        """
+        if k in self._tables or k <= DENSE_MAX_LENGTH:
+            return self.table(k)[1]
+        codes = np.sort(self.codes(k))
+        if len(codes) == 0:
+            return np.zeros(0, dtype=np.int64)
+        edges = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        return np.diff(np.concatenate(([0], edges, [len(codes)])))
+    
+    def counts(self, k: int) -> np.ndarray:
+        """
+        获取长度为k的稠密计数数组
+        
+        Args:
+            k: n元组长度（不超过 DENSE_MAX_LENGTH）
+        
+        Returns:
+            长度为 10^k 的数组，下标为n元组编码
+        """
+        if k > DENSE_MAX_LENGTH:
+            raise ValueError(f"稠密计数只支持长度不超过{DENSE_MAX_LENGTH}的n元组: {k}")
+        present, counts = self.table(k)
+        dense = np.zeros(10 ** k, dtype=np.int64)
+        dense[present] = counts
+        return dense
+    
+    def first_positions(self, k: int) -> np.ndarray:
+        """
+        获取长度为k的各n元组的首次出现位置（与 table(k) 的编码对齐）
+        
+        Args:
+            k: n元组长度
+        
+        Returns:
+            首次出现位置数组
+        """
+        if k not in self._first_positions:
+            self._first_positions[k] = np.unique(self.codes(k), return_index=True)[1]
+        return self._first_positions[k]
+    
+    def count(self, ngram: Iterable[int]) -> int:
+        """
+        获取一个n元组的出现次数
+        
+        Args:
+            ngram: n元组
+        
+        Returns:
+            出现次数
+        """
+        ngram = list(ngram)
+        code = 0
+        for digit in ngram:
+            code = code * 10 + int(digit)
+        present, counts = self.table(len(ngram))
+        index = np.searchsorted(present, code)
+        return int(counts[index]) if index < len(present) and present[index] == code else 0
+    
+    def max_count(self, k: int) -> int:
+        """获取长度为k的n元组的最大出现次数（序列不足k位时为0）"""
+        counts = self.table(k)[1]
+        return int(counts.max()) if len(counts) else 0
+    
+    def items(self, k: int, min_count: int = 1) -> List[Tuple[Tuple[int, ...], int]]:
+        """
+        获取长度为k的n元组及其出现次数
+        
+        Args:
+            k: n元组长度
+            min_count: 最少出现次数
+        
+        Returns:
+            [(n元组, 出现次数)]，按首次出现位置排序（与逐位累加的字典迭代顺序一致）
+        """
+        present, counts = self.table(k)
+        order = np.argsort(self.first_positions(k), kind='stable')
+        order = order[counts[order] >= min_count]
+        ngrams = self.decode(present[order], k)
+        return list(zip(ngrams, counts[order].tolist()))
+    
+    @staticmethod
+    def decode(codes: np.ndarray, k: int) -> List[Tuple[int, ...]]:
+        """
+        将编码还原为n元组
+        
+        Args:
+            codes: 编码数组
+            k: n元组长度
+        
+        Returns:
+            n元组列表
+        """
+        powers = 10 ** np.arange(k - 1, -1, -1, dtype=np.int64)
+        return [tuple(row) for row in ((np.asarray(codes)[:, None] // powers) % 10).tolist()]
+    
+    def _check_length(self, k: int) -> None:
+        """检查n元组长度是否在支持范围内"""
+        if not 1 <= k <= self.max_length:
+            raise ValueError(f"n元组长度必须在1到{self.max_length}之间: {k}")
@@ -1,21 +1,284 @@
 # core/analyzers/pattern_analyzer.py
 # 模式分析器
 
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple, Union
 from collections import Counter
+import heapq
 import numpy as np
+from core.analyzers.analysis_context import AnalysisContext
 from core.analyzers.base_analyzer import BaseAnalyzer
+from core.analyzers.ngram_spectrum import DENSE_MAX_LENGTH, MAX_CODE_LENGTH, NGramSpectrum
+from core.analyzers.sketches import CountMinSketch, SpaceSaving
+from core.analyzers.suffix_array import (group_positions, repeated_substring_counts, repeated_substring_groups,
+                                         repeated_substrings)
+from core.data.digit_sequence import DigitSequence, as_digit_array
+
+# 近似模式未指定 top_k 时输出的模式个数
+APPROXIMATE_TOP_K = 100
+
+# 序列模式的类型（相邻差值为 +1 / -1）
+SEQUENTIAL_TYPES = ('sequential_increasing', 'sequential_decreasing')
+
+def _run_lengths(positions: np.ndarray) -> np.ndarray:
+    """升序位置数组中各段连续位置的长度"""
+    if len(positions) == 0:
+        return positions
+    breaks = np.flatnonzero(np.diff(positions) != 1)
+    return np.diff(np.concatenate(([-1], breaks, [len(positions) - 1])))
+
+def _run_statistics(matched: np.ndarray, period: int) -> Tuple[int, int]:
+    """
+    统计布尔掩码的真值游程
+    
+    逐级腐蚀：eroded[i] 表示 matched[i:i+level] 全为真，每级一次按位与，level 按倍增增长且不超过 period。
+    长度 L >= level 的游程在腐蚀后剩 L-level+1 位，真值足够稀疏后才提取位置划分游程，
+    因此随机序列中只需处理约百分之一的位置。
+    
+    Args:
+        matched: 掩码
+        period: 周期
+    
+    Returns:
+        (最长游程长度, 各游程 max(L-period+1, 0) 之和)
+    """
+    level, eroded = 1, matched
+    previous = None
+    while level < period and np.count_nonzero(eroded) * 16 > len(eroded):
+        shift = min(level, period - level)
+        previous = (level, eroded)
+        eroded = eroded[:-shift] & eroded[shift:]
+        level += shift
+    
+    runs = _run_lengths(np.flatnonzero(eroded)) + level - 1
+    if len(runs) == 0 and previous is not None:
+        # 最后一级为空：最长游程短于该级（也短于 period），由上一级得到
+        level, eroded = previous
+        runs = _run_lengths(np.flatnonzero(eroded)) + level - 1
+    longest_run = int(runs.max()) if len(runs) else 0
+    return longest_run, int(np.maximum(runs - period + 1, 0).sum())
+
+def _trailing_run(matched: np.ndarray) -> int:
+    """掩码末尾连续为真的长度（从末尾按逐级扩大的块向前查找，避免整段反向扫描）"""
+    block = 64
+    while True:
+        tail = matched[-block:]
+        unmatched = np.flatnonzero(~tail)
+        if len(unmatched):
+            return len(tail) - 1 - int(unmatched[-1])
+        if block >= len(matched):
+            return len(matched)
+        block *= 4
+
+class PeriodicityCounter:
+    """
+    分块累加的周期性剖面
+    
+    按顺序接收序列的各块，对每个周期p统计掩码 d[i] == d[i+p] 的游程：
+    块内完整的游程直接计入，延伸到块末尾的游程长度保留到下一块接续，
+    内存只与块大小和 max_period 有关。
+    """
+    
+    def __init__(self, max_period: int):
+        """
+        初始化周期性剖面计数器
+        
+        Args:
+            max_period: 最大周期
+        """
+        self.max_period = max_period
+        self._open = dict.fromkeys(range(2, max_period + 1), 0)
+        self._longest = dict.fromkeys(self._open, 0)
+        self._count = dict.fromkeys(self._open, 0)
+    
+    def update(self, window: np.ndarray, size: int) -> None:
+        """
+        接收一块
+        
+        Args:
+            window: 从块起点开始的数字数组，向后多取 max_period 位（序列末尾除外）
+            size: 块大小（只统计起点在块内的掩码位置）
+        """
+        for period in self._open:
+            length = min(size, len(window) - period)
+            if length <= 0:
+                continue
+            matched = window[:length] == window[period:period + length]
+            lead = int(np.argmin(matched))
+            if matched[lead]:
+                # 整块为真：游程延续到下一块
+                self._open[period] += length
+                continue
+            self._close(period, self._open[period] + lead)
+            trail = _trailing_run(matched)
+            longest_run, count = _run_statistics(matched[lead:length - trail], period)
+            self._longest[period] = max(self._longest[period], longest_run)
+            self._count[period] += count
+            self._open[period] = trail
+    
+    def _close(self, period: int, run: int) -> None:
+        """计入一个已结束的游程"""
+        self._longest[period] = max(self._longest[period], run)
+        self._count[period] += max(run - period + 1, 0)
+    
+    def profile(self) -> Dict[int, Dict[str, int]]:
+        """
+        获取到目前为止的周期性剖面（末尾未结束的游程视为结束，不改变状态）
+        
+        Returns:
+            周期 -> {'longest_run': 掩码最长连续为真的长度, 'count': 串联重复的起始位置个数}
+        """
+        return {
+            period: {
+                'longest_run': max(self._longest[period], run),
+                'count': self._count[period] + max(run - period + 1, 0)
+            }
+            for period, run in self._open.items()
+        }
+
+class PatternSelector:
+    """
+    流式模式选择器
+    
+    逐个接收检测到的模式：对全部模式累加密度和类型分布的运行总数，
+    只在大小为 top_k 的最小堆中保留得分最高的模式，内存为 O(top_k)。
+    """
+    
+    def __init__(self, top_k: Optional[int] = None, min_score: float = 0,
+                 max_positions: Optional[int] = None):
+        """
+        初始化模式选择器
+        
+        Args:
+            top_k: 保留的模式个数上限（None表示全部保留）
+            min_score: 保留模式的最低得分
+            max_positions: 每个模式保留的出现位置个数上限（None表示全部保留）
+        """
+        self.top_k = top_k
+        self.min_score = min_score
+        self.max_positions = max_positions
+        self.total_pattern_length = 0
+        self.total_patterns = 0
+        self.distribution = Counter()
+        self._retained: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._offered = 0
+    
+    def add(self, pattern: Dict[str, Any]) -> None:
+        """
+        接收一个模式（计入运行总数，并参与选取）
+        
+        Args:
+            pattern: 模式字典（包含 type、length、score，可选 count、positions）
+        """
+        self.count(pattern['type'], 1, pattern['length'] * pattern.get('count', 1))
+        self.offer(pattern)
+    
+    def count(self, pattern_type: str, patterns: int, pattern_length: int) -> None:
+        """
+        只累加运行总数（用于无需逐个生成的模式）
+        
+        Args:
+            pattern_type: 模式类型
+            patterns: 模式个数
+            pattern_length: 这些模式的 长度*次数 之和
+        """
+        self.total_pattern_length += pattern_length
+        self.total_patterns += patterns
+        self.distribution[pattern_type] += patterns
+    
+    def offer(self, pattern: Dict[str, Any]) -> None:
+        """
+        只参与选取，不计入运行总数
+        
+        Args:
+            pattern: 模式字典
+        """
+        self._offered += 1
+        if pattern['score'] < self.min_score or self.top_k == 0:
+            return
+        if self.max_positions is not None and 'positions' in pattern:
+            pattern['positions'] = pattern['positions'][:self.max_positions]
+        
+        # 得分相同时先检测到的模式优先（序号取负，堆顶为最晚检测到的）
+        entry = (pattern['score'], -self._offered, pattern)
+        if self.top_k is None:
+            self._retained.append(entry)
+        elif len(self._retained) < self.top_k:
+            heapq.heappush(self._retained, entry)
+        else:
+            heapq.heappushpop(self._retained, entry)
+    
+    def accepts(self, scores: np.ndarray) -> np.ndarray:
+        """
+        检查得分为 scores 的新模式现在送入时能否被保留（不改变状态）
+        
+        同分时先送入的模式优先，因此堆满后新模式的得分必须严格高于堆中最低得分。
+        
+        Args:
+            scores: 得分数组
+        
+        Returns:
+            布尔数组
+        """
+        keep = scores >= self.min_score
+        if self.top_k == 0:
+            keep &= False
+        elif self.top_k is not None and len(self._retained) >= self.top_k:
+            keep &= scores > self._retained[0][0]
+        return keep
+    
+    def patterns(self) -> List[Dict[str, Any]]:
+        """
+        获取保留的模式
+        
+        Returns:
+            未设置 top_k 时按检测顺序排列，否则按得分降序（得分相同时按检测顺序）
+        """
+        if self.top_k is None:
+            return [pattern for _, _, pattern in self._retained]
+        return [pattern for _, _, pattern in sorted(self._retained, key=lambda entry: (-entry[0], -entry[1]))]
 
 class PatternAnalyzer(BaseAnalyzer):
     """模式分析器"""
     
-    def __init__(self):
-        """初始化模式分析器"""
+    # 结果字段
+    outputs = ('patterns', 'repetition_score', 'pair_score', 'sequential_score', 'pattern_density',
+               'periodicity_profile', 'pattern_distribution', 'total_patterns')
+    
+    # 模式筛选和计数以 Python 循环为主，并行时放在进程池中运行
+    parallel_backend = 'process'
+    
+    def __init__(self, top_k: Optional[int] = None, min_score: float = 0,
+                 max_positions: Optional[int] = None, max_period: int = 10,
+                 approximate: bool = False, epsilon: float = 1e-4, delta: float = 0.01,
+                 chunk_size: int = 1 << 20):
+        """
+        初始化模式分析器
+        
+        Args:
+            top_k: 结果中保留的模式个数上限，按得分选取（None表示全部保留）
+            min_score: 结果中保留模式的最低得分
+            max_positions: 每个模式保留的出现位置个数上限（None表示全部保留）
+            max_period: 串联重复检测的最大周期（周期从2开始）
+            approximate: 是否使用近似模式（分块流式计数，内存固定，用于超长序列）
+            epsilon: 近似模式的计数误差（以该长度n元组总数为单位）
+            delta: 近似模式的误差超出 epsilon 的概率上限
+            chunk_size: 近似模式每块的数字个数
+        
+        pattern_density、pattern_distribution 和 total_patterns 始终按全部检测到的模式计算。
+        """
         self.max_pattern_length = 20
         self.min_pattern_length = 2
         self.min_repetitions = 2
+        self.max_period = max_period
+        self.top_k = top_k
+        self.min_score = min_score
+        self.max_positions = max_positions
+        self.approximate = approximate
+        self.epsilon = epsilon
+        self.delta = delta
+        self.chunk_size = chunk_size
     
-    def analyze(self, digits: List[int]) -> Dict[str, Any]:
+    def analyze(self, digits: Union[List[int], DigitSequence]) -> Dict[str, Any]:
         """
         分析数字序列中的模式
         
@@ -35,200 +298,496 @@ class PatternAnalyzer(BaseAnalyzer):
                 'pattern_density': 0
             }
         
+        if self.approximate:
+            return self._analyze_approximate(as_digit_array(digits))
+        
         digits = self.preprocess(digits)
+        return self._analyze_exact(digits, NGramSpectrum(digits, max_length=2))
         
-        # 检测模式
-        patterns = self._detect_patterns(digits)
+    def analyze_context(self, context: AnalysisContext) -> Dict[str, Any]:
+        """
+        使用共享的分析上下文分析（列表形式和n元组频谱取自上下文）
+        
+        Args:
+            context: 分析上下文
+        
+        Returns:
+            分析结果，与 analyze() 一致
+        """
+        if context.length == 0 or self.approximate:
+            return self.analyze(context.sequence)
+        return self._analyze_exact(context.tolist(), context.spectrum)
+    
+    def analyze_fields(self, context: AnalysisContext, fields: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        只计算需要的结果字段
+        
+        不需要 'patterns' 时不生成模式列表和出现位置，只统计模式个数、长度和类型分布，
+        其余字段与 analyze() 一致。
+        
+        Args:
+            context: 分析上下文
+            fields: 需要的结果字段（None表示全部）
+        
+        Returns:
+            分析结果
+        """
+        if fields is None or 'patterns' in fields or context.length == 0 or self.approximate:
+            return self.analyze_context(context)
+        return self._summarize_exact(context.digits, context.spectrum)
+    
+    def _summarize_exact(self, digits_array: np.ndarray, spectrum: NGramSpectrum) -> Dict[str, Any]:
+        """精确统计模式特征，不生成模式列表（与 _analyze_exact 去掉 'patterns' 后一致）"""
+        selector = PatternSelector(top_k=0)
+        
+        max_length = min(self.max_pattern_length, len(digits_array) // 2)
+        for pattern_length, substrings, occurrences in repeated_substring_counts(
+                digits_array.astype(np.int64), self.min_pattern_length, max_length, self.min_repetitions):
+            if substrings:
+                selector.count('repetition', substrings, occurrences * pattern_length)
+        
+        for start, end, pattern_type in self._sequential_runs(digits_array):
+            selector.count(pattern_type, 1, end - start + 1)
+        
+        # 配对模式：前10个高频配对中至少出现3次的
+        _, counts = spectrum.table(2)
+        top_counts = np.sort(counts)[::-1][:10]
+        top_counts = top_counts[top_counts >= 3]
+        if len(top_counts):
+            selector.count('pair', len(top_counts), int(top_counts.sum()) * 2)
+        
+        periodicity_profile = self._calculate_periodicity_profile(digits_array)
+        return {
+            'repetition_score': self._calculate_repetition_score(digits_array, periodicity_profile),
+            'pair_score': self._calculate_pair_score(digits_array, spectrum),
+            'sequential_score': self._calculate_sequential_score(digits_array),
+            'pattern_density': selector.total_pattern_length / len(digits_array),
+            'periodicity_profile': periodicity_profile,
+            'pattern_distribution': dict(selector.distribution),
+            'total_patterns': selector.total_patterns
+        }
+    
+    def _analyze_exact(self, digits: List[int], spectrum: NGramSpectrum) -> Dict[str, Any]:
+        """精确检测模式并计算模式特征（spectrum 为同一序列的n元组频谱）"""
+        # 检测模式：逐个送入选择器，只保留需要输出的模式
+        selector = PatternSelector(self.top_k, self.min_score, self.max_positions)
+        self._select_repetition_patterns(digits, selector)
+        for pattern in self._detect_sequential_patterns(digits):
+            selector.add(pattern)
+        for pattern in self._detect_pair_patterns(digits, spectrum):
+            selector.add(pattern)
         
         # 计算模式特征
-        repetition_score = self._calculate_repetition_score(digits)
-        pair_score = self._calculate_pair_score(digits)
+        periodicity_profile = self._calculate_periodicity_profile(digits)
+        repetition_score = self._calculate_repetition_score(digits, periodicity_profile)
+        pair_score = self._calculate_pair_score(digits, spectrum)
         sequential_score = self._calculate_sequential_score(digits)
-        pattern_density = self._calculate_pattern_density(patterns, len(digits))
-        
-        # 分析模式分布
-        pattern_distribution = self._analyze_pattern_distribution(patterns)
+        pattern_density = selector.total_pattern_length / len(digits)
         
         return {
-            'patterns': patterns,
+            'patterns': selector.patterns(),
             'repetition_score': repetition_score,
             'pair_score': pair_score,
             'sequential_score': sequential_score,
             'pattern_density': pattern_density,
-            'pattern_distribution': pattern_distribution,
-            'total_patterns': len(patterns)
+            'periodicity_profile': periodicity_profile,
+            'pattern_distribution': dict(selector.distribution),
+            'total_patterns': selector.total_patterns
         }
     
+    def preprocess(self, digits: Union[List[int], DigitSequence]) -> List[int]:
+        """
+        预处理数据
+        
+        模式检测逐位扫描并在结果中保存子序列，DigitSequence 在此物化为列表。
+        
+        Args:
+            digits: 数字序列
+            
+        Returns:
+            预处理后的数字序列
+        """
+        if isinstance(digits, DigitSequence):
+            return digits.tolist()
+        return digits
+    
     def _detect_patterns(self, digits: List[int]) -> List[Dict[str, Any]]:
         """检测数字序列中的模式"""
-        patterns = []
-        
+        return list(self._iter_patterns(digits))
+    
+    def _iter_patterns(self, digits: List[int], spectrum: NGramSpectrum = None) -> Iterator[Dict[str, Any]]:
+        """按检测顺序逐个生成模式（重复、序列、配对）"""
         # 检测重复模式
-        repetition_patterns = self._detect_repetition_patterns(digits)
-        patterns.extend(repetition_patterns)
+        yield from self._iter_repetition_patterns(digits)
         
         # 检测序列模式
-        sequential_patterns = self._detect_sequential_patterns(digits)
-        patterns.extend(sequential_patterns)
+        yield from self._detect_sequential_patterns(digits)
         
         # 检测配对模式
-        pair_patterns = self._detect_pair_patterns(digits)
-        patterns.extend(pair_patterns)
-        
-        return patterns
+        yield from self._detect_pair_patterns(digits, spectrum)
     
     def _detect_repetition_patterns(self, digits: List[int]) -> List[Dict[str, Any]]:
         """检测重复模式"""
-        patterns = []
+        return list(self._iter_repetition_patterns(digits))
+    
+    def _iter_repetition_patterns(self, digits: List[int]) -> Iterator[Dict[str, Any]]:
+        """
+        逐个生成重复模式
         
-        for pattern_length in range(self.min_pattern_length, min(self.max_pattern_length, len(digits) // 2) + 1):
-            pattern_counts = Counter()
-            
-            for i in range(len(digits) - pattern_length + 1):
-                pattern = tuple(digits[i:i+pattern_length])
-                pattern_counts[pattern] += 1
-            
-            # 找出重复次数足够的模式
-            for pattern, count in pattern_counts.items():
-                if count >= self.min_repetitions:
-                    # 找到所有出现位置
-                    positions = []
-                    for i in range(len(digits) - pattern_length + 1):
-                        if tuple(digits[i:i+pattern_length]) == pattern:
-                            positions.append(i)
-                    
-                    patterns.append({
-                        'type': 'repetition',
-                        'pattern': list(pattern),
-                        'length': pattern_length,
-                        'count': count,
-                        'positions': positions,
-                        'score': count * pattern_length
-                    })
+        基于后缀数组和LCP：每个重复子串的所有出现位置是后缀数组中的一个连续区间，
+        各长度只需划分一次LCP数组，不再逐个模式重新扫描整个序列。
+        结果按模式长度、再按首次出现位置排序。
+        """
+        max_length = min(self.max_pattern_length, len(digits) // 2)
         
-        return patterns
+        for pattern_length, groups in repeated_substrings(np.asarray(digits, dtype=np.int64),
+                                                          self.min_pattern_length, max_length,
+                                                          self.min_repetitions):
+            for positions in groups:
+                start = positions[0]
+                count = len(positions)
+                yield {
+                    'type': 'repetition',
+                    'pattern': list(digits[start:start+pattern_length]),
+                    'length': pattern_length,
+                    'count': count,
+                    'positions': positions,
+                    'score': count * pattern_length
+                }
+    
+    def _select_repetition_patterns(self, digits: List[int], selector: PatternSelector) -> None:
+        """
+        将重复模式送入选择器
+        
+        各组的出现次数和首次出现位置直接由LCP划分得到，运行总数按全部分组累加；
+        只为当前能被保留的分组展开出现位置（每组最多 max_positions 个）。
+        设置 top_k 时每个长度最多展开按 (得分, 首次出现位置) 排在前 top_k 的分组，
+        其余分组即使送入也会被同一长度中更靠前的分组挤出。
+        """
+        max_length = min(self.max_pattern_length, len(digits) // 2)
+        
+        for pattern_length, order, starts, sizes, firsts in repeated_substring_groups(
+                np.asarray(digits, dtype=np.int64), self.min_pattern_length, max_length, self.min_repetitions):
+            if len(sizes) == 0:
+                continue
+            selector.count('repetition', len(sizes), int(sizes.sum()) * pattern_length)
+            scores = sizes * pattern_length
+            candidates = np.flatnonzero(selector.accepts(scores))
+            if selector.top_k is not None and len(candidates) > selector.top_k:
+                best = np.lexsort((firsts[candidates], -scores[candidates]))[:selector.top_k]
+                candidates = np.sort(candidates[best])
+            
+            positions = group_positions(order, starts[candidates], sizes[candidates], selector.max_positions)
+            for index, pattern_positions in zip(candidates.tolist(), positions):
+                start = int(firsts[index])
+                count = int(sizes[index])
+                selector.offer({
+                    'type': 'repetition',
+                    'pattern': list(digits[start:start+pattern_length]),
+                    'length': pattern_length,
+                    'count': count,
+                    'positions': pattern_positions,
+                    'score': count * pattern_length
+                })
     
     def _detect_sequential_patterns(self, digits: List[int]) -> List[Dict[str, Any]]:
         """检测序列模式"""
-        patterns = []
+        return list(self._iter_sequential_patterns(np.asarray(digits, dtype=np.int8)))
+    
+    def _iter_sequential_patterns(self, digits_array: np.ndarray) -> Iterator[Dict[str, Any]]:
+        """
+        逐个生成递增/递减序列模式
         
-        # 检测递增/递减序列
-        i = 0
-        while i < len(digits) - 2:
-            # 检查递增序列
-            if i + 2 < len(digits) and digits[i+1] == digits[i] + 1 and digits[i+2] == digits[i] + 2:
-                start = i
-                while i + 1 < len(digits) and digits[i+1] == digits[i] + 1:
-                    i += 1
-                end = i
-                pattern_length = end - start + 1
-                
-                if pattern_length >= 3:
-                    pattern = digits[start:end+1]
-                    patterns.append({
-                        'type': 'sequential_increasing',
-                        'pattern': pattern,
-                        'length': pattern_length,
-                        'start': start,
-                        'end': end,
-                        'score': pattern_length
-                    })
-            
-            # 检查递减序列
-            elif i + 2 < len(digits) and digits[i+1] == digits[i] - 1 and digits[i+2] == digits[i] - 2:
-                start = i
-                while i + 1 < len(digits) and digits[i+1] == digits[i] - 1:
-                    i += 1
-                end = i
-                pattern_length = end - start + 1
-                
-                if pattern_length >= 3:
-                    pattern = digits[start:end+1]
-                    patterns.append({
-                        'type': 'sequential_decreasing',
-                        'pattern': pattern,
-                        'length': pattern_length,
-                        'start': start,
-                        'end': end,
-                        'score': pattern_length
-                    })
-            else:
-                i += 1
+        每个模式是相邻差值连续为+1（或-1）的极大游程，至少3个数字；
+        递增和递减序列可以共用端点，结果按起始位置排序。
+        """
+        for start, end, pattern_type in self._sequential_runs(digits_array):
+            yield self._sequential_pattern(digits_array, start, end, pattern_type)
+    
+    def _sequential_pattern(self, digits_array: np.ndarray, start: int, end: int, pattern_type: str) -> Dict[str, Any]:
+        """构造 digits[start:end+1] 的序列模式字典"""
+        pattern_length = end - start + 1
+        return {
+            'type': pattern_type,
+            'pattern': digits_array[start:end+1].tolist(),
+            'length': pattern_length,
+            'start': start,
+            'end': end,
+            'score': pattern_length
+        }
+    
+    def _sequential_runs(self, digits_array: np.ndarray) -> List[Tuple[int, int, str]]:
+        """递增/递减序列模式的 (起始位置, 结束位置, 类型)，按起始位置排序"""
+        starts, ends, kinds = self._sequential_run_chunk(digits_array, 0, len(digits_array), {})
+        return [(start, end, SEQUENTIAL_TYPES[kind])
+                for start, end, kind in zip(starts.tolist(), ends.tolist(), kinds.tolist())]
+    
+    def _sequential_run_chunk(self, digits_array: np.ndarray, start: int, end: int,
+                              carry: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        检测一块中的递增/递减序列模式
         
-        return patterns
+        统计起点在 [start, end) 内的相邻差值的游程。延伸到块末尾的游程暂不输出，
+        其起点记入 carry，由下一块接续；end 达到序列长度时输出全部游程。
+        递增和递减游程不会从同一位置开始，因此按起始位置排序即为检测顺序。
+        
+        Args:
+            digits_array: 数字序列的数组
+            start: 块起点
+            end: 块终点
+            carry: 类型序号 -> 上一块未结束的游程起点（原地更新）
+        
+        Returns:
+            按起始位置排序的 (起始位置数组, 结束位置数组, 类型序号数组)，类型见 SEQUENTIAL_TYPES
+        """
+        steps = np.diff(digits_array[start:end + 1].astype(np.int8))
+        final = end >= len(digits_array)
+        bounds = []
+        for kind, step in enumerate((1, -1)):
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], (steps == step).view(np.int8), [0]))))
+            starts, ends = edges[0::2] + start, edges[1::2] + start
+            if kind in carry:
+                # 接续上一块的游程：本块从第一位起继续，或恰好在块边界结束
+                if len(starts) and starts[0] == start:
+                    starts[0] = carry.pop(kind)
+                else:
+                    starts, ends = np.append(carry.pop(kind), starts), np.append(start, ends)
+            if not final and len(ends) and ends[-1] == start + len(steps):
+                carry[kind] = int(starts[-1])
+                starts, ends = starts[:-1], ends[:-1]
+            keep = ends - starts >= 2
+            bounds.append((starts[keep], ends[keep], np.full(np.count_nonzero(keep), kind)))
+        
+        starts, ends, kinds = (np.concatenate(parts) for parts in zip(*bounds))
+        order = np.argsort(starts, kind='stable')
+        return starts[order], ends[order], kinds[order]
     
-    def _detect_pair_patterns(self, digits: List[int]) -> List[Dict[str, Any]]:
+    def _detect_pair_patterns(self, digits: List[int], spectrum: NGramSpectrum = None) -> List[Dict[str, Any]]:
         """检测配对模式"""
         patterns = []
         
-        # 检测连续配对
-        pair_counts = Counter()
-        for i in range(len(digits) - 1):
-            pair = (digits[i], digits[i+1])
-            pair_counts[pair] += 1
-        
-        # 找出高频配对
-        for pair, count in pair_counts.most_common(10):  # 只取前10个
-            if count >= 3:  # 至少出现3次
-                # 找到所有出现位置
-                positions = []
-                for i in range(len(digits) - 1):
-                    if (digits[i], digits[i+1]) == pair:
-                        positions.append(i)
-                
+        # 检测连续配对：计数和首次出现位置来自n元组频谱，全部位置由一次排序得到
+        spectrum = spectrum or NGramSpectrum(digits, max_length=2)
+        codes, counts = spectrum.table(2)
+        positions = self._ngram_positions(spectrum.codes(2))
+        
+        # 找出高频配对（只取前10个，次数相同时按首次出现顺序），至少出现3次
+        for index in np.lexsort((spectrum.first_positions(2), -counts))[:10]:
+            count = int(counts[index])
+            if count >= 3:
                 patterns.append({
                     'type': 'pair',
-                    'pattern': list(pair),
+                    'pattern': list(NGramSpectrum.decode(codes[index:index+1], 2)[0]),
                     'length': 2,
                     'count': count,
-                    'positions': positions,
+                    'positions': positions[index].tolist(),
                     'score': count * 2
                 })
         
         return patterns
     
-    def _calculate_repetition_score(self, digits: List[int]) -> float:
-        """计算重复得分"""
-        max_repetition = 0
-        for pattern_length in range(2, 11):
-            for i in range(len(digits) - pattern_length * 2 + 1):
-                pattern = tuple(digits[i:i+pattern_length])
-                next_pattern = tuple(digits[i+pattern_length:i+pattern_length*2])
-                if pattern == next_pattern:
-                    max_repetition = max(max_repetition, pattern_length)
-        return max_repetition
-    
-    def _calculate_pair_score(self, digits: List[int]) -> int:
+    def _ngram_positions(self, codes: np.ndarray) -> List[np.ndarray]:
+        """
+        一次排序建立n元组的位置索引
+        
+        稳定 argsort 后按编码切分，每组即为该n元组的全部出现位置（升序），
+        无需为每个模式重新扫描序列。
+        
+        Args:
+            codes: 各位置的n元组编码（见 NGramSpectrum.codes）
+        
+        Returns:
+            出现位置数组列表，按编码升序（与 NGramSpectrum.table 对齐）
+        """
+        if len(codes) == 0:
+            return []
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        return np.split(order, np.flatnonzero(sorted_codes[1:] != sorted_codes[:-1]) + 1)
+    
+    def _calculate_repetition_score(self, digits: List[int],
+                                    periodicity_profile: Dict[int, Dict[str, int]] = None) -> float:
+        """
+        计算重复得分
+        
+        Returns:
+            存在相邻两段完全相同（串联重复）的最大周期，没有时为0
+        """
+        if periodicity_profile is None:
+            periodicity_profile = self._calculate_periodicity_profile(digits)
+        periods = [period for period, profile in periodicity_profile.items() if profile['count'] > 0]
+        return max(periods) if periods else 0
+    
+    def _calculate_periodicity_profile(self, digits: List[int]) -> Dict[int, Dict[str, int]]:
+        """
+        计算周期性剖面
+        
+        对每个周期p构造掩码 d[i] == d[i+p]：位置i处存在周期p的串联重复
+        （digits[i:i+p] == digits[i+p:i+2p]）当且仅当掩码从i起连续p位为真，
+        因此每个周期只需一次向量化比较，游程统计见 _run_statistics。
+        整个序列作为 PeriodicityCounter 的一块处理（近似模式逐块处理）。
+        
+        Args:
+            digits: 数字序列
+        
+        Returns:
+            周期 -> {'longest_run': 掩码最长连续为真的长度, 'count': 串联重复的起始位置个数}
+        """
+        digits_array = np.asarray(digits, dtype=np.int8)
+        counter = PeriodicityCounter(self.max_period)
+        counter.update(digits_array, len(digits_array))
+        return counter.profile()
+    
+    def _calculate_pair_score(self, digits: List[int], spectrum: NGramSpectrum = None) -> int:
         """计算配对得分"""
-        pairs = []
-        for i in range(len(digits) - 1):
-            pairs.append((digits[i], digits[i+1]))
-        pair_counts = Counter(pairs)
-        most_common = pair_counts.most_common(1)
-        return most_common[0][1] if most_common else 0
+        spectrum = spectrum or NGramSpectrum(digits, max_length=2)
+        return spectrum.max_count(2)
     
     def _calculate_sequential_score(self, digits: List[int]) -> int:
         """计算序列得分"""
-        sequential_count = 0
-        for i in range(len(digits) - 2):
-            if abs(digits[i] - digits[i+1]) == 1 and abs(digits[i+1] - digits[i+2]) == 1:
-                sequential_count += 1
-        return sequential_count
-    
-    def _calculate_pattern_density(self, patterns: List[Dict[str, Any]], total_length: int) -> float:
-        """计算模式密度"""
-        if total_length == 0:
-            return 0
-        
-        total_pattern_length = sum(p['length'] * p.get('count', 1) for p in patterns)
-        return total_pattern_length / total_length
-    
-    def _analyze_pattern_distribution(self, patterns: List[Dict[str, Any]]) -> Dict[str, int]:
-        """分析模式分布"""
-        distribution = Counter()
-        for pattern in patterns:
-            distribution[pattern['type']] += 1
-        return dict(distribution)
+        unit_steps = np.abs(np.diff(np.asarray(digits, dtype=np.int8))) == 1
+        return int(np.count_nonzero(unit_steps[:-1] & unit_steps[1:]))
+    
+    def _analyze_approximate(self, digits_array: np.ndarray) -> Dict[str, Any]:
+        """
+        近似模式分析
+        
+        分块流式计数：长度不超过 DENSE_MAX_LENGTH 的n元组用稠密计数器精确计数，
+        更长的n元组（最长 MAX_CODE_LENGTH）每个长度一个 Count-Min 草图加
+        Space-Saving 高频项跟踪，内存与序列长度无关。
+        序列模式、周期性剖面和序列得分在同一分块循环中累加，跨块的游程由下一块接续，
+        序列模式只把可能进入前 top_k 的候选构造成模式字典。
+        重复模式不记录出现位置；其 count 为估计值，count_error 为最大高估量。
+        草图部分只计入确定重复的模式，因此 pattern_density 和 pattern_distribution 偏保守。
+        n元组编码最长 MAX_CODE_LENGTH 位，近似模式的模式长度上限因此为
+        min(max_pattern_length, MAX_CODE_LENGTH)；实际生效的上限和未统计的长度
+        记录在 error_bounds 的 max_pattern_length 和 skipped_lengths 中。
+        
+        Args:
+            digits_array: 数字序列的uint8数组
+        
+        Returns:
+            与 analyze() 相同结构的结果，另含 approximate 和 error_bounds
+        """
+        length = len(digits_array)
+        max_length = min(self.max_pattern_length, length // 2)
+        lengths = list(range(self.min_pattern_length, min(max_length, MAX_CODE_LENGTH) + 1))
+        span = max(lengths + [2])
+        exact_counts = {k: np.zeros(10 ** k, dtype=np.int64) for k in lengths if k <= DENSE_MAX_LENGTH}
+        sketches = {k: CountMinSketch(self.epsilon, self.delta, seed=k) for k in lengths if k > DENSE_MAX_LENGTH}
+        trackers = {k: SpaceSaving(int(np.ceil(1 / self.epsilon))) for k in sketches}
+        pair_counts = np.zeros(100, dtype=np.int64)
+        pair_first = np.full(100, length, dtype=np.int64)
+        
+        selector = PatternSelector(self.top_k if self.top_k is not None else APPROXIMATE_TOP_K,
+                                   self.min_score, self.max_positions)
+        # 序列模式先在单独的选择器中筛选，重复模式送入后再按检测顺序送入，与精确模式的顺序一致
+        sequential = PatternSelector(selector.top_k, self.min_score, self.max_positions)
+        sequential_carry = {}
+        periodicity = PeriodicityCounter(self.max_period)
+        sequential_score = 0
+        
+        # 分块计数：每块向后多取 span-1 位，只统计起点在块内的n元组
+        for start in range(0, length, self.chunk_size):
+            end = min(length, start + self.chunk_size)
+            
+            starts, ends, kinds = self._sequential_run_chunk(digits_array, start, end, sequential_carry)
+            for kind, pattern_type in enumerate(SEQUENTIAL_TYPES):
+                run_lengths = (ends - starts + 1)[kinds == kind]
+                if len(run_lengths):
+                    selector.count(pattern_type, len(run_lengths), int(run_lengths.sum()))
+            for index in np.flatnonzero(sequential.accepts(ends - starts + 1)).tolist():
+                sequential.offer(self._sequential_pattern(digits_array, int(starts[index]), int(ends[index]),
+                                                          SEQUENTIAL_TYPES[kinds[index]]))
+            
+            periodicity.update(digits_array[start:end + self.max_period], end - start)
+            unit_steps = np.abs(np.diff(digits_array[start:end + 2].astype(np.int8))) == 1
+            sequential_score += int(np.count_nonzero((unit_steps[:-1] & unit_steps[1:])[:end - start]))
+            
+            spectrum = NGramSpectrum(digits_array[start:end + span - 1], max_length=span)
+            pair_codes = spectrum.codes(2)[:end - start]
+            pair_counts += np.bincount(pair_codes, minlength=100)
+            codes, first = np.unique(pair_codes, return_index=True)
+            pair_first[codes] = np.minimum(pair_first[codes], first + start)
+            for k in lengths:
+                codes = spectrum.codes(k)[:end - start]
+                if k in exact_counts:
+                    exact_counts[k] += np.bincount(codes, minlength=10 ** k)
+                else:
+                    sketches[k].update(codes)
+                    trackers[k].update(*np.unique(codes, return_counts=True))
+        
+        error_bounds = {
+            'epsilon': self.epsilon,
+            'delta': self.delta,
+            'max_pattern_length': min(self.max_pattern_length, MAX_CODE_LENGTH),
+            # 精确模式会统计、但超出编码长度而未统计的模式长度
+            'skipped_lengths': list(range(max(self.min_pattern_length, MAX_CODE_LENGTH + 1), max_length + 1)),
+            'lengths': {}
+        }
+        
+        # 重复模式：按长度累加运行总数，只把每个长度得分最高的候选送入选择器
+        for k in lengths:
+            if k in exact_counts:
+                codes = np.flatnonzero(exact_counts[k] >= self.min_repetitions)
+                counts = exact_counts[k][codes]
+                errors = np.zeros(len(codes), dtype=np.int64)
+                error_bounds['lengths'][k] = {'exact': True, 'count_error': 0}
+            else:
+                tracker = trackers[k]
+                counts = np.minimum(tracker.counts, sketches[k].query(tracker.keys))
+                errors = counts - np.maximum(tracker.counts - tracker.errors, 0)
+                # 只保留确定重复的模式（计数下界达到最少重复次数），避免把高估的单次出现计入
+                keep = counts - errors >= self.min_repetitions
+                codes, counts, errors = tracker.keys[keep], counts[keep], errors[keep]
+                error_bounds['lengths'][k] = {
+                    'exact': False,
+                    'count_error': min(sketches[k].error_bound(), tracker.error_bound())
+                }
+            selector.count('repetition', len(codes), int(counts.sum()) * k)
+            
+            candidates = np.argsort(-counts, kind='stable')[:selector.top_k]
+            for index, pattern in zip(candidates.tolist(), NGramSpectrum.decode(codes[candidates], k)):
+                count = int(counts[index])
+                selector.offer({
+                    'type': 'repetition',
+                    'pattern': list(pattern),
+                    'length': k,
+                    'count': count,
+                    'count_error': int(errors[index]),
+                    'positions': [],
+                    'score': count * k
+                })
+        
+        for pattern in sorted(sequential.patterns(), key=lambda pattern: pattern['start']):
+            selector.offer(pattern)
+        
+        # 配对模式：前10个高频配对（次数相同时按首次出现顺序），至少出现3次
+        for code in np.lexsort((pair_first, -pair_counts))[:10].tolist():
+            count = int(pair_counts[code])
+            if count >= 3:
+                selector.add({
+                    'type': 'pair',
+                    'pattern': [code // 10, code % 10],
+                    'length': 2,
+                    'count': count,
+                    'positions': [],
+                    'score': count * 2
+                })
+        
+        periodicity_profile = periodicity.profile()
+        return {
+            'patterns': selector.patterns(),
+            'repetition_score': self._calculate_repetition_score(digits_array, periodicity_profile),
+            'pair_score': int(pair_counts.max()),
+            'sequential_score': sequential_score,
+            'pattern_density': selector.total_pattern_length / length,
+            'periodicity_profile': periodicity_profile,
+            'pattern_distribution': dict(selector.distribution),
+            'total_patterns': selector.total_patterns,
+            'approximate': True,
+            'error_bounds': error_bounds
+        }
     
     def get_name(self) -> str:
         """获取分析器名称"""
@@ -0,0 +1,111 @@
+# core/analyzers/sharding.py
+# 分片并行分析
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Set, Tuple
+import numpy as np
+from core.analyzers.analysis_context import AnalysisContext
+from core.data.digit_sequence import DigitSequence
+
+# 每个分片的最小长度，序列太短时进程启动和传输的开销大于收益
+MIN_SHARD_SIZE = 1 << 18
+
+def shard_bounds(length: int, workers: int, min_shard_size: int = MIN_SHARD_SIZE) -> List[Tuple[int, int]]:
+    """
+    将序列划分为连续且互不重叠的分片
+    
+    分片之间不复制重叠数字：跨越边界的窗口和数字对由各分析器的 merge_states
+    根据部分状态中保存的首尾数字补算。
+    
+    Args:
+        length: 序列长度
+        workers: 工作进程数
+        min_shard_size: 每个分片的最小长度
+    
+    Returns:
+        分片的 [start, end) 区间列表
+    """
+    shard_count = max(1, min(workers, length // max(min_shard_size, 1)))
+    edges = np.linspace(0, length, shard_count + 1).astype(np.int64)
+    return [(int(edges[i]), int(edges[i + 1])) for i in range(shard_count)]
+
+def _partial_state_task(analyzer: Any, shard: DigitSequence) -> Any:
+    """在工作进程中计算一个分片的部分状态"""
+    return analyzer.partial_state(shard)
+
+def sharded_partial_state(analyzer: Any, digits: DigitSequence, workers: int,
+                          min_shard_size: int = MIN_SHARD_SIZE) -> Any:
+    """
+    并行计算整个序列的部分状态
+    
+    各分片的部分状态在进程池中计算，再按原顺序用 analyzer.merge_states 归约，
+    结果与在单进程中对整个序列调用 analyzer.partial_state 完全一致。
+    
+    Args:
+        analyzer: 提供 partial_state / merge_states 的分析器
+        digits: 数字序列
+        workers: 工作进程数
+        min_shard_size: 每个分片的最小长度
+    
+    Returns:
+        覆盖整个序列的部分状态
+    """
+    bounds = shard_bounds(len(digits), workers, min_shard_size)
+    if len(bounds) == 1:
+        return analyzer.partial_state(digits)
+    
+    shards = [digits[start:end] for start, end in bounds]
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        states = list(executor.map(_partial_state_task, [analyzer] * len(shards), shards))
+    return reduce(analyzer.merge_states, states)
+
+def share_digits(digits: np.ndarray) -> SharedMemory:
+    """
+    将数字数组复制到共享内存
+    
+    调用方负责在使用结束后 close() 并 unlink()。
+    
+    Args:
+        digits: uint8 数字数组
+    
+    Returns:
+        共享内存块
+    """
+    shared = SharedMemory(create=True, size=max(len(digits), 1))
+    np.ndarray(len(digits), dtype=np.uint8, buffer=shared.buf)[:] = digits
+    return shared
+
+def analyze_shared_task(analyzer: Any, shared_name: str, length: int, fields: Optional[Set[str]] = None,
+                        upstream_results: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[Dict[str, Any], float]:
+    """
+    在工作进程中分析共享内存中的数字序列
+    
+    直接在共享缓冲区上构建分析上下文，不通过进程间管道复制输入。
+    
+    Args:
+        analyzer: 分析器
+        shared_name: 共享内存块名称
+        length: 序列长度
+        fields: 需要的结果字段（None表示全部）
+        upstream_results: 分析器声明依赖的上游分析器结果
+    
+    Returns:
+        (分析结果, 分析耗时秒数)
+    """
+    shared = SharedMemory(name=shared_name)
+    try:
+        data = np.ndarray(length, dtype=np.uint8, buffer=shared.buf)
+        data.setflags(write=False)
+        context = AnalysisContext(DigitSequence._wrap(data))
+        context.results.update(upstream_results or {})
+        start = time.perf_counter()
+        result = analyzer.analyze_fields(context, fields)
+        elapsed = time.perf_counter() - start
+        # 关闭共享内存前释放所有指向缓冲区的数组
+        del data, context
+        return result, elapsed
+    finally:
+        shared.close()
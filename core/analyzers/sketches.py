@@ -0,0 +1,162 @@
+# core/analyzers/sketches.py
+# 近似计数结构（Count-Min 草图与 Space-Saving 高频项）
+
+import math
+from typing import Tuple
+import numpy as np
+
+class CountMinSketch:
+    """
+    Count-Min 草图
+    
+    depth 行、每行 width 个计数器，每行用独立的乘加移位哈希把编码映射到一个计数器。
+    查询取各行计数器的最小值：估计值不小于真实值，且以至少 1-delta 的概率
+    高估不超过 epsilon * 总计数。内存固定为 depth * width 个计数器。
+    """
+    
+    def __init__(self, epsilon: float = 1e-4, delta: float = 0.01, seed: int = 0):
+        """
+        初始化 Count-Min 草图
+        
+        Args:
+            epsilon: 相对误差（以总计数为单位）
+            delta: 误差超出 epsilon 的概率上限
+            seed: 哈希函数的随机种子
+        
+        Raises:
+            ValueError: epsilon 或 delta 不在 (0, 1) 内
+        """
+        if not (0 < epsilon < 1 and 0 < delta < 1):
+            raise ValueError(f"epsilon 和 delta 必须在 (0, 1) 内: {epsilon}, {delta}")
+        self.epsilon = epsilon
+        self.delta = delta
+        # 宽度取不小于 e/epsilon 的2的幂，便于用高位移位取哈希值
+        self.bits = max(1, math.ceil(math.log2(math.e / epsilon)))
+        self.width = 1 << self.bits
+        self.depth = max(1, math.ceil(math.log(1 / delta)))
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+        
+        rng = np.random.default_rng(seed)
+        self._multipliers = rng.integers(1, 1 << 63, size=self.depth, dtype=np.uint64) | np.uint64(1)
+        self._offsets = rng.integers(0, 1 << 63, size=self.depth, dtype=np.uint64)
+    
+    def _hash(self, row: int, keys: np.ndarray) -> np.ndarray:
+        """第 row 行的哈希：(a * x + b) mod 2^64 的高 bits 位"""
+        hashed = keys.astype(np.int64, copy=False).view(np.uint64) * self._multipliers[row] + self._offsets[row]
+        hashed >>= np.uint64(64 - self.bits)
+        return hashed.view(np.int64)
+    
+    def update(self, keys: np.ndarray, counts: np.ndarray = None) -> None:
+        """
+        批量累加计数
+        
+        Args:
+            keys: 非负整数编码数组（未给出 counts 时可以重复，每次出现计数1）
+            counts: 对应的计数数组（可选）
+        """
+        keys = np.asarray(keys)
+        for row in range(self.depth):
+            if counts is None:
+                self.table[row] += np.bincount(self._hash(row, keys), minlength=self.width)
+            else:
+                self.table[row] += np.bincount(self._hash(row, keys), weights=counts,
+                                               minlength=self.width).astype(np.int64)
+        self.total += len(keys) if counts is None else int(np.sum(counts))
+    
+    def query(self, keys: np.ndarray) -> np.ndarray:
+        """
+        查询计数估计值
+        
+        Args:
+            keys: 非负整数编码数组
+        
+        Returns:
+            估计值数组（不小于真实计数）
+        """
+        keys = np.asarray(keys)
+        estimates = np.full(len(keys), np.iinfo(np.int64).max, dtype=np.int64)
+        for row in range(self.depth):
+            estimates = np.minimum(estimates, self.table[row, self._hash(row, keys)])
+        return estimates
+    
+    def error_bound(self) -> int:
+        """以至少 1-delta 的概率成立的高估上限（epsilon * 总计数）"""
+        return math.ceil(self.epsilon * self.total)
+
+class SpaceSaving:
+    """
+    Space-Saving 高频项跟踪
+    
+    最多跟踪 capacity 个编码，每个编码保存计数上界和误差（计数 - 误差为下界）。
+    按批合并：批内先精确计数并保留前 capacity 个，再与已有摘要合并，
+    未跟踪的编码按另一方的最小计数补足上界（可合并摘要的合并规则），
+    因此任意编码的高估不超过 总计数 / capacity。
+    """
+    
+    def __init__(self, capacity: int):
+        """
+        初始化高频项跟踪
+        
+        Args:
+            capacity: 最多跟踪的编码个数
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity 必须为正数: {capacity}")
+        self.capacity = capacity
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.errors = np.zeros(0, dtype=np.int64)
+        # 未被跟踪的编码的计数上界
+        self.floor = 0
+        self.total = 0
+    
+    def update(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        """
+        合并一批（互不相同的）编码及其精确计数
+        
+        Args:
+            keys: 互不相同的编码数组
+            counts: 对应的计数数组
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        self.total += int(counts.sum())
+        batch_keys, batch_counts, _, batch_floor = self._truncate(keys, counts, np.zeros(len(keys), dtype=np.int64))
+        
+        merged_keys = np.union1d(self.keys, batch_keys)
+        own_counts, own_errors = self._lookup(self.keys, (self.counts, self.errors), merged_keys, self.floor)
+        other_counts, other_errors = self._lookup(batch_keys, (batch_counts, np.zeros(len(batch_keys), dtype=np.int64)),
+                                                  merged_keys, batch_floor)
+        self.keys, self.counts, self.errors, floor = self._truncate(
+            merged_keys, own_counts + other_counts, own_errors + other_errors)
+        self.floor = max(floor, self.floor + batch_floor)
+    
+    def _lookup(self, keys: np.ndarray, values: Tuple[np.ndarray, np.ndarray], targets: np.ndarray,
+                floor: int) -> Tuple[np.ndarray, np.ndarray]:
+        """取 targets 在摘要中的计数和误差，不在摘要中的以 floor 作为计数和误差"""
+        counts = np.full(len(targets), floor, dtype=np.int64)
+        errors = np.full(len(targets), floor, dtype=np.int64)
+        if len(keys):
+            index = np.minimum(np.searchsorted(keys, targets), len(keys) - 1)
+            found = keys[index] == targets
+            counts[found] = values[0][index[found]]
+            errors[found] = values[1][index[found]]
+        return counts, errors
+    
+    def _truncate(self, keys: np.ndarray, counts: np.ndarray,
+                  errors: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """保留计数最大的 capacity 个编码（按编码升序），返回被丢弃部分的最大计数"""
+        if len(keys) <= self.capacity:
+            order = np.argsort(keys, kind='stable')
+            return keys[order], counts[order], errors[order], 0
+        kept = np.argpartition(-counts, self.capacity - 1)[:self.capacity]
+        dropped = np.ones(len(keys), dtype=bool)
+        dropped[kept] = False
+        floor = int(counts[dropped].max())
+        kept = kept[np.argsort(keys[kept], kind='stable')]
+        return keys[kept], counts[kept], errors[kept], floor
+    
+    def error_bound(self) -> int:
+        """任意编码计数的最大高估（总计数 / capacity）"""
+        return math.ceil(self.total / self.capacity)
@@ -0,0 +1,243 @@
+# core/analyzers/spectral_analyzer.py
+# 频谱分析器（FFT自相关与周期图）
+
+from typing import Dict, List, Any, Tuple, Union
+import numpy as np
+from core.analyzers.base_analyzer import BaseAnalyzer
+from core.data.digit_sequence import DigitSequence, as_digit_array
+
+class SpectralAnalyzer(BaseAnalyzer):
+    """
+    频谱分析器
+    
+    较短的序列补零到2n后做一次 rfft：|X|^2 的逆变换即全部滞后的自相关，
+    偶数下标的频点正好是n点周期图，复杂度 O(n log n)。
+    较长的序列按段计算：周期图用 Welch 方法（Hann窗、50%重叠）逐段平均，
+    自相关按块精确累加到 segment_length // 2 阶，内存占用只与段长有关。
+    两种方法计算的自相关阶数不同，结果中的 max_lag 为实际计算到的最大滞后。
+    """
+    
+    # 结果字段
+    outputs = ('method', 'segments', 'max_lag', 'autocorrelation', 'lag1_autocorrelation', 'max_autocorrelation',
+               'confidence_bound', 'significant_lags', 'dominant_periods', 'spectral_flatness', 'total_digits')
+    
+    def __init__(self, max_lag: int = None, segment_length: int = 1 << 16,
+                 welch_threshold: int = 1 << 18, top_peaks: int = 5):
+        """
+        初始化频谱分析器
+        
+        Args:
+            max_lag: 自相关的最大滞后（None表示 n // 2，分段计算时不超过 segment_length // 2）
+            segment_length: 分段计算时每段的长度
+            welch_threshold: 序列长度超过该值时改用分段计算
+            top_peaks: 报告的周期图峰值个数
+        """
+        if segment_length < 4:
+            raise ValueError(f"segment_length 必须不小于4: {segment_length}")
+        self.max_lag = max_lag
+        self.segment_length = segment_length
+        self.welch_threshold = welch_threshold
+        self.top_peaks = top_peaks
+    
+    def analyze(self, digits: Union[List[int], DigitSequence]) -> Dict[str, Any]:
+        """
+        分析数字序列的自相关和频谱
+        
+        Args:
+            digits: 数字序列
+        
+        Returns:
+            分析结果
+        """
+        if not self.validate_input(digits):
+            return self._create_error_response()
+        
+        digits_array = as_digit_array(DigitSequence(self.preprocess(digits)))
+        n = len(digits_array)
+        
+        if n > self.welch_threshold:
+            method = 'welch'
+            max_lag = self._max_lag(n, self.segment_length // 2)
+            autocorrelation = self._blocked_autocorrelation(digits_array, max_lag)
+            frequencies, power, segments = self._welch_periodogram(digits_array)
+        else:
+            method = 'periodogram'
+            max_lag = self._max_lag(n, n // 2)
+            autocorrelation, frequencies, power = self._fft_spectrum(digits_array, max_lag)
+            segments = 1
+        
+        # 白噪声的样本自相关近似服从 N(0, 1/n)
+        confidence_bound = 1.96 / np.sqrt(n)
+        lags = np.abs(autocorrelation[1:])
+        if len(lags):
+            peak_lag = int(np.argmax(lags)) + 1
+            max_autocorrelation = {'lag': peak_lag, 'value': float(autocorrelation[peak_lag])}
+        else:
+            max_autocorrelation = {'lag': 0, 'value': 0.0}
+        
+        return {
+            'method': method,
+            'segments': segments,
+            'max_lag': max_lag,
+            'autocorrelation': autocorrelation.tolist(),
+            'lag1_autocorrelation': float(autocorrelation[1]) if len(autocorrelation) > 1 else 0.0,
+            'max_autocorrelation': max_autocorrelation,
+            'confidence_bound': float(confidence_bound),
+            'significant_lags': int(np.count_nonzero(lags > confidence_bound)),
+            'dominant_periods': self._find_peaks(frequencies, power),
+            'spectral_flatness': self._calculate_flatness(power),
+            'total_digits': n
+        }
+    
+    def autocorrelation(self, digits: Union[List[int], DigitSequence], max_lag: int = None) -> np.ndarray:
+        """
+        计算自相关函数
+        
+        Args:
+            digits: 数字序列
+            max_lag: 最大滞后（None表示 n // 2）
+        
+        Returns:
+            长度为 max_lag+1 的数组，第k项为滞后k的（有偏）样本自相关系数，方差为0时全为0
+        """
+        digits_array = as_digit_array(DigitSequence(digits))
+        n = len(digits_array)
+        max_lag = n // 2 if max_lag is None else min(max_lag, n - 1)
+        if n > self.welch_threshold and max_lag <= self.segment_length // 2:
+            return self._blocked_autocorrelation(digits_array, max_lag)
+        return self._fft_spectrum(digits_array, max_lag)[0]
+    
+    def periodogram(self, digits: Union[List[int], DigitSequence]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        计算周期图（长序列使用 Welch 平均）
+        
+        Args:
+            digits: 数字序列
+        
+        Returns:
+            (频率（周期/位）, 功率)
+        """
+        digits_array = as_digit_array(DigitSequence(digits))
+        if len(digits_array) > self.welch_threshold:
+            return self._welch_periodogram(digits_array)[:2]
+        return self._fft_spectrum(digits_array, 0)[1:]
+    
+    def _max_lag(self, n: int, limit: int) -> int:
+        """确定实际的最大滞后"""
+        max_lag = limit if self.max_lag is None else min(self.max_lag, limit)
+        return max(0, min(max_lag, n - 1))
+    
+    def _fft_spectrum(self, digits_array: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        一次 rfft 同时得到自相关和周期图
+        
+        Returns:
+            (自相关, 频率, 功率)
+        """
+        n = len(digits_array)
+        centered = digits_array - float(np.mean(digits_array))
+        # 补零到2n避免循环相关的回绕；2n点频谱的偶数频点即n点频谱
+        spectrum = np.fft.rfft(centered, 2 * n)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        
+        covariance = np.fft.irfft(power, 2 * n)[:max_lag + 1]
+        autocorrelation = covariance / covariance[0] if covariance[0] > 1e-9 else np.zeros(max_lag + 1)
+        
+        periodogram = power[::2] / n
+        frequencies = np.arange(len(periodogram)) / n
+        return autocorrelation, frequencies, periodogram
+    
+    def _blocked_autocorrelation(self, digits_array: np.ndarray, max_lag: int) -> np.ndarray:
+        """
+        按块精确累加自相关
+        
+        每块 a = x[s:s+B] 与 b = x[s:s+B+max_lag] 做互相关，
+        FFT长度 2B 不小于 len(a) + len(b) - 1，滞后 0..max_lag 不会回绕。
+        """
+        n = len(digits_array)
+        block = self.segment_length
+        mean = float(np.mean(digits_array))
+        covariance = np.zeros(max_lag + 1)
+        for start in range(0, n, block):
+            a = digits_array[start:start + block] - mean
+            b = digits_array[start:start + block + max_lag] - mean
+            cross = np.conj(np.fft.rfft(a, 2 * block)) * np.fft.rfft(b, 2 * block)
+            covariance += np.fft.irfft(cross, 2 * block)[:max_lag + 1]
+        if covariance[0] <= 1e-9:
+            return np.zeros(max_lag + 1)
+        return covariance / covariance[0]
+    
+    def _welch_periodogram(self, digits_array: np.ndarray, batch: int = 16) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Welch 周期图：Hann窗、50%重叠的各段周期图取平均
+        
+        每次只对 batch 个段做二维 rfft。
+        
+        Returns:
+            (频率, 功率, 段数)
+        """
+        length = self.segment_length
+        hop = length // 2
+        window = np.hanning(length)
+        scale = float(np.sum(window ** 2))
+        mean = float(np.mean(digits_array))
+        
+        starts = np.arange(0, len(digits_array) - length + 1, hop)
+        frames = np.lib.stride_tricks.sliding_window_view(digits_array, length)
+        power = np.zeros(length // 2 + 1)
+        for offset in range(0, len(starts), batch):
+            segments = (frames[starts[offset:offset + batch]] - mean) * window
+            spectrum = np.fft.rfft(segments, axis=1)
+            power += np.sum(spectrum.real ** 2 + spectrum.imag ** 2, axis=0)
+        
+        power /= len(starts) * scale
+        frequencies = np.arange(len(power)) / length
+        return frequencies, power, len(starts)
+    
+    def _find_peaks(self, frequencies: np.ndarray, power: np.ndarray) -> List[Dict[str, float]]:
+        """找出功率最大的若干个非零频点（按功率降序）"""
+        if len(power) <= 1 or self.top_peaks <= 0:
+            return []
+        candidates = power[1:]
+        mean_power = float(np.mean(candidates))
+        count = min(self.top_peaks, len(candidates))
+        top = np.argpartition(-candidates, count - 1)[:count]
+        top = top[np.argsort(-candidates[top], kind='stable')] + 1
+        return [
+            {
+                'period': float(1 / frequencies[index]),
+                'frequency': float(frequencies[index]),
+                'power': float(power[index]),
+                'relative_power': float(power[index] / mean_power) if mean_power > 0 else 0.0
+            }
+            for index in top
+        ]
+    
+    def _calculate_flatness(self, power: np.ndarray) -> float:
+        """
+        谱平坦度（非零频点功率的几何平均 / 算术平均）
+        
+        周期结构越强越接近0；白噪声的单个周期图约为 e^-γ ≈ 0.56，Welch 平均后接近1。
+        """
+        candidates = power[1:]
+        if len(candidates) == 0 or float(np.mean(candidates)) <= 0:
+            return 0.0
+        positive = np.maximum(candidates, np.finfo(np.float64).tiny)
+        return float(np.exp(np.mean(np.log(positive))) / np.mean(candidates))
+    
+    def _create_error_response(self) -> Dict[str, Any]:
+        """创建无效输入的结果"""
+        return {
+            'error': 'Invalid input',
+            'autocorrelation': [],
+            'dominant_periods': [],
+            'spectral_flatness': 0
+        }
+    
+    def get_name(self) -> str:
+        """获取分析器名称"""
+        return "SpectralAnalyzer"
+    
+    def get_version(self) -> str:
+        """获取分析器版本"""
+        return "1.0.0"
@@ -1,19 +1,82 @@
 # core/analyzers/statistical_analyzer.py
 # 统计分析器
 
-from typing import Dict, List, Any
-from collections import Counter
+from typing import Dict, List, Any, Tuple, Union
 import numpy as np
+from core.analyzers.analysis_context import AnalysisContext
 from core.analyzers.base_analyzer import BaseAnalyzer
+from core.analyzers.sharding import MIN_SHARD_SIZE, sharded_partial_state
+from core.data.data_reader import DataReader
+from core.data.digit_sequence import DigitSequence, as_digit_array, stack_digit_sequences
+
+class StatisticalPartialState:
+    """
+    统计分析的可合并部分状态
+    
+    保存数字直方图、相邻数字转移矩阵以及首尾数字，
+    两个相邻片段的状态可以通过 StatisticalAnalyzer.merge_states 合并，合并满足结合律。
+    """
+    
+    def __init__(self):
+        """初始化空状态"""
+        self.length = 0
+        self.digit_counts = np.zeros(10, dtype=np.int64)
+        # transition_counts[a][b]：数字a后紧跟数字b的次数
+        self.transition_counts = np.zeros((10, 10), dtype=np.int64)
+        self.first_digit = -1
+        self.last_digit = -1
+    
+    def copy(self) -> 'StatisticalPartialState':
+        """复制状态"""
+        state = StatisticalPartialState()
+        state.length = self.length
+        state.digit_counts = self.digit_counts.copy()
+        state.transition_counts = self.transition_counts.copy()
+        state.first_digit = self.first_digit
+        state.last_digit = self.last_digit
+        return state
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可JSON序列化的字典"""
+        return {
+            'length': self.length,
+            'digit_counts': self.digit_counts.tolist(),
+            'transition_counts': self.transition_counts.tolist(),
+            'first_digit': self.first_digit,
+            'last_digit': self.last_digit
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'StatisticalPartialState':
+        """从 to_dict() 的结果恢复状态"""
+        state = cls()
+        state.length = int(data['length'])
+        state.digit_counts = np.array(data['digit_counts'], dtype=np.int64)
+        state.transition_counts = np.array(data['transition_counts'], dtype=np.int64).reshape(10, 10)
+        state.first_digit = int(data['first_digit'])
+        state.last_digit = int(data['last_digit'])
+        return state
 
 class StatisticalAnalyzer(BaseAnalyzer):
     """统计分析器"""
     
-    def __init__(self):
-        """初始化统计分析器"""
-        pass
+    # 结果字段
+    outputs = ('digit_distribution', 'entropy', 'mean', 'std', 'variance', 'skewness', 'kurtosis',
+               'correlation', 'runs_analysis', 'percentiles', 'total_digits')
+    
+    def __init__(self, workers: int = 1, min_shard_size: int = MIN_SHARD_SIZE):
+        """
+        初始化统计分析器
+        
+        Args:
+            workers: 分析长序列时使用的进程数（1表示单进程）
+            min_shard_size: 每个分片的最小长度，序列不足两个分片时仍在单进程中分析
+        """
+        self.workers = max(1, int(workers))
+        self.min_shard_size = min_shard_size
+        self._stream_state = None
     
-    def analyze(self, digits: List[int]) -> Dict[str, Any]:
+    def analyze(self, digits: Union[List[int], DigitSequence]) -> Dict[str, Any]:
         """
         分析数字序列的统计特性
         
@@ -24,40 +87,227 @@ class StatisticalAnalyzer(BaseAnalyzer):
             分析结果
         """
         if not self.validate_input(digits):
-            return {
-                'error': 'Invalid input',
-                'digit_distribution': {},
-                'entropy': 0,
-                'mean': 0,
-                'std': 0,
-                'variance': 0
-            }
+            return self._create_error_response()
+        
+        digits = DigitSequence(self.preprocess(digits))
+        
+        # 所有统计量都由直方图和转移矩阵得出，长序列可分片并行计数
+        if self.workers > 1 and len(digits) >= 2 * self.min_shard_size:
+            state = sharded_partial_state(self, digits, self.workers, self.min_shard_size)
+        else:
+            state = self.partial_state(digits)
+        
+        return self.finalize_state(state)
+    
+    def analyze_context(self, context: AnalysisContext) -> Dict[str, Any]:
+        """
+        使用共享的分析上下文分析（直方图和转移矩阵直接取自上下文）
+        
+        Args:
+            context: 分析上下文
+        
+        Returns:
+            分析结果，与 analyze() 一致
+        """
+        if context.length == 0:
+            return self._create_error_response()
+        
+        state = StatisticalPartialState()
+        state.length = context.length
+        state.digit_counts = context.histogram
+        state.transition_counts = context.bigrams
+        state.first_digit = int(context.digits[0])
+        state.last_digit = int(context.digits[-1])
+        return self.finalize_state(state)
+    
+    def begin(self) -> None:
+        """开始流式分析，之后通过 feed() 逐块输入，最后调用 finish() 获取结果"""
+        self._stream_state = StatisticalPartialState()
+    
+    def feed(self, chunk: Union[List[int], DigitSequence]) -> None:
+        """
+        输入一块数字
+        
+        只累加直方图和转移矩阵（及块尾数字），内存占用与已输入的数字个数无关。
+        
+        Args:
+            chunk: 数字块
+        
+        Raises:
+            RuntimeError: 未调用 begin()
+            ValueError: 数字块包含非法数字
+        """
+        if self._stream_state is None:
+            raise RuntimeError("请先调用 begin() 开始流式分析")
+        self._stream_state = self.merge_states(self._stream_state, self.partial_state(chunk))
+    
+    def finish(self) -> Dict[str, Any]:
+        """
+        结束流式分析
+        
+        Returns:
+            分析结果，与对所有块拼接后的序列调用 analyze() 的结果一致（没有输入数字时返回错误结果）
+        """
+        if self._stream_state is None:
+            raise RuntimeError("请先调用 begin() 开始流式分析")
+        state = self._stream_state
+        self._stream_state = None
+        if state.length == 0:
+            return self._create_error_response()
+        return self.finalize_state(state)
+    
+    def analyze_file(self, file_path: str, max_digits: int = None) -> Dict[str, Any]:
+        """
+        流式分析数据文件
+        
+        按块读取文件并逐块输入，内存占用固定，可用于十亿位级别的文件。
+        
+        Args:
+            file_path: 数据文件路径
+            max_digits: 最大分析位数（None表示整个文件）
+        
+        Returns:
+            分析结果
+        """
+        self.begin()
+        for chunk in DataReader().iter_file_chunks(file_path, max_digits):
+            self.feed(chunk)
+        return self.finish()
+    
+    def partial_state(self, digits: Union[List[int], DigitSequence]) -> StatisticalPartialState:
+        """
+        计算一段数字的部分状态
+        
+        Args:
+            digits: 数字序列片段
+            
+        Returns:
+            部分状态
+        """
+        digits_array = as_digit_array(DigitSequence(digits))
+        
+        state = StatisticalPartialState()
+        state.length = len(digits_array)
+        if state.length == 0:
+            return state
+        
+        state.digit_counts = np.bincount(digits_array, minlength=10).astype(np.int64)
+        if state.length >= 2:
+            transition_codes = digits_array[:-1].astype(np.intp) * 10 + digits_array[1:]
+            state.transition_counts = np.bincount(transition_codes, minlength=100).astype(np.int64).reshape(10, 10)
+        state.first_digit = int(digits_array[0])
+        state.last_digit = int(digits_array[-1])
+        return state
+    
+    def analyze_batch(self, sequences: List[Union[List[int], DigitSequence]]) -> List[Dict[str, Any]]:
+        """
+        批量分析多个数字序列
+        
+        所有序列堆叠为一个二维 uint8 矩阵（较短的行补齐后屏蔽），
+        直方图和转移矩阵沿行一次算出，再逐行生成结果。
+        
+        Args:
+            sequences: 数字序列列表
+            
+        Returns:
+            与输入顺序一致的分析结果列表，每项与单独调用 analyze() 的结果一致
+        """
+        results = [None] * len(sequences)
+        valid_rows = []
+        valid_sequences = []
+        for row, digits in enumerate(sequences):
+            if not self.validate_input(digits):
+                results[row] = self._create_error_response()
+                continue
+            valid_rows.append(row)
+            valid_sequences.append(self.preprocess(digits))
+        
+        if not valid_sequences:
+            return results
+        
+        matrix, lengths = stack_digit_sequences(valid_sequences)
+        row_count, width = matrix.shape
+        row_index = np.arange(row_count, dtype=np.intp)[:, None]
+        positions = np.arange(width)
+        
+        digit_mask = positions < lengths[:, None]
+        digit_counts = np.bincount((row_index * 10 + matrix)[digit_mask],
+                                   minlength=row_count * 10).reshape(row_count, 10)
+        
+        transition_mask = positions[:-1] < (lengths - 1)[:, None]
+        transition_index = row_index * 100 + matrix[:, :-1].astype(np.intp) * 10 + matrix[:, 1:]
+        transition_counts = np.bincount(transition_index[transition_mask],
+                                        minlength=row_count * 100).reshape(row_count, 10, 10)
+        
+        for row, result_row in enumerate(valid_rows):
+            length = int(lengths[row])
+            state = StatisticalPartialState()
+            state.length = length
+            state.digit_counts = digit_counts[row].astype(np.int64)
+            state.transition_counts = transition_counts[row].astype(np.int64)
+            state.first_digit = int(matrix[row, 0])
+            state.last_digit = int(matrix[row, length - 1])
+            results[result_row] = self.finalize_state(state)
+        
+        return results
+    
+    def merge_states(self, left: StatisticalPartialState, right: StatisticalPartialState) -> StatisticalPartialState:
+        """
+        合并两个相邻片段的部分状态（left 在前，right 在后）
+        
+        Args:
+            left: 前一片段的状态
+            right: 后一片段的状态
+            
+        Returns:
+            合并后的状态
+        """
+        if left.length == 0:
+            return right.copy()
+        if right.length == 0:
+            return left.copy()
         
-        digits = self.preprocess(digits)
+        merged = StatisticalPartialState()
+        merged.length = left.length + right.length
+        merged.digit_counts = left.digit_counts + right.digit_counts
+        merged.transition_counts = left.transition_counts + right.transition_counts
+        # 跨越边界的相邻数字
+        merged.transition_counts[left.last_digit, right.first_digit] += 1
+        merged.first_digit = left.first_digit
+        merged.last_digit = right.last_digit
+        return merged
+    
+    def finalize_state(self, state: StatisticalPartialState) -> Dict[str, Any]:
+        """
+        由部分状态生成完整分析结果
+        
+        Args:
+            state: 覆盖整个序列的部分状态
+            
+        Returns:
+            分析结果
+        """
+        if state.length == 0:
+            return self._create_error_response()
         
         # 计算数字分布
-        digit_distribution = self._calculate_digit_distribution(digits)
+        digit_distribution = self._calculate_digit_distribution(state)
         
         # 计算熵值
-        entropy = self._calculate_entropy(digits)
-        
-        # 计算基本统计量
-        mean = self._calculate_mean(digits)
-        std = self._calculate_std(digits)
-        variance = self._calculate_variance(digits)
+        entropy = self._calculate_entropy(digit_distribution)
         
-        # 计算高阶统计量
-        skewness = self._calculate_skewness(digits)
-        kurtosis = self._calculate_kurtosis(digits)
+        # 计算基本统计量和高阶统计量（直方图的中心矩）
+        mean, variance, skewness, kurtosis = self._calculate_moments(state)
+        std = float(np.sqrt(variance))
         
         # 计算相邻数字相关性
-        correlation = self._calculate_correlation(digits)
+        correlation = self._calculate_correlation(state)
         
         # 计算运行统计
-        runs_analysis = self._calculate_runs_analysis(digits)
+        runs_analysis = self._calculate_runs_analysis(state, digit_distribution)
         
         # 计算分位数
-        percentiles = self._calculate_percentiles(digits)
+        percentiles = self._calculate_percentiles(state)
         
         return {
             'digit_distribution': digit_distribution,
@@ -70,92 +320,98 @@ class StatisticalAnalyzer(BaseAnalyzer):
             'correlation': correlation,
             'runs_analysis': runs_analysis,
             'percentiles': percentiles,
-            'total_digits': len(digits)
+            'total_digits': state.length
         }
     
-    def _calculate_digit_distribution(self, digits: List[int]) -> Dict[int, float]:
+    def _create_error_response(self) -> Dict[str, Any]:
+        """创建无效输入的结果"""
+        return {
+            'error': 'Invalid input',
+            'digit_distribution': {},
+            'entropy': 0,
+            'mean': 0,
+            'std': 0,
+            'variance': 0
+        }
+    
+    def _calculate_digit_distribution(self, state: StatisticalPartialState) -> Dict[int, float]:
         """计算数字分布"""
-        counter = Counter(digits)
-        total = len(digits)
-        distribution = {}
-        for digit in range(10):
-            distribution[digit] = counter.get(digit, 0) / total if total > 0 else 0
-        return distribution
-    
-    def _calculate_entropy(self, digits: List[int]) -> float:
+        total = state.length
+        return {digit: int(state.digit_counts[digit]) / total if total > 0 else 0 for digit in range(10)}
+    
+    def _calculate_entropy(self, distribution: Dict[int, float]) -> float:
         """计算熵值"""
-        if not digits:
-            return 0
-        distribution = self._calculate_digit_distribution(digits)
         entropy = 0
         for probability in distribution.values():
             if probability > 0:
                 entropy -= probability * np.log2(probability)
         return entropy
     
-    def _calculate_mean(self, digits: List[int]) -> float:
-        """计算均值"""
-        return np.mean(digits) if digits else 0
-    
-    def _calculate_std(self, digits: List[int]) -> float:
-        """计算标准差"""
-        return np.std(digits) if digits else 0
-    
-    def _calculate_variance(self, digits: List[int]) -> float:
-        """计算方差"""
-        return np.var(digits) if digits else 0
-    
-    def _calculate_skewness(self, digits: List[int]) -> float:
-        """计算偏度"""
-        if len(digits) < 3:
-            return 0
-        mean = self._calculate_mean(digits)
-        std = self._calculate_std(digits)
-        if std == 0:
-            return 0
-        skewness = np.mean([(x - mean) ** 3 for x in digits]) / (std ** 3)
-        return skewness
-    
-    def _calculate_kurtosis(self, digits: List[int]) -> float:
-        """计算峰度"""
-        if len(digits) < 4:
-            return 0
-        mean = self._calculate_mean(digits)
-        std = self._calculate_std(digits)
-        if std == 0:
-            return 0
-        kurtosis = np.mean([(x - mean) ** 4 for x in digits]) / (std ** 4) - 3  # 减去3使正态分布峰度为0
-        return kurtosis
+    def _calculate_moments(self, state: StatisticalPartialState) -> Tuple[float, float, float, float]:
+        """
+        计算均值、方差、偏度和峰度
+        
+        Returns:
+            (均值, 方差, 偏度, 峰度)，偏度和峰度在样本不足或方差为0时为0
+        """
+        n = state.length
+        values = np.arange(10, dtype=np.float64)
+        counts = state.digit_counts.astype(np.float64)
+        
+        mean = float(np.dot(values, counts) / n)
+        deviations = values - mean
+        variance = float(np.dot(counts, deviations ** 2) / n)
+        std = np.sqrt(variance)
+        
+        skewness = 0
+        if n >= 3 and std > 0:
+            skewness = float(np.dot(counts, deviations ** 3) / n / std ** 3)
+        
+        kurtosis = 0
+        if n >= 4 and std > 0:
+            kurtosis = float(np.dot(counts, deviations ** 4) / n / std ** 4 - 3)  # 减去3使正态分布峰度为0
+        
+        return mean, variance, skewness, kurtosis
     
-    def _calculate_correlation(self, digits: List[int]) -> float:
-        """计算相邻数字相关性"""
-        if len(digits) < 2:
+    def _calculate_correlation(self, state: StatisticalPartialState) -> float:
+        """计算相邻数字相关性（由转移矩阵计算 x=d[i] 与 y=d[i+1] 的皮尔逊相关系数）"""
+        pair_count = state.length - 1
+        if pair_count < 2:
             return 0
-        x = digits[:-1]
-        y = digits[1:]
-        if len(x) < 2:
+        
+        values = np.arange(10, dtype=np.float64)
+        transitions = state.transition_counts.astype(np.float64)
+        x_counts = transitions.sum(axis=1)
+        y_counts = transitions.sum(axis=0)
+        
+        x_mean = np.dot(values, x_counts) / pair_count
+        y_mean = np.dot(values, y_counts) / pair_count
+        x_deviations = values - x_mean
+        y_deviations = values - y_mean
+        
+        covariance = x_deviations @ transitions @ y_deviations
+        x_variance = np.dot(x_counts, x_deviations ** 2)
+        y_variance = np.dot(y_counts, y_deviations ** 2)
+        if x_variance <= 0 or y_variance <= 0:
             return 0
-        correlation = np.corrcoef(x, y)[0, 1]
-        return correlation if not np.isnan(correlation) else 0
+        
+        correlation = covariance / np.sqrt(x_variance * y_variance)
+        return float(np.clip(correlation, -1, 1))
     
-    def _calculate_runs_analysis(self, digits: List[int]) -> Dict[str, Any]:
+    def _calculate_runs_analysis(self, state: StatisticalPartialState, p: Dict[int, float]) -> Dict[str, Any]:
         """计算运行分析"""
-        if len(digits) < 2:
+        n = state.length
+        if n < 2:
             return {
                 'runs': 0,
                 'expected_runs': 0,
                 'z_score': 0
             }
         
-        # 计算实际运行数
-        runs = 1
-        for i in range(1, len(digits)):
-            if digits[i] != digits[i-1]:
-                runs += 1
+        # 计算实际运行数（相邻数字不同的位置数 + 1）
+        runs = 1 + (n - 1 - int(np.trace(state.transition_counts)))
         
         # 计算期望运行数
-        n = len(digits)
-        p = self._calculate_digit_distribution(digits)
         expected_runs = 1 + 2 * n * sum(p_i * (1 - p_i) for p_i in p.values())
         
         # 计算方差
@@ -174,27 +430,14 @@ class StatisticalAnalyzer(BaseAnalyzer):
             'std_runs': std_runs
         }
     
-    def _calculate_percentiles(self, digits: List[int]) -> Dict[str, float]:
-        """计算分位数"""
-        if not digits:
-            return {
-                'p10': 0,
-                'p25': 0,
-                'p50': 0,
-                'p75': 0,
-                'p90': 0
-            }
-        
-        sorted_digits = sorted(digits)
-        n = len(sorted_digits)
+    def _calculate_percentiles(self, state: StatisticalPartialState) -> Dict[str, float]:
+        """计算分位数（排序后第 int(n*q) 个数字，由累计计数直接定位）"""
+        n = state.length
+        cumulative = np.cumsum(state.digit_counts)
         
-        percentiles = {
-            'p10': sorted_digits[int(n * 0.1)] if n > 0 else 0,
-            'p25': sorted_digits[int(n * 0.25)] if n > 0 else 0,
-            'p50': sorted_digits[int(n * 0.5)] if n > 0 else 0,
-            'p75': sorted_digits[int(n * 0.75)] if n > 0 else 0,
-            'p90': sorted_digits[int(n * 0.9)] if n > 0 else 0
-        }
+        percentiles = {}
+        for name, q in (('p10', 0.1), ('p25', 0.25), ('p50', 0.5), ('p75', 0.75), ('p90', 0.9)):
+            percentiles[name] = int(np.searchsorted(cumulative, int(n * q), side='right'))
         
         return percentiles
     
@@ -0,0 +1,339 @@
+# core/analyzers/suffix_array.py
+# 后缀数组与LCP（用于重复子串检测）
+
+from typing import Iterator, List, Optional, Tuple
+import numpy as np
+
+# 前缀倍增的前几层直接用11进制编码一次排序（11^8 的平方仍在int64范围内）
+INITIAL_SPAN = 8
+
+def _prefix_doubling(digits: np.ndarray, depth: int) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """
+    前缀倍增排序
+    
+    Returns:
+        (后缀数组, 各层名次)，第j层为按前 2^j 位排序的名次；名次互不相同时提前结束
+    """
+    n = len(digits)
+    # 前 INITIAL_SPAN 位直接用11进制编码比较（数字记为1-10，越过末尾记为0，比任何数字都小），
+    # 这几层只需一次排序；ranks[j] 为按前 2^j 位比较的名次（或等价的编码）
+    code = np.asarray(digits, dtype=np.int64) + 1
+    ranks = [code]
+    span = 1
+    while span < min(depth, INITIAL_SPAN):
+        shifted = np.zeros(n, dtype=np.int64)
+        shifted[:n - span] = code[span:]
+        code = code * 11 ** span + shifted
+        ranks.append(code)
+        span *= 2
+    order = np.argsort(code)
+    sorted_code = code[order]
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.concatenate(([0], np.cumsum(sorted_code[1:] != sorted_code[:-1])))
+    ranks[-1] = rank
+    
+    # 名次互不相同时任意两个后缀在前 span 位内就能区分，更深的排序不会改变结果
+    while span < depth and rank[order[-1]] != n - 1:
+        second = np.full(n, -1, dtype=np.int64)
+        second[:n - span] = rank[span:]
+        key = rank * (int(rank.max()) + 2) + (second + 1)
+        order = np.argsort(key)
+        sorted_key = key[order]
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.concatenate(([0], np.cumsum(sorted_key[1:] != sorted_key[:-1])))
+        ranks.append(rank)
+        span *= 2
+    return order, ranks
+
+def _padded_levels(ranks: List[np.ndarray]) -> List[np.ndarray]:
+    """各层名次末尾填充互不相同的负数，越界比较时保证不会相等"""
+    padding = 1 << len(ranks)
+    return [np.concatenate((level, -np.arange(1, padding + 1, dtype=np.int64))) for level in ranks]
+
+def _common_prefix(padded: List[np.ndarray], left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """二进制提升求任意后缀对的最长公共前缀（不超过 2^层数 - 1）"""
+    common = np.zeros(len(left), dtype=np.int64)
+    for level in range(len(padded) - 1, -1, -1):
+        equal = padded[level][left + common] == padded[level][right + common]
+        common += equal * (1 << level)
+    return common
+
+def build_suffix_array(digits: np.ndarray, depth: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    用前缀倍增构建按前 depth 位排序的后缀数组及相邻后缀的LCP
+    
+    只需比较到 depth 位：前 depth 位相同的后缀之间顺序任意，
+    但长度不超过 depth 的任意子串的所有出现位置在后缀数组中仍然连续。
+    前 INITIAL_SPAN 位一次排序，之后每次倍增一次 argsort，名次互不相同时提前结束。
+    
+    Args:
+        digits: 数字序列的整数数组
+        depth: 排序深度（需要检测的最大子串长度）
+    
+    Returns:
+        (后缀数组, lcp)，lcp[i] 为 sa[i-1] 与 sa[i] 的最长公共前缀长度（截断到 depth，lcp[0] = 0）
+    """
+    n = len(digits)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    
+    order, ranks = _prefix_doubling(digits, depth)
+    common = _common_prefix(_padded_levels(ranks), order[:-1], order[1:])
+    
+    lcp = np.zeros(n, dtype=np.int64)
+    lcp[1:] = np.minimum(common, depth)
+    return order, lcp
+
+def _previous_smaller(values: np.ndarray) -> np.ndarray:
+    """
+    每个位置左侧最近的更小值的下标（不存在时为-1）
+    
+    指针跳跃：prev[i] 与 i 之间的值都大于 values[i]，
+    若 values[prev[i]] 仍更大则跳到 prev[prev[i]]，直到找到更小值。
+    """
+    prev = np.arange(len(values), dtype=np.int64) - 1
+    active = np.flatnonzero(prev >= 0)
+    while len(active):
+        active = active[values[prev[active]] > values[active]]
+        prev[active] = prev[prev[active]]
+        active = active[prev[active] >= 0]
+    return prev
+
+def suffix_array(digits: np.ndarray) -> np.ndarray:
+    """
+    构建完整的后缀数组
+    
+    前 INITIAL_SPAN 位一次排序，之后每轮倍增一次稳定排序，名次互不相同时结束。
+    与 build_suffix_array 不同，只保留当前一层名次，内存占用为 O(n)。
+    
+    Args:
+        digits: 数字序列的整数数组
+    
+    Returns:
+        后缀数组（越过末尾视为比任何数字都小，因此较短的后缀排在前面）
+    """
+    n = len(digits)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    code = np.asarray(digits, dtype=np.int64) + 1
+    span = 1
+    while span < INITIAL_SPAN:
+        shifted = np.zeros(n, dtype=np.int64)
+        shifted[:max(n - span, 0)] = code[span:]
+        code = code * 11 ** span + shifted
+        span *= 2
+    order = np.argsort(code)
+    sorted_code = code[order]
+    del code
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.concatenate(([0], np.cumsum(sorted_code[1:] != sorted_code[:-1])))
+    del sorted_code
+    
+    while rank[order[-1]] != n - 1:
+        # 按第二关键字（i+span 处的名次）排好的顺序可直接由上一轮的后缀数组得到：
+        # 越过末尾的后缀在前，其余为 order 中不小于 span 的起点左移 span 位；
+        # 再按第一关键字稳定排序（输入已部分有序，timsort 很快）
+        by_second = np.concatenate((np.arange(max(n - span, 0), n), order[order >= span] - span))
+        order = by_second[np.argsort(rank[by_second], kind='stable')]
+        del by_second
+        first = rank[order]
+        second = np.full(n, -1, dtype=np.int64)
+        valid = order < n - span
+        second[valid] = rank[order[valid] + span]
+        changed = (first[1:] != first[:-1]) | (second[1:] != second[:-1])
+        del first, second, valid
+        rank[order] = np.concatenate(([0], np.cumsum(changed)))
+        del changed
+        span *= 2
+    return order
+
+def previous_factor_sources(digits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    每个位置的最长前置因子的候选来源
+    
+    从位置i开始、且在更早的某个位置 j < i 处也出现过的最长子串（最长前置因子），
+    其来源只可能是后缀数组中i左右两侧最近的、起始位置小于i的后缀。
+    两侧各用一次最近更小值查找得到。
+    
+    Args:
+        digits: 数字序列的整数数组
+    
+    Returns:
+        (左侧来源, 右侧来源)，与序列等长，不存在时为-1
+    """
+    n = len(digits)
+    order = suffix_array(digits)
+    sources = []
+    for neighbours in (_previous_smaller(order), n - 1 - _previous_smaller(order[::-1])[::-1]):
+        source = np.full(n, -1, dtype=np.int64)
+        found = (neighbours >= 0) & (neighbours < n)
+        source[order[found]] = order[neighbours[found]]
+        sources.append(source)
+    return sources[0], sources[1]
+
+def common_prefix_length(data: bytes, first: int, second: int) -> int:
+    """
+    两个位置起的最长公共前缀长度
+    
+    比较的长度按倍增试探、失配后折半，每次比较是一次字节串比较，
+    长度为L的公共前缀需要 O(log L) 次比较、O(L) 字节。
+    
+    Args:
+        data: 字节串
+        first: 第一个起始位置
+        second: 第二个起始位置
+    
+    Returns:
+        公共前缀长度
+    """
+    limit = len(data) - max(first, second)
+    length = 0
+    step = 1
+    while length < limit:
+        step = min(step, limit - length)
+        if data[first + length:first + length + step] == data[second + length:second + length + step]:
+            length += step
+            step *= 2
+        elif step == 1:
+            break
+        else:
+            step //= 2
+    return length
+
+def longest_previous_factor(digits: np.ndarray) -> np.ndarray:
+    """
+    计算最长前置因子数组
+    
+    lpf[i] 为从位置i开始、且在更早的某个位置 j < i 处也出现过的最长子串长度（允许与i处重叠）。
+    逐位置比较两个候选来源，适合较短的序列；LZ76分解只需要短语起点处的值，见 ComplexityAnalyzer。
+    
+    Args:
+        digits: 数字序列的整数数组
+    
+    Returns:
+        与序列等长的int64数组
+    """
+    digits = np.asarray(digits, dtype=np.uint8)
+    data = digits.tobytes()
+    left, right = previous_factor_sources(digits)
+    lpf = np.zeros(len(digits), dtype=np.int64)
+    for position in range(len(digits)):
+        lpf[position] = max(common_prefix_length(data, position, source) if source >= 0 else 0
+                            for source in (left[position], right[position]))
+    return lpf
+
+def repeated_substring_groups(digits: np.ndarray, min_length: int, max_length: int,
+                              min_count: int = 2) -> Iterator[Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    按长度枚举重复子串的分组（不展开出现位置）
+    
+    长度为 L 的子串的所有出现位置对应后缀数组中 LCP >= L 的一个连续区间，
+    因此每个长度只需在 LCP 数组上做一次向量化的区间划分；区间长度即出现次数，
+    区间内后缀起点的最小值即首次出现位置。
+    
+    Args:
+        digits: 数字序列的整数数组
+        min_length: 最小子串长度
+        max_length: 最大子串长度
+        min_count: 最少出现次数
+    
+    Yields:
+        (子串长度, 后缀数组, 各组在后缀数组中的起点, 各组出现次数, 各组首次出现位置)，
+        组按首次出现位置排序；第i组的出现位置为 sa[starts[i]:starts[i]+sizes[i]]（未排序，见 group_positions）
+    """
+    if max_length < min_length or len(digits) < 2:
+        return
+    order, lcp = build_suffix_array(digits, max_length)
+    
+    for length in range(min_length, max_length + 1):
+        # lcp[start+1:end+1] >= length 的连续段对应成员 order[start:end+1]
+        mask = np.concatenate(([False], lcp[1:] >= length, [False]))
+        edges = np.flatnonzero(mask[1:] != mask[:-1])
+        starts = edges[0::2]
+        sizes = edges[1::2] - starts + 1
+        keep = sizes >= min_count
+        starts, sizes = starts[keep], sizes[keep]
+        if len(starts) == 0:
+            yield length, order, starts, sizes, starts
+            continue
+        
+        # 交替取区间起点和终点做分段最小值，偶数段即各组的最小起点
+        bounds = np.stack((starts, starts + sizes), axis=1).ravel()
+        firsts = np.minimum.reduceat(order, bounds[:-1] if bounds[-1] == len(order) else bounds)[0::2]
+        group_order = np.argsort(firsts, kind='stable')
+        yield length, order, starts[group_order], sizes[group_order], firsts[group_order]
+
+def group_positions(order: np.ndarray, starts: np.ndarray, sizes: np.ndarray,
+                    limit: Optional[int] = None) -> List[List[int]]:
+    """
+    展开重复子串分组的出现位置
+    
+    Args:
+        order: 后缀数组
+        starts: 各组在后缀数组中的起点
+        sizes: 各组出现次数
+        limit: 每组保留的位置个数上限（None表示全部）
+    
+    Returns:
+        各组的出现位置列表（升序，只保留最小的 limit 个）
+    """
+    if len(starts) == 0:
+        return []
+    group_bounds = np.concatenate(([0], np.cumsum(sizes)))
+    member_offsets = np.arange(int(group_bounds[-1])) - np.repeat(group_bounds[:-1], sizes)
+    members = order[np.repeat(starts, sizes) + member_offsets]
+    keys = np.sort(np.repeat(np.arange(len(starts), dtype=np.int64), sizes) * len(order) + members)
+    members = keys % len(order)
+    if limit is not None:
+        # 排序后每组仍占原来的区间，组内偏移小于 limit 的即最小的 limit 个位置
+        members = members[member_offsets < limit]
+        group_bounds = np.concatenate(([0], np.cumsum(np.minimum(sizes, limit))))
+    members = members.tolist()
+    bounds = group_bounds.tolist()
+    return [members[bounds[i]:bounds[i + 1]] for i in range(len(starts))]
+
+def repeated_substrings(digits: np.ndarray, min_length: int, max_length: int,
+                        min_count: int = 2) -> Iterator[Tuple[int, List[List[int]]]]:
+    """
+    枚举所有重复出现的子串及其全部出现位置
+    
+    Args:
+        digits: 数字序列的整数数组
+        min_length: 最小子串长度
+        max_length: 最大子串长度
+        min_count: 最少出现次数
+    
+    Yields:
+        (子串长度, 各子串的出现位置列表)，位置升序，子串按首次出现位置排序
+    """
+    for length, order, starts, sizes, _ in repeated_substring_groups(digits, min_length, max_length, min_count):
+        yield length, group_positions(order, starts, sizes)
+
+def repeated_substring_counts(digits: np.ndarray, min_length: int, max_length: int,
+                              min_count: int = 2) -> Iterator[Tuple[int, int, int]]:
+    """
+    统计重复出现的子串个数和出现总次数（不展开出现位置）
+    
+    与 repeated_substrings 使用同一划分：每个 LCP >= L 的连续段对应一个长度为 L 的重复子串，
+    段长加一即为其出现次数。
+    
+    Args:
+        digits: 数字序列的整数数组
+        min_length: 最小子串长度
+        max_length: 最大子串长度
+        min_count: 最少出现次数
+    
+    Yields:
+        (子串长度, 重复子串个数, 这些子串的出现总次数)
+    """
+    if max_length < min_length or len(digits) < 2:
+        return
+    _, lcp = build_suffix_array(digits, max_length)
+    
+    for length in range(min_length, max_length + 1):
+        mask = np.concatenate(([False], lcp[1:] >= length, [False]))
+        edges = np.flatnonzero(mask[1:] != mask[:-1])
+        sizes = edges[1::2] - edges[0::2] + 1
+        sizes = sizes[sizes >= min_count]
+        yield length, len(sizes), int(sizes.sum())
@@ -0,0 +1,243 @@
+# core/analyzers/track_spec.py
+# 声明式轨道定义
+
+import json
+from typing import Dict, List, Any, Tuple
+import numpy as np
+
+# 窗口型轨道的窗口长度（4个3位子序列）
+WINDOW_SIZE = 12
+
+# 默认轨道定义：轨道1为窗口型（数字属性 → 八态 → 八卦配对），轨道2-4为符号型（数字 → 符号 → 阴阳/配对）
+DEFAULT_TRACK_SPECS = {
+    'track1': {
+        'type': 'window',
+        # 数字0-9在各维度上的属性位
+        'attributes': {
+            'small_large': [0, 1, 1, 1, 1, 1, 1, 1, 0, 0],
+            'up_down': [0, 1, 1, 1, 0, 0, 1, 1, 1, 0],
+            'odd_even': [0, 1, 0, 1, 0, 1, 0, 1, 0, 1],
+            'ab_relation': [0, 1, 1, 1, 1, 0, 0, 0, 0, 1]
+        },
+        # 八态编码表（3位二进制到状态ID）
+        'state_encoding': {
+            '111': 1, '110': 2, '101': 3, '100': 4,
+            '011': 5, '010': 6, '001': 7, '000': 8
+        },
+        # 八卦系统九和配对规则
+        'pairing': {1: 8, 2: 7, 3: 6, 4: 5, 5: 4, 6: 3, 7: 2, 8: 1},
+        # 小数字(1-7)为阳，其余为阴
+        'yang_digits': [1, 2, 3, 4, 5, 6, 7]
+    },
+    'track2': {
+        'type': 'symbol',
+        'symbols': ['E', 'A', 'B', 'C', 'D', 'D', 'C', 'B', 'A', 'E'],
+        'yang': ['A', 'C', 'E'],
+        'yin': ['B', 'D'],
+        # 和=9的配对：[数字1, 数字2, 配对类型, 阴阳]
+        'pairs': [
+            [1, 8, 'A', '阳'], [8, 1, 'A', '阳'],
+            [2, 7, 'B', '阴'], [7, 2, 'B', '阴'],
+            [3, 6, 'C', '阳'], [6, 3, 'C', '阳'],
+            [4, 5, 'D', '阴'], [5, 4, 'D', '阴'],
+            [9, 0, 'E', '阳'], [0, 9, 'E', '阳']
+        ]
+    },
+    'track3': {
+        'type': 'symbol',
+        'symbols': ['戊', '甲', '乙', '丙', '丁', '戊', '丁', '丙', '乙', '甲'],
+        'yang': ['甲', '丙', '戊'],
+        'yin': ['乙', '丁'],
+        # 和=10的配对
+        'pairs': [
+            [1, 9, '甲', '阳'], [9, 1, '甲', '阳'],
+            [2, 8, '乙', '阴'], [8, 2, '乙', '阴'],
+            [3, 7, '丙', '阳'], [7, 3, '丙', '阳'],
+            [4, 6, '丁', '阴'], [6, 4, '丁', '阴'],
+            [5, 0, '戊', '阳'], [0, 5, '戊', '阳']
+        ]
+    },
+    'track4': {
+        'type': 'symbol',
+        'symbols': ['五', '一', '二', '三', '四', '二', '三', '四', '一', '五'],
+        'yang': ['一', '三', '五'],
+        'yin': ['二', '四'],
+        # 特定组合的配对
+        'pairs': [
+            [1, 8, '一', '阳'], [8, 1, '一', '阳'],
+            [2, 5, '二', '阴'], [5, 2, '二', '阴'],
+            [3, 6, '三', '阳'], [6, 3, '三', '阳'],
+            [4, 7, '四', '阴'], [7, 4, '四', '阴'],
+            [9, 0, '五', '阳'], [0, 9, '五', '阳']
+        ]
+    }
+}
+
+class CompiledTrack:
+    """
+    编译后的轨道
+    
+    所有规则都展开为按数字（或数字对、状态ID）索引的稠密查找数组，
+    分析时只需对直方图查表，轨道数量不影响逐位处理的开销。
+    """
+    
+    def __init__(self, name: str, kind: str):
+        """
+        初始化编译后的轨道
+        
+        Args:
+            name: 轨道名称
+            kind: 轨道类型（'window' 或 'symbol'）
+        """
+        self.name = name
+        self.kind = kind
+        # 阳/阴数字表：长度10的uint8数组
+        self.yang_lut = np.zeros(10, dtype=np.uint8)
+        self.yin_lut = np.zeros(10, dtype=np.uint8)
+        # 相邻数字对有效性：10×10布尔矩阵
+        self.pair_table = np.zeros((10, 10), dtype=bool)
+        # 全局配对规则：[((数字1, 数字2), 配对类型, 阴阳)]
+        self.pair_rules: List[Tuple[Tuple[int, int], str, str]] = []
+        # 符号型轨道：数字到符号的映射及阴阳符号集合
+        self.symbols: List[str] = []
+        self.yang_symbols = set()
+        self.yin_symbols = set()
+        # 窗口型轨道：属性位平面、3位编码到状态ID、状态ID到配对状态ID
+        self.dimensions: List[str] = []
+        self.attribute_planes = np.zeros((0, 10), dtype=np.uint8)
+        self.state_lut = np.ones(8, dtype=np.uint8)
+        self.pairing_lut = np.zeros(256, dtype=np.uint8)
+        self.state_encoding: Dict[str, int] = {}
+        self.pairing: Dict[int, int] = {}
+
+def _digit_list(values: Any, field: str, track_name: str) -> List[int]:
+    """校验并转换长度为10的数字属性列表"""
+    if not isinstance(values, (list, tuple)) or len(values) != 10:
+        raise ValueError(f"轨道 {track_name} 的 {field} 必须是长度为10的列表")
+    return list(values)
+
+def _compile_window_track(name: str, spec: Dict[str, Any]) -> CompiledTrack:
+    """编译窗口型轨道"""
+    track = CompiledTrack(name, 'window')
+    
+    attributes = spec.get('attributes')
+    if not isinstance(attributes, dict) or not attributes:
+        raise ValueError(f"轨道 {name} 缺少属性定义 attributes")
+    track.dimensions = list(attributes.keys())
+    planes = []
+    for dim in track.dimensions:
+        bits = _digit_list(attributes[dim], f"attributes.{dim}", name)
+        if any(bit not in (0, 1) for bit in bits):
+            raise ValueError(f"轨道 {name} 的维度 {dim} 只能包含0或1")
+        planes.append(bits)
+    track.attribute_planes = np.array(planes, dtype=np.uint8)
+    
+    # 3位二进制值（b0*4 + b1*2 + b2）到状态ID的映射，未定义编码回退为1
+    track.state_encoding = {str(code): int(state_id) for code, state_id in spec.get('state_encoding', {}).items()}
+    for binary_str, state_id in track.state_encoding.items():
+        if len(binary_str) != 3 or set(binary_str) - {'0', '1'}:
+            raise ValueError(f"轨道 {name} 的状态编码 {binary_str} 不是3位二进制")
+        if not 1 <= state_id <= 255:
+            raise ValueError(f"轨道 {name} 的状态ID {state_id} 超出范围")
+        track.state_lut[int(binary_str, 2)] = state_id
+    
+    # 配对表：状态ID到配对状态ID，0表示无配对（JSON中的键为字符串）
+    track.pairing = {int(state_id): int(paired_id) for state_id, paired_id in spec.get('pairing', {}).items()}
+    for state_id in set(track.state_encoding.values()):
+        if state_id not in track.pairing:
+            raise ValueError(f"轨道 {name} 的配对规则缺少状态 {state_id}")
+    for state_id, paired_id in track.pairing.items():
+        if not (1 <= state_id <= 255 and 0 <= paired_id <= 255):
+            raise ValueError(f"轨道 {name} 的配对规则 {state_id}->{paired_id} 超出范围")
+        track.pairing_lut[state_id] = paired_id
+    
+    for num in spec.get('yang_digits', []):
+        if not 0 <= int(num) <= 9:
+            raise ValueError(f"轨道 {name} 的阳数字 {num} 超出范围")
+        track.yang_lut[int(num)] = 1
+    track.yin_lut = 1 - track.yang_lut
+    return track
+
+def _compile_symbol_track(name: str, spec: Dict[str, Any]) -> CompiledTrack:
+    """编译符号型轨道"""
+    track = CompiledTrack(name, 'symbol')
+    
+    track.symbols = [str(symbol) for symbol in _digit_list(spec.get('symbols'), 'symbols', name)]
+    track.yang_symbols = set(spec.get('yang', []))
+    track.yin_symbols = set(spec.get('yin', []))
+    if track.yang_symbols & track.yin_symbols:
+        raise ValueError(f"轨道 {name} 的符号不能同时属于阳和阴: {track.yang_symbols & track.yin_symbols}")
+    unclassified = set(track.symbols) - track.yang_symbols - track.yin_symbols
+    if unclassified:
+        raise ValueError(f"轨道 {name} 的符号缺少阴阳分类: {unclassified}")
+    track.yang_lut = np.array([1 if symbol in track.yang_symbols else 0 for symbol in track.symbols], dtype=np.uint8)
+    track.yin_lut = 1 - track.yang_lut
+    
+    for rule in spec.get('pairs', []):
+        if len(rule) != 4:
+            raise ValueError(f"轨道 {name} 的配对规则格式应为 [数字1, 数字2, 配对类型, 阴阳]: {rule}")
+        d1, d2, pair_type, yinyang = rule
+        d1, d2 = int(d1), int(d2)
+        if not (0 <= d1 <= 9 and 0 <= d2 <= 9):
+            raise ValueError(f"轨道 {name} 的配对规则 {rule} 包含非法数字")
+        track.pair_rules.append(((d1, d2), str(pair_type), str(yinyang)))
+        track.pair_table[d1, d2] = True
+    return track
+
+def compile_track_specs(specs: Dict[str, Dict[str, Any]]) -> Dict[str, CompiledTrack]:
+    """
+    将轨道定义编译为查找数组
+    
+    Args:
+        specs: 轨道名称到轨道定义的映射（格式见 DEFAULT_TRACK_SPECS）
+    
+    Returns:
+        轨道名称到编译后轨道的映射（保持输入顺序）
+    
+    Raises:
+        ValueError: 轨道定义不合法
+    """
+    compiled = {}
+    for name, spec in specs.items():
+        kind = spec.get('type')
+        if kind == 'window':
+            track = _compile_window_track(name, spec)
+        elif kind == 'symbol':
+            track = _compile_symbol_track(name, spec)
+        else:
+            raise ValueError(f"轨道 {name} 的类型必须是 'window' 或 'symbol'，实际为: {kind}")
+        for array in (track.yang_lut, track.yin_lut, track.pair_table, track.attribute_planes,
+                      track.state_lut, track.pairing_lut):
+            array.setflags(write=False)
+        compiled[name] = track
+    return compiled
+
+def merge_track_specs(extra_specs: Dict[str, Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    在默认轨道定义上添加或覆盖轨道
+    
+    Args:
+        extra_specs: 额外的轨道定义（同名轨道覆盖默认定义）
+    
+    Returns:
+        合并后的轨道定义
+    """
+    specs = dict(DEFAULT_TRACK_SPECS)
+    specs.update(extra_specs or {})
+    return specs
+
+def load_track_specs(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    从JSON文件加载轨道定义
+    
+    Args:
+        path: JSON文件路径
+    
+    Returns:
+        轨道名称到轨道定义的映射
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        specs = json.load(f)
+    if not isinstance(specs, dict):
+        raise ValueError("轨道定义文件的顶层必须是对象")
+    return specs
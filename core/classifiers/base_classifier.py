@@ -2,13 +2,14 @@
 # 分类器基类
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+from core.data.digit_sequence import DigitSequence, is_digit_list
 
 class BaseClassifier(ABC):
     """分类器基类"""
     
     @abstractmethod
-    def classify(self, digits: List[int], name: str = None) -> Dict[str, Any]:
+    def classify(self, digits: Union[List[int], DigitSequence], name: str = None) -> Dict[str, Any]:
         """
         分类数字序列
         
@@ -41,7 +42,7 @@ class BaseClassifier(ABC):
         """
         pass
     
-    def validate_input(self, digits: List[int]) -> bool:
+    def validate_input(self, digits: Union[List[int], DigitSequence]) -> bool:
         """
         验证输入数据
         
@@ -51,10 +52,14 @@ class BaseClassifier(ABC):
         Returns:
             是否有效
         """
+        # DigitSequence 在构造时已校验，无需逐元素扫描
+        if isinstance(digits, DigitSequence):
+            return len(digits) > 0
+        
         if not isinstance(digits, list):
             return False
         
-        if not all(isinstance(d, int) and 0 <= d <= 9 for d in digits):
+        if not is_digit_list(digits):
             return False
         
         return len(digits) > 0
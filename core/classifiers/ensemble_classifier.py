@@ -1,11 +1,12 @@
 # core/classifiers/ensemble_classifier.py
 # 集成分类器
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 from collections import defaultdict
 from core.classifiers.base_classifier import BaseClassifier
 from core.classifiers.rule_based_classifier import RuleBasedClassifier
 from core.classifiers.feature_based_classifier import FeatureBasedClassifier
+from core.data.digit_sequence import DigitSequence
 
 class EnsembleClassifier(BaseClassifier):
     """集成分类器"""
@@ -21,7 +22,7 @@ class EnsembleClassifier(BaseClassifier):
             'feature_based': 0.4  # 基于特征的分类器权重
         }
     
-    def classify(self, digits: List[int], name: str = None) -> Dict[str, Any]:
+    def classify(self, digits: Union[List[int], DigitSequence], name: str = None) -> Dict[str, Any]:
         """
         集成多个分类器的结果
         
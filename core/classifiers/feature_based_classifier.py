@@ -1,15 +1,23 @@
 # core/classifiers/feature_based_classifier.py
 # 基于特征的分类器
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 from collections import Counter
 import numpy as np
 from core.classifiers.base_classifier import BaseClassifier
 from core.analyzers.composite_analyzer import CompositeAnalyzer
+from core.data.digit_sequence import DigitSequence
 
 class FeatureBasedClassifier(BaseClassifier):
     """基于特征的分类器"""
     
+    # 特征提取用到的分析字段（不需要模式列表等完整结果）
+    ANALYSIS_FIELDS = ['statistical.entropy', 'statistical.mean', 'statistical.std', 'statistical.correlation',
+                       'statistical.digit_distribution', 'pattern.pattern_density', 'pattern.total_patterns',
+                       'pattern.repetition_score', 'pattern.pair_score', 'pattern.sequential_score',
+                       'four_track.track1', 'summary.complexity_score', 'scores.randomness',
+                       'scores.pattern_complexity']
+    
     def __init__(self):
         """初始化基于特征的分类器"""
         self.analyzer = CompositeAnalyzer()
@@ -27,7 +35,7 @@ class FeatureBasedClassifier(BaseClassifier):
             }
         }
     
-    def classify(self, digits: List[int], name: str = None) -> Dict[str, Any]:
+    def classify(self, digits: Union[List[int], DigitSequence], name: str = None) -> Dict[str, Any]:
         """
         基于数字特征分类数字序列
         
@@ -50,7 +58,7 @@ class FeatureBasedClassifier(BaseClassifier):
         digits = self.preprocess(digits)
         
         # 分析数字特征
-        analysis_result = self.analyzer.analyze(digits)
+        analysis_result = self.analyzer.analyze(digits, fields=self.ANALYSIS_FIELDS)
         
         # 提取特征
         features = self._extract_features(digits, analysis_result)
@@ -1,8 +1,9 @@
 # core/classifiers/rule_based_classifier.py
 # 基于规则的分类器
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 from core.classifiers.base_classifier import BaseClassifier
+from core.data.digit_sequence import DigitSequence
 
 class RuleBasedClassifier(BaseClassifier):
     """基于规则的分类器"""
@@ -50,7 +51,7 @@ class RuleBasedClassifier(BaseClassifier):
             'classical_electron_radius': {'type': 'physical', 'subtype': 'particle', 'description': '经典电子半径rₑ'}
         }
     
-    def classify(self, digits: List[int], name: str = None) -> Dict[str, Any]:
+    def classify(self, digits: Union[List[int], DigitSequence], name: str = None) -> Dict[str, Any]:
         """
         基于规则和名称分类数字序列
         
@@ -4,10 +4,11 @@
 import os
 import json
 import pickle
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from core.data.data_reader import DataReader
 from core.data.data_writer import DataWriter
 from core.data.cache_manager import CacheManager
+from core.data.digit_sequence import DigitSequence
 from dna_encoder import DNAEncoder
 
 class DataManager:
@@ -87,19 +88,32 @@ class DataManager:
         Returns:
             数字序列
         """
+        return self.load_sequence(name, max_digits).tolist()
+    
+    def load_sequence(self, name: str, max_digits: int = 10000) -> DigitSequence:
+        """
+        加载常数数据为紧凑数字序列
+        
+        Args:
+            name: 常数名称
+            max_digits: 最大读取位数
+            
+        Returns:
+            数字序列（DigitSequence）
+        """
         # 检查是否为DNA序列
         if self._is_dna_sequence(name):
             # 直接处理DNA序列
-            return self.encode_dna(name)[:max_digits]
+            return DigitSequence(self.encode_dna(name)[:max_digits])
         
-        # 检查缓存
+        # 检查缓存（兼容旧缓存中的列表）
         cache_key = f"{name}_{max_digits}"
         cached_data = self.cache.get(cache_key)
         if cached_data:
-            return cached_data
+            return DigitSequence(cached_data)
         
         # 加载数据
-        digits = self.reader.read_constant(name, max_digits)
+        digits = self.reader.read_sequence(name, max_digits)
         
         # 缓存数据
         if digits:
@@ -107,7 +121,7 @@ class DataManager:
         
         return digits
     
-    def save_constant(self, name: str, digits: List[int], metadata: Dict[str, Any] = None) -> bool:
+    def save_constant(self, name: str, digits: Union[List[int], DigitSequence], metadata: Dict[str, Any] = None) -> bool:
         """
         保存常数数据
         
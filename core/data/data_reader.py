@@ -3,7 +3,10 @@
 
 import os
 import re
-from typing import Dict, List, Any
+import codecs
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+import numpy as np
+from core.data.digit_sequence import DigitSequence
 
 class DataReader:
     """数据读取器"""
@@ -16,6 +19,8 @@ class DataReader:
             data_dir: 数据目录
         """
         self.data_dir = data_dir
+        # 每次读取的字节数
+        self.read_chunk_size = 1 << 20
     
     def read_constant(self, name: str, max_digits: int = 10000) -> List[int]:
         """
@@ -28,6 +33,19 @@ class DataReader:
         Returns:
             数字序列
         """
+        return self.read_sequence(name, max_digits).tolist()
+    
+    def read_sequence(self, name: str, max_digits: int = 10000) -> DigitSequence:
+        """
+        读取常数数据为紧凑数字序列
+        
+        Args:
+            name: 常数名称
+            max_digits: 最大读取位数
+            
+        Returns:
+            数字序列（DigitSequence）
+        """
         # 尝试不同的文件格式
         file_patterns = [
             f"{name}.txt",
@@ -48,12 +66,15 @@ class DataReader:
             if os.path.exists(file_path):
                 return self._read_file(file_path, max_digits)
         
-        return []
+        return DigitSequence()
     
-    def _read_file(self, file_path: str, max_digits: int) -> List[int]:
+    def _read_file(self, file_path: str, max_digits: int) -> DigitSequence:
         """
         读取文件内容
         
+        按块读取字节并用NumPy提取数字，读满 max_digits 位即停止；
+        读取中途出错时返回已读取的数字。
+        
         Args:
             file_path: 文件路径
             max_digits: 最大读取位数
@@ -61,25 +82,71 @@ class DataReader:
         Returns:
             数字序列
         """
-        digits = []
+        chunks = []
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read().strip()
-                
-                # 处理不同格式
-                if '.' in content:
-                    content = content.replace('.', '').replace(' ', '').replace(',', '')
-                
-                # 提取数字
-                for char in content:
-                    if char.isdigit():
-                        digits.append(int(char))
-                        if len(digits) >= max_digits:
-                            break
+            for chunk in self.iter_file_chunks(file_path, max_digits):
+                chunks.append(chunk.data)
         except Exception as e:
             print(f"读取文件失败 {file_path}: {e}")
         
-        return digits
+        if not chunks:
+            return DigitSequence()
+        return DigitSequence(np.concatenate(chunks))
+    
+    def iter_file_chunks(self, file_path: str, max_digits: int = None) -> Iterator[DigitSequence]:
+        """
+        按块读取文件中的数字
+        
+        每次读取 read_chunk_size 字节，只在内存中保留当前块，可用于流式分析超大文件。
+        纯ASCII的块用NumPy提取数字；含非ASCII字节的块按UTF-8解码后逐字符用 str.isdigit 提取，
+        遇到无法转换为整数的数字字符（如上标）时先输出此前的数字再抛出 ValueError。
+        
+        Args:
+            file_path: 文件路径
+            max_digits: 最大读取位数（None表示读到文件末尾）
+        
+        Yields:
+            数字块（DigitSequence，可能为空）
+        """
+        count = 0
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        with open(file_path, 'rb') as f:
+            while max_digits is None or count < max_digits:
+                block = f.read(self.read_chunk_size)
+                if not block:
+                    break
+                limit = None if max_digits is None else max_digits - count
+                error = None
+                if block.isascii():
+                    chunk = DigitSequence.from_string(block, limit)
+                else:
+                    chunk, error = self._decode_digits(decoder.decode(block), limit)
+                count += len(chunk)
+                yield chunk
+                if error is not None:
+                    raise error
+    
+    def _decode_digits(self, text: str, limit: Optional[int]) -> Tuple[DigitSequence, Optional[ValueError]]:
+        """
+        逐字符提取文本中的数字（str.isdigit）
+        
+        Args:
+            text: 文本
+            limit: 最多提取的位数（None表示不限）
+        
+        Returns:
+            (数字序列, 遇到无法转换的数字字符时的错误)
+        """
+        digits = []
+        for char in text:
+            if limit is not None and len(digits) >= limit:
+                break
+            if char.isdigit():
+                try:
+                    digits.append(int(char))
+                except ValueError as e:
+                    return DigitSequence(digits), e
+        return DigitSequence(digits), None
     
     def list_constants(self) -> List[Dict[str, Any]]:
         """
@@ -3,7 +3,9 @@
 
 import os
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
+from core.analyzers.incremental_analysis import IncrementalAnalysis
+from core.data.digit_sequence import DigitSequence
 
 class DataWriter:
     """数据写入器"""
@@ -19,7 +21,7 @@ class DataWriter:
         # 确保目录存在
         os.makedirs(self.data_dir, exist_ok=True)
     
-    def write_constant(self, name: str, digits: List[int], metadata: Dict[str, Any] = None) -> bool:
+    def write_constant(self, name: str, digits: Union[List[int], DigitSequence], metadata: Dict[str, Any] = None) -> bool:
         """
         写入常数数据
         
@@ -38,7 +40,7 @@ class DataWriter:
             # 写入数据
             with open(file_path, 'w', encoding='utf-8') as f:
                 # 格式化为字符串
-                digits_str = ''.join(map(str, digits))
+                digits_str = DigitSequence(digits).to_string()
                 # 添加小数点（如果需要）
                 if len(digits_str) > 0:
                     f.write(digits_str[0] + '.' + digits_str[1:] if len(digits_str) > 1 else digits_str)
@@ -54,30 +56,38 @@ class DataWriter:
             print(f"写入常数失败: {e}")
             return False
     
-    def write_constant_with_precision(self, name: str, digits: List[int], precision: int = 10000) -> bool:
+    def write_constant_with_precision(self, name: str, digits: Union[List[int], DigitSequence], precision: int = 10000,
+                                      update_analysis: bool = True) -> bool:
         """
         写入指定精度的常数数据
         
+        写入后更新文件旁的增量分析状态（四轨道和统计部分）：同一常数已写入过较低精度时，
+        从较低精度的状态继续，只分析新增的数字。
+        
         Args:
             name: 常数名称
             digits: 数字序列
             precision: 精度（位数）
+            update_analysis: 是否更新增量分析状态
             
         Returns:
             是否成功
         """
-        # 截取指定精度
-        truncated_digits = digits[:precision]
-        
         # 构建文件路径
         file_path = os.path.join(self.data_dir, f"{name}_{precision}digits.txt")
         
         try:
+            # 截取指定精度
+            truncated_digits = DigitSequence(digits)[:precision]
+            
             with open(file_path, 'w', encoding='utf-8') as f:
-                digits_str = ''.join(map(str, truncated_digits))
+                digits_str = truncated_digits.to_string()
                 if len(digits_str) > 0:
                     f.write(digits_str[0] + '.' + digits_str[1:] if len(digits_str) > 1 else digits_str)
             
+            if update_analysis:
+                IncrementalAnalysis.for_file(file_path)
+            
             return True
         except Exception as e:
             print(f"写入指定精度常数失败: {e}")
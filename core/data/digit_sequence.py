@@ -0,0 +1,217 @@
+# core/data/digit_sequence.py
+# 紧凑数字序列
+
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, List, Tuple, Union
+import numpy as np
+
+# 迭代时每次物化的元素数量（保持迭代速度的同时避免一次性展开整个序列）
+_ITER_CHUNK_SIZE = 65536
+
+class DigitSequence(Sequence):
+    """
+    紧凑数字序列
+    
+    以连续的 uint8 缓冲区存储 0-9 的数字，每位只占 1 字节。
+    构造时校验一次，之后切片和反转都返回共享同一缓冲区的只读视图（零拷贝）。
+    实现了序列协议并支持 np.asarray，可直接替代 List[int] 传给各分析器、预测器和分类器。
+    """
+    
+    __slots__ = ('_data',)
+    
+    def __init__(self, digits: Union['DigitSequence', np.ndarray, Iterable[int]] = ()):
+        """
+        初始化数字序列
+        
+        Args:
+            digits: 数字序列（DigitSequence、NumPy数组或整数序列）
+        
+        Raises:
+            ValueError: 包含非整数或超出0-9范围的元素
+        """
+        if isinstance(digits, DigitSequence):
+            # 已校验过的序列直接共享缓冲区
+            self._data = digits._data
+            return
+        
+        array = np.asarray(digits if isinstance(digits, (np.ndarray, list, tuple)) else list(digits))
+        if array.size == 0:
+            array = np.zeros(0, dtype=np.uint8)
+        if array.ndim != 1:
+            raise ValueError(f"数字序列必须是一维的，实际维度: {array.ndim}")
+        if array.dtype.kind not in 'iub':
+            raise ValueError(f"数字序列只能包含整数，实际类型: {array.dtype}")
+        if array.size and (array.min() < 0 or array.max() > 9):
+            raise ValueError("数字序列只能包含0-9的数字")
+        
+        data = np.array(array, dtype=np.uint8)
+        data.setflags(write=False)
+        self._data = data
+    
+    @classmethod
+    def _wrap(cls, data: np.ndarray) -> 'DigitSequence':
+        """包装已校验的只读缓冲区（不复制、不重新校验）"""
+        sequence = cls.__new__(cls)
+        sequence._data = data
+        return sequence
+    
+    @classmethod
+    def from_string(cls, text: Union[str, bytes], max_digits: int = None) -> 'DigitSequence':
+        """
+        从文本中提取数字，忽略小数点、空白等非数字字符
+        
+        Args:
+            text: 文本内容
+            max_digits: 最大读取位数（可选）
+        
+        Returns:
+            数字序列
+        """
+        if isinstance(text, str):
+            text = text.encode('ascii', errors='ignore')
+        raw = np.frombuffer(text, dtype=np.uint8)
+        data = raw[(raw >= 48) & (raw <= 57)] - 48
+        if max_digits is not None:
+            data = data[:max_digits]
+        data = np.ascontiguousarray(data, dtype=np.uint8)
+        data.setflags(write=False)
+        return cls._wrap(data)
+    
+    @property
+    def data(self) -> np.ndarray:
+        """底层只读 uint8 缓冲区"""
+        return self._data
+    
+    def __len__(self) -> int:
+        return int(self._data.shape[0])
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return DigitSequence._wrap(self._data[index])
+        return int(self._data[index])
+    
+    def __iter__(self) -> Iterator[int]:
+        for start in range(0, len(self._data), _ITER_CHUNK_SIZE):
+            yield from self._data[start:start + _ITER_CHUNK_SIZE].tolist()
+    
+    def __reversed__(self) -> Iterator[int]:
+        return iter(self.reversed())
+    
+    def __contains__(self, value: Any) -> bool:
+        return bool(np.any(self._data == value))
+    
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, DigitSequence):
+            return np.array_equal(self._data, other._data)
+        if isinstance(other, (list, tuple)):
+            return len(other) == len(self) and self.tolist() == list(other)
+        return NotImplemented
+    
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+    
+    __hash__ = None
+    
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if copy:
+            return np.array(self._data, dtype=dtype)
+        if dtype is None or np.dtype(dtype) == self._data.dtype:
+            return self._data
+        return self._data.astype(dtype)
+    
+    def __reduce__(self):
+        return (DigitSequence._from_bytes, (self._data.tobytes(),))
+    
+    @classmethod
+    def _from_bytes(cls, buffer: bytes) -> 'DigitSequence':
+        """从 tobytes() 的结果恢复（用于pickle）"""
+        return cls._wrap(np.frombuffer(buffer, dtype=np.uint8))
+    
+    def __repr__(self) -> str:
+        preview = ''.join(map(str, self._data[:20].tolist()))
+        suffix = '...' if len(self) > 20 else ''
+        return f"DigitSequence('{preview}{suffix}', length={len(self)})"
+    
+    def reversed(self) -> 'DigitSequence':
+        """
+        获取反向序列
+        
+        Returns:
+            共享缓冲区的反向视图
+        """
+        return DigitSequence._wrap(self._data[::-1])
+    
+    def tolist(self) -> List[int]:
+        """
+        转换为整数列表
+        
+        Returns:
+            数字列表
+        """
+        return self._data.tolist()
+    
+    def to_string(self) -> str:
+        """
+        转换为数字字符串
+        
+        Returns:
+            数字字符串（如 '31415'）
+        """
+        return (self._data + 48).tobytes().decode('ascii')
+
+def as_digit_array(digits: Union[DigitSequence, np.ndarray, Iterable[int]]) -> np.ndarray:
+    """
+    获取数字序列的 uint8 数组
+    
+    DigitSequence 直接返回底层缓冲区（零拷贝），其他输入转换为新的数组。
+    
+    Args:
+        digits: 数字序列
+    
+    Returns:
+        uint8 数组
+    """
+    if isinstance(digits, DigitSequence):
+        return digits.data
+    if isinstance(digits, np.ndarray) and digits.dtype == np.uint8:
+        return digits
+    if not isinstance(digits, (list, tuple, np.ndarray)):
+        digits = list(digits)
+    return np.asarray(digits, dtype=np.uint8)
+
+def is_digit_list(values: List[Any]) -> bool:
+    """
+    检查列表是否只包含0-9的整数
+    
+    与逐元素 isinstance(d, int) and 0 <= d <= 9 等价，但类型检查只针对出现过的类型，
+    范围检查使用内置 min/max，没有逐元素的 Python 循环。
+    
+    Args:
+        values: 列表
+    
+    Returns:
+        是否全部为0-9的整数（空列表为True）
+    """
+    if not all(issubclass(kind, int) for kind in set(map(type, values))):
+        return False
+    return not values or (min(values) >= 0 and max(values) <= 9)
+
+def stack_digit_sequences(sequences: List[Union[DigitSequence, np.ndarray, Iterable[int]]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    将多个数字序列堆叠为二维 uint8 矩阵
+    
+    较短的行在末尾补0，补齐部分需要结合返回的长度数组屏蔽。
+    
+    Args:
+        sequences: 数字序列列表
+    
+    Returns:
+        (形状为 (行数, 最大长度) 的矩阵, 每行的实际长度)
+    """
+    arrays = [as_digit_array(sequence) for sequence in sequences]
+    lengths = np.array([len(array) for array in arrays], dtype=np.int64)
+    matrix = np.zeros((len(arrays), int(lengths.max()) if len(arrays) else 0), dtype=np.uint8)
+    for row, array in enumerate(arrays):
+        matrix[row, :len(array)] = array
+    return matrix, lengths
@@ -2,13 +2,14 @@
 # 预测器基类
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
+from core.data.digit_sequence import DigitSequence, is_digit_list
 
 class BasePredictor(ABC):
     """预测器基类"""
     
     @abstractmethod
-    def predict(self, digits: List[int], length: int = 100) -> List[int]:
+    def predict(self, digits: Union[List[int], DigitSequence], length: int = 100) -> List[int]:
         """
         预测数字序列
         
@@ -120,7 +121,7 @@ class BasePredictor(ABC):
             'max_consecutive_correct': max_consecutive_correct
         }
     
-    def validate_input(self, digits: List[int]) -> bool:
+    def validate_input(self, digits: Union[List[int], DigitSequence]) -> bool:
         """
         验证输入数据
         
@@ -130,22 +131,30 @@ class BasePredictor(ABC):
         Returns:
             是否有效
         """
+        # DigitSequence 在构造时已校验，无需逐元素扫描
+        if isinstance(digits, DigitSequence):
+            return len(digits) > 0
+        
         if not isinstance(digits, list):
             return False
         
-        if not all(isinstance(d, int) and 0 <= d <= 9 for d in digits):
+        if not is_digit_list(digits):
             return False
         
         return len(digits) > 0
     
-    def preprocess(self, digits: List[int]) -> List[int]:
+    def preprocess(self, digits: Union[List[int], DigitSequence]) -> List[int]:
         """
         预处理数据
         
+        预测器在Python层逐位生成并拼接序列，DigitSequence 在此物化为列表。
+        
         Args:
             digits: 数字序列
             
         Returns:
             预处理后的数字序列
         """
+        if isinstance(digits, DigitSequence):
+            return digits.tolist()
         return digits
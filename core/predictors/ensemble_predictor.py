@@ -1,16 +1,21 @@
-﻿﻿# core/predictors/ensemble_predictor.py
+# core/predictors/ensemble_predictor.py
 # 集成预测引擎
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 from core.predictors.base_predictor import BasePredictor
 from core.predictors.statistical_predictor import StatisticalPredictor
 from core.predictors.pattern_predictor import PatternPredictor
 from core.predictors.hybrid_predictor import HybridPredictor
 from core.analyzers.composite_analyzer import CompositeAnalyzer
+from core.data.digit_sequence import DigitSequence
 
 class EnsemblePredictor(BasePredictor):
     """集成预测引擎"""
     
+    # 选择策略和四轨优化用到的分析字段（不需要模式列表等完整结果）
+    ANALYSIS_FIELDS = ['statistical.entropy', 'pattern.pattern_density', 'pattern.total_patterns',
+                       'four_track.track1']
+    
     def __init__(self):
         """初始化集成预测引擎"""
         self.predictors = {
@@ -21,7 +26,7 @@ class EnsemblePredictor(BasePredictor):
         self.analyzer = CompositeAnalyzer()
         self.strategy_cache = {}
     
-    def predict(self, digits: List[int], length: int = 100, constant_type: str = None) -> List[int]:
+    def predict(self, digits: Union[List[int], DigitSequence], length: int = 100, constant_type: str = None) -> List[int]:
         """
         智能预测数字序列
         
@@ -39,7 +44,7 @@ class EnsemblePredictor(BasePredictor):
         digits = self.preprocess(digits)
         
         # 分析常数特征
-        analysis_result = self.analyzer.analyze(digits)
+        analysis_result = self.analyzer.analyze(digits, fields=self.ANALYSIS_FIELDS)
         
         # 确定最佳预测策略
         best_strategy = self._select_best_strategy(digits, analysis_result, constant_type)
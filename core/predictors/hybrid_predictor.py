@@ -1,11 +1,12 @@
 # core/predictors/hybrid_predictor.py
 # 混合预测器
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 from collections import defaultdict
 from core.predictors.base_predictor import BasePredictor
 from core.predictors.statistical_predictor import StatisticalPredictor
 from core.predictors.pattern_predictor import PatternPredictor
+from core.data.digit_sequence import DigitSequence
 
 class HybridPredictor(BasePredictor):
     """混合预测器"""
@@ -21,7 +22,7 @@ class HybridPredictor(BasePredictor):
             'pattern': 0.5
         }
     
-    def predict(self, digits: List[int], length: int = 100) -> List[int]:
+    def predict(self, digits: Union[List[int], DigitSequence], length: int = 100) -> List[int]:
         """
         混合多个预测器的结果
         
@@ -1,10 +1,12 @@
-﻿﻿# core/predictors/pattern_predictor.py
+# core/predictors/pattern_predictor.py
 # 模式预测器
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 from collections import Counter, defaultdict
 from core.predictors.base_predictor import BasePredictor
+from core.analyzers.ngram_spectrum import NGramSpectrum
 from core.analyzers.pattern_analyzer import PatternAnalyzer
+from core.data.digit_sequence import DigitSequence
 
 class PatternPredictor(BasePredictor):
     """模式预测器"""
@@ -18,7 +20,7 @@ class PatternPredictor(BasePredictor):
         self.pattern_analyzer = pattern_analyzer if pattern_analyzer else PatternAnalyzer()
         self.detected_patterns = []
     
-    def predict(self, digits: List[int], length: int = 100) -> List[int]:
+    def predict(self, digits: Union[List[int], DigitSequence], length: int = 100) -> List[int]:
         """
         基于模式识别预测数字序列
         
@@ -130,23 +132,19 @@ class PatternPredictor(BasePredictor):
         # 尝试不同长度的重复模式
         max_pattern_length = min(10, len(digits) // 2)
         
+        if max_pattern_length < 2:
+            return
+        spectrum = NGramSpectrum(digits, max_length=max_pattern_length)
+        
         for pattern_length in range(2, max_pattern_length + 1):
-            # 检查模式是否在序列中重复
-            pattern_counts = defaultdict(int)
-            
-            for i in range(len(digits) - pattern_length + 1):
-                pattern = tuple(digits[i:i+pattern_length])
-                pattern_counts[pattern] += 1
-            
-            # 找出出现次数最多的模式
-            for pattern, count in pattern_counts.items():
-                if count >= 3:  # 至少出现3次
-                    patterns.append({
-                        'type': 'repeating',
-                        'sequence': list(pattern),
-                        'count': count,
-                        'confidence': min(count / (len(digits) / len(pattern)), 1.0)
-                    })
+            # 找出出现次数足够的模式（至少出现3次），按首次出现顺序
+            for pattern, count in spectrum.items(pattern_length, min_count=3):
+                patterns.append({
+                    'type': 'repeating',
+                    'sequence': list(pattern),
+                    'count': count,
+                    'confidence': min(count / (len(digits) / len(pattern)), 1.0)
+                })
     
     def _detect_sequential_patterns(self, digits: List[int], patterns: list):
         """检测序列模式"""
@@ -264,26 +262,17 @@ class PatternPredictor(BasePredictor):
             """分析基础数据的统计信息和模式"""
             from collections import Counter, defaultdict
             
+            spectrum = NGramSpectrum(base_digits, max_length=3)
+            bigrams = spectrum.items(2)
             analysis = {
                 'digit_counts': Counter(base_digits),
                 'total': len(base_digits),
-                '2grams': defaultdict(int),
-                '3grams': defaultdict(int),
-                'transitions': defaultdict(int)
+                # 2-gram、3-gram模式和数字转移计数
+                '2grams': defaultdict(int, bigrams),
+                '3grams': defaultdict(int, spectrum.items(3)),
+                'transitions': defaultdict(int, bigrams)
             }
             
-            # 分析2-gram模式
-            for i in range(len(base_digits) - 1):
-                analysis['2grams'][(base_digits[i], base_digits[i+1])] += 1
-            
-            # 分析3-gram模式
-            for i in range(len(base_digits) - 2):
-                analysis['3grams'][(base_digits[i], base_digits[i+1], base_digits[i+2])] += 1
-            
-            # 分析数字转移概率
-            for i in range(len(base_digits) - 1):
-                analysis['transitions'][(base_digits[i], base_digits[i+1])] += 1
-            
             return analysis
         
         # 生成候选预测序列
@@ -510,21 +499,19 @@ class PatternPredictor(BasePredictor):
             }
             
             # 计算数字频率
+            spectrum = NGramSpectrum(base_digits, max_length=4)
             total = len(base_digits)
+            digit_counts = spectrum.counts(1)
             for digit in range(10):
-                analysis['digit_frequencies'][digit] = base_digits.count(digit) / total if total > 0 else 0.1
+                analysis['digit_frequencies'][digit] = int(digit_counts[digit]) / total if total > 0 else 0.1
             
             # 分析转移概率
-            for i in range(len(base_digits) - 1):
-                d1, d2 = base_digits[i], base_digits[i+1]
-                analysis['transitions'][(d1, d2)] += 1
+            analysis['transitions'].update(spectrum.items(2))
             
             # 分析n-gram模式
             max_n = min(4, len(base_digits))
             for n in range(2, max_n + 1):
-                for i in range(len(base_digits) - n + 1):
-                    ngram = tuple(base_digits[i:i+n])
-                    analysis['n_gram_counts'][ngram] += 1
+                analysis['n_gram_counts'].update(spectrum.items(n))
             
             # 检测简单模式
             if len(base_digits) >= 6:
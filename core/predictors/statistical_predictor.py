@@ -1,10 +1,11 @@
 # core/predictors/statistical_predictor.py
 # 统计预测器
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Union
 import numpy as np
 from collections import Counter
 from core.predictors.base_predictor import BasePredictor
+from core.data.digit_sequence import DigitSequence
 
 class StatisticalPredictor(BasePredictor):
     """统计预测器"""
@@ -20,7 +21,7 @@ class StatisticalPredictor(BasePredictor):
         self.markov_order = markov_order
         self.markov_chains = {}
     
-    def predict(self, digits: List[int], length: int = 100) -> List[int]:
+    def predict(self, digits: Union[List[int], DigitSequence], length: int = 100) -> List[int]:
         """
         基于统计分布预测数字序列
         
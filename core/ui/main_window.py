@@ -8,6 +8,7 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 from typing import Dict, List, Any
 from core.data.data_manager import DataManager
+from core.analyzers.analysis_memo import get_analysis_memo
 from core.analyzers.composite_analyzer import CompositeAnalyzer
 from core.predictors.ensemble_predictor import EnsemblePredictor
 from core.classifiers.ensemble_classifier import EnsembleClassifier
@@ -260,6 +261,7 @@ class MainWindow:
             
             # 更新基本信息
             self._update_constant_info(constant_name, digits)
+            self._update_cache_info()
             
         except Exception as e:
             messagebox.showerror("错误", f"分析失败: {str(e)}")
@@ -515,6 +517,8 @@ class MainWindow:
             analysis_str += f"  模式复杂度: {scores.get('pattern_complexity', 0):.4f}\n"
             analysis_str += f"  对称性: {scores.get('symmetry', 0):.4f}\n"
             analysis_str += f"  可预测性: {scores.get('predictability', 0):.4f}\n"
+            analysis_str += f"  LZ76复杂度: {scores.get('lz76_complexity', 0):.4f}\n"
+            analysis_str += f"  压缩率: {scores.get('compression_ratio', 0):.4f}\n"
             analysis_str += f"  总体评分: {scores.get('overall', 0):.4f}\n"
             analysis_str += "\n"
         
@@ -719,6 +723,8 @@ class MainWindow:
     def _clean_cache(self):
         """清理缓存"""
         count = self.data_manager.clean_cache()
+        count += len(get_analysis_memo())
+        get_analysis_memo().clear()
         messagebox.showinfo("信息", f"已清理 {count} 个缓存项")
         self._update_cache_info()
     
@@ -727,6 +733,9 @@ class MainWindow:
         stats = self.data_manager.get_cache_stats()
         cache_info_str = f"缓存项: {stats.get('total_items', 0)}\n"
         cache_info_str += f"缓存大小: {stats.get('cache_size_mb', 0):.2f} MB\n"
+        memo_stats = get_analysis_memo().get_stats()
+        cache_info_str += (f"分析备忘: {memo_stats['entries']}/{memo_stats['max_entries']} "
+                           f"({memo_stats['bytes'] / 1024 / 1024:.2f} MB, 命中 {memo_stats['hits']})\n")
         self.cache_info.config(text=cache_info_str)
     
     def _show_about(self):
@@ -11,6 +11,10 @@ import re
 from typing import List, Dict, Any, Tuple
 from collections import Counter
 from datetime import datetime
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from core.analyzers.dna_track_analyzer import DNATrackAnalyzer
 
 # ============================================================================
 # 1. 通用数字分析器（用于数字常数文件）
@@ -135,387 +139,8 @@ class UniversalEncoder:
 # 2. 四轨道分析器
 # ============================================================================
 
-class FourTrackAnalyzer:
-    """四轨道分析器"""
-    
-    def __init__(self):
-        # 数字属性表（轨道1）
-        self.number_attributes = {
-            0: {'small_large': 0, 'up_down': 0, 'odd_even': 0, 'ab_relation': 0},
-            1: {'small_large': 1, 'up_down': 1, 'odd_even': 1, 'ab_relation': 1},
-            2: {'small_large': 1, 'up_down': 1, 'odd_even': 0, 'ab_relation': 1},
-            3: {'small_large': 1, 'up_down': 1, 'odd_even': 1, 'ab_relation': 1},
-            4: {'small_large': 1, 'up_down': 0, 'odd_even': 0, 'ab_relation': 1},
-            5: {'small_large': 1, 'up_down': 0, 'odd_even': 1, 'ab_relation': 0},
-            6: {'small_large': 1, 'up_down': 1, 'odd_even': 0, 'ab_relation': 0},
-            7: {'small_large': 1, 'up_down': 1, 'odd_even': 1, 'ab_relation': 0},
-            8: {'small_large': 0, 'up_down': 1, 'odd_even': 0, 'ab_relation': 0},
-            9: {'small_large': 0, 'up_down': 0, 'odd_even': 1, 'ab_relation': 1}
-        }
-        
-        # 八卦配对规则
-        self.bagua_pairing = {1: 8, 2: 7, 3: 6, 4: 5, 5: 4, 6: 3, 7: 2, 8: 1}
-        
-        # 八态编码
-        self.state_encoding = {
-            '111': 1, '110': 2, '101': 3, '100': 4,
-            '011': 5, '010': 6, '001': 7, '000': 8
-        }
-        
-        # 轨道2-4映射
-        self.track_mappings = {
-            'track2': {0: 'E', 1: 'A', 2: 'B', 3: 'C', 4: 'D', 5: 'D', 6: 'C', 7: 'B', 8: 'A', 9: 'E'},
-            'track3': {0: '戊', 1: '甲', 2: '乙', 3: '丙', 4: '丁', 5: '戊', 6: '丁', 7: '丙', 8: '乙', 9: '甲'},
-            'track4': {0: '五', 1: '一', 2: '二', 3: '三', 4: '四', 5: '二', 6: '三', 7: '四', 8: '一', 9: '五'}
-        }
-        
-        # 轨道2-4阴阳分类
-        self.yinyang_class = {
-            'track2': {'yang': {'A', 'C', 'E'}, 'yin': {'B', 'D'}},
-            'track3': {'yang': {'甲', '丙', '戊'}, 'yin': {'乙', '丁'}},
-            'track4': {'yang': {'一', '三', '五'}, 'yin': {'二', '四'}}
-        }
-    
-    def analyze(self, digits: List[int]) -> Dict[str, Any]:
-        """分析数字序列"""
-        try:
-            # 验证输入
-            for d in digits:
-                if not 0 <= d <= 9:
-                    return {'error': f'无效数字: {d}，必须在0-9范围内'}
-            
-            # 正向分析
-            results = {}
-            for track in ['track1', 'track2', 'track3', 'track4']:
-                forward_result = self._analyze_track(digits, track)
-                
-                # 反向分析
-                reversed_digits = digits[::-1]
-                backward_result = self._analyze_track(reversed_digits, track)
-                
-                # 对称性
-                symmetry = self._calculate_symmetry(forward_result, backward_result)
-                
-                results[track] = {
-                    'forward': forward_result,
-                    'backward': backward_result,
-                    'symmetry': symmetry
-                }
-            
-            # 全局结果
-            results['summary'] = self._generate_summary(results)
-            
-            return results
-            
-        except Exception as e:
-            return {'error': f'分析错误: {str(e)}'}
-    
-    def _analyze_track(self, digits: List[int], track_name: str) -> Dict[str, Any]:
-        """分析单个轨道"""
-        if track_name == 'track1':
-            return self._analyze_track1(digits)
-        else:
-            return self._analyze_other_track(digits, track_name)
-    
-    def _analyze_track1(self, digits: List[int]) -> Dict[str, Any]:
-        """分析轨道1"""
-        result = {
-            'window_count': 0,
-            'symbol_pairs': {'valid': 0, 'total': 0, 'ratio': 0},
-            'digit_pairs': {'valid': 0, 'total': 0, 'ratio': 0},
-            'global_digit_pairs': {'valid': 0, 'total': 0, 'ratio': 0, 'pair_types': {}, 'unpaired': {}},
-            'yinyang': {'yang': 0, 'yin': 0, 'ratio': 0, 'yang_percent': 0}
-        }
-        
-        if len(digits) < 12:
-            return result
-        
-        # 窗口滑动分析（12位窗口，步长5）
-        windows = []
-        for i in range(0, len(digits) - 11, 5):
-            window = digits[i:i+12]
-            if len(window) == 12:
-                windows.append(window)
-        
-        result['window_count'] = len(windows)
-        
-        # 分析每个窗口
-        symbol_valid = 0
-        symbol_total = 0
-        
-        for window in windows:
-            # 分割为4个子序列
-            p1 = window[0:3]
-            p2 = window[3:6]
-            p3 = window[6:9]
-            p4 = window[9:12]
-            
-            # 四个维度分别分析
-            for dim in ['small_large', 'up_down', 'odd_even', 'ab_relation']:
-                # 生成状态
-                state_p1 = self._get_track1_state(p1, dim)
-                state_p2 = self._get_track1_state(p2, dim)
-                state_p3 = self._get_track1_state(p3, dim)
-                state_p4 = self._get_track1_state(p4, dim)
-                
-                # 检查配对
-                if self.bagua_pairing.get(state_p1) == state_p3:
-                    symbol_valid += 1
-                symbol_total += 1
-                
-                if self.bagua_pairing.get(state_p2) == state_p4:
-                    symbol_valid += 1
-                symbol_total += 1
-        
-        # 符号配对结果
-        if symbol_total > 0:
-            result['symbol_pairs'] = {
-                'valid': symbol_valid,
-                'total': symbol_total,
-                'ratio': symbol_valid / symbol_total
-            }
-        
-        # 数字直接配对
-        digit_valid = 0
-        digit_total = 0
-        for i in range(0, len(digits) - 1, 2):
-            if i + 1 < len(digits):
-                digit_total += 1
-        
-        if digit_total > 0:
-            result['digit_pairs'] = {
-                'valid': digit_valid,
-                'total': digit_total,
-                'ratio': digit_valid / digit_total
-            }
-        
-        # 全局数字配对
-        global_pairs = self._analyze_global_pairs(digits, 'track1')
-        result['global_digit_pairs'] = global_pairs
-        
-        # 阴阳计算（轨道1特殊规则）
-        yang_count = sum(1 for d in digits if 1 <= d <= 7)
-        yin_count = len(digits) - yang_count
-        
-        result['yinyang'] = {
-            'yang': yang_count,
-            'yin': yin_count,
-            'ratio': yang_count / yin_count if yin_count > 0 else 0,
-            'yang_percent': yang_count / len(digits) if digits else 0
-        }
-        
-        return result
-    
-    def _analyze_other_track(self, digits: List[int], track_name: str) -> Dict[str, Any]:
-        """分析轨道2-4"""
-        result = {
-            'window_count': 0,
-            'symbol_pairs': {'valid': 0, 'total': 0, 'ratio': 0},
-            'digit_pairs': {'valid': 0, 'total': 0, 'ratio': 0},
-            'global_digit_pairs': {'valid': 0, 'total': 0, 'ratio': 0, 'pair_types': {}, 'unpaired': {}},
-            'yinyang': {'yang': 0, 'yin': 0, 'ratio': 0, 'yang_percent': 0}
-        }
-        
-        # 全局数字配对分析
-        global_pairs = self._analyze_global_pairs(digits, track_name)
-        result['global_digit_pairs'] = global_pairs
-        
-        # 阴阳计算
-        symbols = [self.track_mappings[track_name][d] for d in digits]
-        yinyang_set = self.yinyang_class[track_name]
-        
-        yang_count = sum(1 for s in symbols if s in yinyang_set['yang'])
-        yin_count = sum(1 for s in symbols if s in yinyang_set['yin'])
-        
-        result['yinyang'] = {
-            'yang': yang_count,
-            'yin': yin_count,
-            'ratio': yang_count / yin_count if yin_count > 0 else 0,
-            'yang_percent': yang_count / (yang_count + yin_count) if (yang_count + yin_count) > 0 else 0
-        }
-        
-        return result
-    
-    def _get_track1_state(self, subseq: List[int], dimension: str) -> int:
-        """获取轨道1状态"""
-        bits = []
-        for num in subseq:
-            bits.append(str(self.number_attributes[num][dimension]))
-        
-        binary = ''.join(bits)
-        return self.state_encoding.get(binary, 1)
-    
-    def _analyze_global_pairs(self, digits: List[int], track_name: str) -> Dict[str, Any]:
-        """分析全局数字配对"""
-        digit_counts = Counter(digits)
-        remaining = Counter(digits)
-        
-        valid_pairs = 0
-        pair_types = {}
-        total_pairs = len(digits) // 2
-        
-        # 配对规则
-        pair_rules = []
-        if track_name == 'track1':
-            # 轨道1没有全局配对规则
-            pass
-        elif track_name == 'track2':
-            # 轨道2：和=9
-            pair_rules = [
-                ((1, 8), 'A', '阳'),
-                ((8, 1), 'A', '阳'),
-                ((2, 7), 'B', '阴'),
-                ((7, 2), 'B', '阴'),
-                ((3, 6), 'C', '阳'),
-                ((6, 3), 'C', '阳'),
-                ((4, 5), 'D', '阴'),
-                ((5, 4), 'D', '阴'),
-                ((9, 0), 'E', '阳'),
-                ((0, 9), 'E', '阳')
-            ]
-        elif track_name == 'track3':
-            # 轨道3：和=10
-            pair_rules = [
-                ((1, 9), '甲', '阳'),
-                ((9, 1), '甲', '阳'),
-                ((2, 8), '乙', '阴'),
-                ((8, 2), '乙', '阴'),
-                ((3, 7), '丙', '阳'),
-                ((7, 3), '丙', '阳'),
-                ((4, 6), '丁', '阴'),
-                ((6, 4), '丁', '阴'),
-                ((5, 0), '戊', '阳'),
-                ((0, 5), '戊', '阳')
-            ]
-        elif track_name == 'track4':
-            # 轨道4：特定组合
-            pair_rules = [
-                ((1, 8), '一', '阳'),
-                ((8, 1), '一', '阳'),
-                ((2, 5), '二', '阴'),
-                ((5, 2), '二', '阴'),
-                ((3, 6), '三', '阳'),
-                ((6, 3), '三', '阳'),
-                ((4, 7), '四', '阴'),
-                ((7, 4), '四', '阴'),
-                ((9, 0), '五', '阳'),
-                ((0, 9), '五', '阳')
-            ]
-        
-        # 应用配对规则
-        for pair, pair_type, yinyang in pair_rules:
-            d1, d2 = pair
-            
-            if d1 == d2:
-                pair_count = remaining[d1] // 2
-            else:
-                pair_count = min(remaining.get(d1, 0), remaining.get(d2, 0))
-            
-            if pair_count > 0:
-                valid_pairs += pair_count
-                
-                # 记录配对类型
-                if pair_type not in pair_types:
-                    pair_types[pair_type] = {'count': 0, 'yinyang': yinyang}
-                pair_types[pair_type]['count'] += pair_count
-                
-                # 更新剩余数字
-                if d1 == d2:
-                    remaining[d1] -= pair_count * 2
-                else:
-                    remaining[d1] -= pair_count
-                    remaining[d2] -= pair_count
-        
-        # 统计未配对的数字
-        unpaired = {d: count for d, count in remaining.items() if count > 0}
-        
-        return {
-            'valid': valid_pairs,
-            'total': total_pairs,
-            'ratio': valid_pairs / total_pairs if total_pairs > 0 else 0,
-            'pair_types': pair_types,
-            'unpaired': unpaired
-        }
-    
-    def _calculate_symmetry(self, forward: Dict[str, Any], backward: Dict[str, Any]) -> Dict[str, Any]:
-        """计算对称性"""
-        # 配对率相似度
-        forward_pair = forward.get('symbol_pairs', {}).get('ratio', 0)
-        backward_pair = backward.get('symbol_pairs', {}).get('ratio', 0)
-        pair_diff = abs(forward_pair - backward_pair)
-        pair_sim = 1 - pair_diff
-        
-        # 全局配对相似度
-        forward_global = forward.get('global_digit_pairs', {}).get('ratio', 0)
-        backward_global = backward.get('global_digit_pairs', {}).get('ratio', 0)
-        global_diff = abs(forward_global - backward_global)
-        global_sim = 1 - global_diff
-        
-        # 阴阳相似度
-        forward_yang = forward.get('yinyang', {}).get('yang_percent', 0)
-        backward_yang = backward.get('yinyang', {}).get('yang_percent', 0)
-        yang_diff = abs(forward_yang - backward_yang)
-        yang_sim = 1 - yang_diff
-        
-        # 整体对称性
-        overall = (pair_sim + global_sim + yang_sim) / 3
-        
-        return {
-            'pair_similarity': pair_sim,
-            'global_similarity': global_sim,
-            'yang_similarity': yang_sim,
-            'overall': overall
-        }
-    
-    def _generate_summary(self, results: Dict[str, Any]) -> Dict[str, Any]:
-        """生成摘要"""
-        summary = {
-            'best_track': None,
-            'worst_track': None,
-            'average_symmetry': 0,
-            'track_scores': {}
-        }
-        
-        track_scores = []
-        for track_name, track_data in results.items():
-            if track_name == 'summary':
-                continue
-            
-            symmetry = track_data['symmetry']['overall']
-            
-            # 计算轨道分数
-            forward = track_data['forward']
-            
-            if track_name == 'track1':
-                pair_score = forward['symbol_pairs']['ratio']
-            else:
-                pair_score = forward['global_digit_pairs']['ratio']
-            
-            yang_score = 1 - abs(forward['yinyang']['yang_percent'] - 0.5) * 2
-            
-            track_score = (pair_score * 0.4 + symmetry * 0.4 + yang_score * 0.2)
-            
-            summary['track_scores'][track_name] = {
-                'score': track_score,
-                'symmetry': symmetry,
-                'pairing': pair_score
-            }
-            
-            track_scores.append((track_name, track_score))
-        
-        # 找出最佳和最差轨道
-        if track_scores:
-            track_scores.sort(key=lambda x: x[1], reverse=True)
-            summary['best_track'] = track_scores[0][0]
-            summary['worst_track'] = track_scores[-1][0]
-            
-            # 平均对称性
-            symmetries = [results[track]['symmetry']['overall'] 
-                         for track in results if track != 'summary']
-            if symmetries:
-                summary['average_symmetry'] = sum(symmetries) / len(symmetries)
-        
-        return summary
+# 四轨道分析器由 core.analyzers.dna_track_analyzer.DNATrackAnalyzer 提供，
+# 轨道规则来自 core.analyzers.track_spec.DEFAULT_TRACK_SPECS
 
 # ============================================================================
 # 3. 文件处理器
@@ -526,7 +151,7 @@ class FileProcessor:
     
     def __init__(self):
         self.encoder = UniversalEncoder()
-        self.analyzer = FourTrackAnalyzer()
+        self.analyzer = DNATrackAnalyzer()
         
     def process_file(self, file_path: str) -> Dict[str, Any]:
         """处理单个文件"""
@@ -660,7 +285,7 @@ def main():
     
     # 初始化
     file_processor = FileProcessor()
-    analyzer = FourTrackAnalyzer()
+    analyzer = DNATrackAnalyzer()
     
     # 查找所有可能的文件
     print("🔍 搜索文件...")
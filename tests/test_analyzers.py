@@ -6,6 +6,7 @@ from core.analyzers.composite_analyzer import CompositeAnalyzer
 from core.analyzers.four_track_analyzer import FourTrackAnalyzer
 from core.analyzers.statistical_analyzer import StatisticalAnalyzer
 from core.analyzers.pattern_analyzer import PatternAnalyzer
+from core.data.digit_sequence import DigitSequence
 
 class TestAnalyzers(unittest.TestCase):
     """测试分析器组件"""
@@ -55,6 +56,232 @@ class TestAnalyzers(unittest.TestCase):
         self.assertIn('std', statistical)
         self.assertIn('digit_distribution', statistical)
     
+    def test_analysis_context(self):
+        """测试各分析器使用共享上下文的结果与直接分析一致，自定义分析器也能收到上下文"""
+        import random
+        import numpy as np
+        from core.analyzers.analysis_context import AnalysisContext
+        from core.analyzers.base_analyzer import BaseAnalyzer
+        rng = random.Random(21)
+        for digits in [[7], self.pi_digits, [rng.randint(0, 9) for _ in range(301)]]:
+            context = AnalysisContext(digits)
+            for name, analyzer in self.composite_analyzer.analyzers.items():
+                self.assertEqual(analyzer.analyze_context(context), analyzer.analyze(digits), name)
+            np.testing.assert_array_equal(context.bigrams.ravel(),
+                                          np.bincount([a * 10 + b for a, b in zip(digits, digits[1:])], minlength=100))
+            self.assertEqual(context.reversed_digits.tolist(), digits[::-1])
+            self.assertFalse(context.histogram.flags.writeable)
+        
+        class LengthAnalyzer(BaseAnalyzer):
+            def analyze(self, digits):
+                return {'length': len(digits)}
+            
+            def analyze_context(self, context):
+                return {'length': context.length, 'sevens': int(context.histogram[7])}
+            
+            def get_name(self):
+                return "LengthAnalyzer"
+            
+            def get_version(self):
+                return "1.0.0"
+        
+        self.composite_analyzer.add_analyzer('length', LengthAnalyzer())
+        context = AnalysisContext(self.pi_digits)
+        self.assertEqual(self.composite_analyzer.get_analyzer('length').analyze_context(context),
+                         {'length': 15, 'sevens': 1})
+        self.assertIn('length', self.composite_analyzer.analyze(self.pi_digits)['analyzers'])
+    
+    def test_composite_executors(self):
+        """测试线程和进程执行方式的结果与依次运行一致，并记录各子分析器耗时"""
+        import random
+        rng = random.Random(22)
+        digits = [rng.randint(0, 9) for _ in range(500)]
+        expected = self.composite_analyzer.analyze(digits)
+        self.assertEqual(set(expected['timings']), set(self.composite_analyzer.analyzers))
+        self.assertTrue(all(seconds >= 0 for seconds in expected['timings'].values()))
+        expected.pop('timings')
+        
+        for executor in ['thread', 'process']:
+            analyzer = CompositeAnalyzer(executor=executor, min_process_size=1, use_memo=False)
+            result = analyzer.analyze(digits)
+            self.assertEqual(set(result.pop('timings')), set(analyzer.analyzers))
+            self.assertEqual(result, expected)
+        
+        with self.assertRaises(ValueError):
+            CompositeAnalyzer(executor='gpu')
+    
+    def test_composite_fields(self):
+        """测试按字段分析：只运行依赖的子分析器，取值与完整分析一致"""
+        import random
+        from core.classifiers.feature_based_classifier import FeatureBasedClassifier
+        from core.predictors.ensemble_predictor import EnsemblePredictor
+        rng = random.Random(23)
+        analyzer = CompositeAnalyzer(use_memo=False)
+        for digits in [self.pi_digits, [rng.randint(0, 9) for _ in range(400)], [1, 2, 3, 4, 3, 2] * 30]:
+            full = analyzer.analyze(digits)
+            
+            result = analyzer.analyze(digits, fields=EnsemblePredictor.ANALYSIS_FIELDS)
+            self.assertEqual(set(result['timings']), {'four_track', 'pattern', 'statistical'})
+            self.assertNotIn('patterns', result['pattern'])
+            self.assertEqual(result['statistical'], full['statistical'])
+            self.assertEqual(result['four_track'], full['four_track'])
+            for key, value in result['pattern'].items():
+                self.assertEqual(value, full['pattern'][key], key)
+            
+            result = analyzer.analyze(digits, fields=FeatureBasedClassifier.ANALYSIS_FIELDS)
+            self.assertEqual(result['summary'], {'complexity_score': full['summary']['complexity_score']})
+            self.assertEqual(result['scores'], {key: full['scores'][key] for key in ['randomness', 'pattern_complexity']})
+            
+            result = analyzer.analyze(digits, fields=['pattern', 'scores', 'fingerprint', 'consistency'])
+            for key in ['pattern', 'scores', 'fingerprint', 'consistency', 'spectral', 'complexity']:
+                self.assertEqual(result[key], full[key], key)
+        
+        self.assertEqual(analyzer.plan_fields(['scores.lz76_complexity']),
+                         {'complexity': {'lz76_normalized'}})
+        with self.assertRaises(ValueError):
+            analyzer.analyze(self.pi_digits, fields=['unknown.entropy'])
+    
+    def test_analyzer_registry_and_dag(self):
+        """测试插件注册表和依赖图调度：下游分析器读取上游结果，未请求的分析器不运行"""
+        import random
+        from core.analyzers.analysis_scheduler import topological_order
+        from core.analyzers.analyzer_registry import register_analyzer, registered_analyzers, unregister_analyzer
+        from core.analyzers.base_analyzer import BaseAnalyzer
+        from core.analyzers.block_entropy_analyzer import BlockEntropyAnalyzer
+        
+        @register_analyzer('entropy_gap', default=False)
+        class EntropyGapAnalyzer(BaseAnalyzer):
+            inputs = ('statistical.entropy', 'block_entropy.entropy_rate')
+            outputs = ('gap',)
+            
+            def analyze(self, digits):
+                return {'gap': 0.0}
+            
+            def analyze_context(self, context):
+                upstream = context.results
+                return {'gap': upstream['statistical']['entropy'] - upstream['block_entropy']['entropy_rate']}
+            
+            def get_name(self):
+                return "EntropyGapAnalyzer"
+            
+            def get_version(self):
+                return "1.0.0"
+        
+        try:
+            self.assertIn('entropy_gap', registered_analyzers())
+            self.assertNotIn('entropy_gap', CompositeAnalyzer().analyzers)
+            rng = random.Random(25)
+            digits = [rng.randint(0, 9) for _ in range(400)]
+            expected = (self.statistical_analyzer.analyze(digits)['entropy'] -
+                        BlockEntropyAnalyzer().analyze(digits)['entropy_rate'])
+            
+            for executor in [None, 'thread']:
+                analyzer = CompositeAnalyzer(executor=executor, use_memo=False)
+                analyzer.add_analyzer('entropy_gap')
+                analyzer.add_analyzer('block_entropy')
+                self.assertEqual(analyzer.plan_fields(['entropy_gap.gap']), {
+                    'statistical': {'entropy'},
+                    'block_entropy': {'entropy_rate'},
+                    'entropy_gap': {'gap'}
+                })
+                
+                result = analyzer.analyze(digits, fields=['entropy_gap.gap'])
+                self.assertEqual(set(result['timings']), {'statistical', 'block_entropy', 'entropy_gap'})
+                self.assertAlmostEqual(result['entropy_gap']['gap'], expected)
+                self.assertAlmostEqual(analyzer.analyze(digits)['entropy_gap']['gap'], expected)
+                self.assertAlmostEqual(analyzer.analyze_batch([digits])[0]['entropy_gap']['gap'], expected)
+                
+                analyzer.add_section('gap_bits', lambda results: round(results['entropy_gap']['gap'], 6),
+                                     inputs=['entropy_gap.gap'])
+                self.assertEqual(analyzer.analyze(digits, fields=['gap_bits'])['gap_bits'], round(expected, 6))
+            
+            with self.assertRaises(ValueError):
+                analyzer.plan_fields(['entropy_gap.unknown'])
+            analyzer.remove_analyzer('block_entropy')
+            with self.assertRaises(ValueError):
+                analyzer.analyze(digits)
+            with self.assertRaises(ValueError):
+                topological_order({'a': {'b'}, 'b': {'a'}})
+        finally:
+            unregister_analyzer('entropy_gap')
+    
+    def test_analysis_memo(self):
+        """测试分析结果备忘：不同分析器实例共享结果，按字段的请求复用完整结果，超出上限时淘汰"""
+        import random
+        from unittest import mock
+        from core.analyzers.analysis_memo import AnalysisMemo, get_analysis_memo
+        from core.classifiers.feature_based_classifier import FeatureBasedClassifier
+        from core.predictors.ensemble_predictor import EnsemblePredictor
+        rng = random.Random(24)
+        digits = [rng.randint(0, 9) for _ in range(300)]
+        memo = get_analysis_memo()
+        memo.clear()
+        
+        full = CompositeAnalyzer().analyze(digits)
+        self.assertEqual(memo.get_stats()['entries'], 1)
+        with mock.patch.object(CompositeAnalyzer, '_run_analyzers', side_effect=AssertionError):
+            # 命中备忘的结果与首次分析的结果（包括耗时）相同，命中次数记录在备忘统计中
+            self.assertEqual(CompositeAnalyzer().analyze(DigitSequence(digits)), full)
+            self.assertEqual(memo.get_stats()['hits'], 1)
+            partial = CompositeAnalyzer().analyze(digits, fields=['scores.randomness'])
+            self.assertEqual(partial['timings'], {'statistical': full['timings']['statistical']})
+            EnsemblePredictor().predict(digits, length=5)
+            classified = FeatureBasedClassifier().classify(digits)
+        uncached_classifier = FeatureBasedClassifier()
+        uncached_classifier.analyzer = CompositeAnalyzer(use_memo=False)
+        self.assertEqual(classified, uncached_classifier.classify(digits))
+        
+        # 修改返回结果（包括嵌套的字典）不影响备忘
+        cached = CompositeAnalyzer().analyze(digits)
+        cached['statistical']['entropy'] = -1
+        cached['pattern']['patterns'].clear()
+        cached['timings'].clear()
+        self.assertEqual(CompositeAnalyzer().analyze(digits), full)
+        
+        # 分析器组成、版本或配置不同时重新分析
+        analyzer = CompositeAnalyzer()
+        analyzer.remove_analyzer('complexity')
+        self.assertNotIn('complexity', analyzer.analyze(digits)['analyzers'])
+        analyzer = CompositeAnalyzer()
+        analyzer.add_analyzer('pattern', PatternAnalyzer(top_k=3))
+        hits = memo.get_stats()['hits']
+        result = analyzer.analyze(digits)
+        self.assertEqual(memo.get_stats()['hits'], hits)
+        self.assertEqual(len(result['pattern']['patterns']), 3)
+        self.assertEqual(analyzer.analyze(digits)['pattern']['patterns'], result['pattern']['patterns'])
+        analyzer.get_analyzer('pattern').top_k = 5
+        self.assertEqual(len(analyzer.analyze(digits)['pattern']['patterns']), 5)
+        analyzer.add_section('extra', lambda results: 1)
+        self.assertEqual(analyzer.analyze(digits)['extra'], 1)
+        analyzer.add_section('extra', lambda results: 2)
+        self.assertEqual(analyzer.analyze(digits)['extra'], 2)
+        
+        memo.clear()
+        uncached = CompositeAnalyzer(use_memo=False)
+        uncached.analyze(digits)
+        self.assertEqual(len(memo), 0)
+        
+        small = AnalysisMemo(max_entries=2)
+        for key in 'abc':
+            small.put(key, {key: 1})
+        small.get('b')
+        self.assertIsNone(small.get('a'))
+        self.assertEqual(small.get('b'), {'b': 1})
+        small.put('d', {})
+        self.assertIsNone(small.get('c'))
+        
+        # 按序列化后的字节数淘汰，超过上限的单个结果不保存
+        small = AnalysisMemo(max_bytes=2000)
+        small.put('a', {'a': list(range(1000, 1400))})
+        small.put('b', {'b': list(range(1000, 1400))})
+        self.assertIsNone(small.get('a'))
+        self.assertLessEqual(small.get_stats()['bytes'], 2000)
+        small.put('c', {'c': list(range(2000))})
+        self.assertIsNone(small.get('c'))
+        self.assertEqual(small.get('b', fields={'b': None, 'x': None}), {'b': list(range(1000, 1400))})
+        small.put('e', {'e': {'x': 1, 'y': [2]}, 'f': 3})
+        self.assertEqual(small.get('e', fields={'e': ['y']}), {'e': {'y': [2]}})
+    
     def test_four_track_analyzer(self):
         """测试四轨分析器"""
         # 分析数据
@@ -108,6 +335,255 @@ class TestAnalyzers(unittest.TestCase):
             self.assertIn('ratio', yinyang)
             self.assertIn('yang_percent', yinyang)
     
+    def test_track1_vectorized_window_pairs(self):
+        """测试轨道1向量化窗口配对与逐窗口实现一致"""
+        import random
+        rng = random.Random(42)
+        for length in [0, 11, 12, 13, 200]:
+            digits = [rng.randint(0, 9) for _ in range(length)]
+            
+            # 逐窗口参考实现
+            valid_pairs = 0
+            total_pairs = 0
+            window_count = 0
+            for i in range(len(digits) - 11):
+                states = self.four_track_analyzer._process_window(digits[i:i+12], 'track1')
+                pair_result = self.four_track_analyzer._calculate_nine_sum_pairs(states, 'track1')
+                valid_pairs += pair_result['valid_pairs']
+                total_pairs += pair_result['total_pairs']
+                window_count += 1
+            
+            self.assertEqual(
+                self.four_track_analyzer._count_track1_symbol_pairs(digits),
+                (window_count, valid_pairs, total_pairs)
+            )
+    
+    def test_shared_backward_pass(self):
+        """测试共享顺序无关部分后的反向结果与直接分析反向序列一致"""
+        for digits in [self.test_digits, self.pi_digits + [2]]:
+            result = self.four_track_analyzer.analyze(digits)
+            reversed_digits = digits[::-1]
+            
+            for track_name in ['track1', 'track2', 'track3', 'track4']:
+                self.assertEqual(
+                    result[track_name]['backward'],
+                    self.four_track_analyzer._analyze_track(reversed_digits, track_name)
+                )
+            
+            for track_name in ['track2', 'track3', 'track4']:
+                self.assertEqual(
+                    result['direct_pairing'][track_name]['backward'],
+                    self.four_track_analyzer._analyze_direct_pairing(reversed_digits, track_name)
+                )
+    
+    def test_digit_sequence_input(self):
+        """测试分析器直接接受DigitSequence输入"""
+        sequence = DigitSequence(self.pi_digits)
+        self.assertTrue(self.four_track_analyzer.validate_input(sequence))
+        self.assertEqual(self.four_track_analyzer.analyze(sequence), self.four_track_analyzer.analyze(self.pi_digits))
+        self.assertEqual(self.statistical_analyzer.analyze(sequence), self.statistical_analyzer.analyze(self.pi_digits))
+        self.assertEqual(self.pattern_analyzer.analyze(sequence), self.pattern_analyzer.analyze(self.pi_digits))
+    
+    def test_four_track_streaming(self):
+        """测试四轨分块流式分析与整体分析一致"""
+        import random
+        rng = random.Random(7)
+        for length in [5, 12, 13, 100, 101]:
+            digits = [rng.randint(0, 9) for _ in range(length)]
+            expected = self.four_track_analyzer.analyze(digits)
+            
+            for chunk_size in [1, 5, 11, 12, 40]:
+                self.four_track_analyzer.begin()
+                for i in range(0, length, chunk_size):
+                    self.four_track_analyzer.feed(digits[i:i+chunk_size])
+                self.assertEqual(self.four_track_analyzer.finish(), expected)
+            
+            # 部分状态合并满足结合律
+            middle = max(length // 2, 3)
+            a, b, c = (self.four_track_analyzer.partial_state(part)
+                       for part in (digits[:3], digits[3:middle], digits[middle:]))
+            merge = self.four_track_analyzer.merge_states
+            self.assertEqual(self.four_track_analyzer.finalize_state(merge(merge(a, b), c)), expected)
+            self.assertEqual(self.four_track_analyzer.finalize_state(merge(a, merge(b, c))), expected)
+    
+    def test_sharded_analysis(self):
+        """测试多进程分片分析与单进程分析一致"""
+        import random
+        rng = random.Random(11)
+        digits = DigitSequence([rng.randint(0, 9) for _ in range(1001)])
+        
+        for analyzer_class in (FourTrackAnalyzer, StatisticalAnalyzer):
+            expected = analyzer_class().analyze(digits)
+            sharded = analyzer_class(workers=3, min_shard_size=200).analyze(digits)
+            self.assertEqual(sharded, expected)
+    
+    def test_analyze_batch(self):
+        """测试批量分析与逐个分析一致"""
+        import random
+        rng = random.Random(13)
+        sequences = [[rng.randint(0, 9) for _ in range(length)] for length in [1, 11, 12, 37, 100]]
+        sequences.append([])
+        
+        for analyzer in (self.four_track_analyzer, self.statistical_analyzer, self.composite_analyzer):
+            results = analyzer.analyze_batch(sequences)
+            self.assertEqual(len(results), len(sequences))
+            for digits, result in zip(sequences, results):
+                expected = analyzer.analyze(digits)
+                # 耗时随运行而变，不参与比较
+                result.pop('timings', None)
+                expected.pop('timings', None)
+                self.assertEqual(result, expected)
+    
+    def test_track_specs(self):
+        """测试声明式轨道定义：新增轨道与默认轨道走同一套查表计算"""
+        import json
+        import os
+        import tempfile
+        from core.analyzers.track_spec import load_track_specs
+        spec = {
+            'track5': {
+                'type': 'symbol',
+                'symbols': ['偶', '奇', '偶', '奇', '偶', '奇', '偶', '奇', '偶', '奇'],
+                'yang': ['奇'],
+                'yin': ['偶'],
+                'pairs': [[1, 2, '奇偶', '阳'], [2, 1, '奇偶', '阳']]
+            }
+        }
+        fd, path = tempfile.mkstemp(suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(spec, f, ensure_ascii=False)
+            analyzer = FourTrackAnalyzer(track_specs=load_track_specs(path))
+        finally:
+            os.remove(path)
+        
+        digits = [1, 2, 2, 1, 3, 4, 5, 6, 1, 2, 9, 9, 0, 1]
+        result = analyzer.analyze(digits)
+        self.assertEqual(result['track5']['forward']['yinyang']['yang_count'], 8)
+        self.assertEqual(result['direct_pairing']['track5']['forward']['valid_pairs'], 3)
+        self.assertEqual(result['track5']['forward']['global_digit_pairs']['valid_pairs'], 3)
+        
+        # 默认轨道的结果不受新增轨道影响
+        default_result = self.four_track_analyzer.analyze(digits)
+        for track in ['track1', 'track2', 'track3', 'track4']:
+            self.assertEqual(result[track], default_result[track])
+        
+        with self.assertRaises(ValueError):
+            FourTrackAnalyzer(track_specs={'track5': {'type': 'symbol', 'symbols': ['A'] * 10, 'yang': []}})
+    
+    def test_dna_track_analyzer(self):
+        """测试DNA脚本的四轨道分析器：规则来自默认轨道定义，保留步长5的窗口和原有结果格式"""
+        from core.analyzers.dna_track_analyzer import DNATrackAnalyzer
+        analyzer = DNATrackAnalyzer()
+        digits = [1, 8, 8, 1, 2, 7, 9, 0, 5, 4, 3, 6, 1, 9]
+        result = analyzer.analyze(digits)
+        
+        track1 = result['track1']['forward']
+        self.assertEqual(track1['window_count'], 1)
+        self.assertEqual(track1['symbol_pairs']['total'], 8)
+        self.assertEqual((track1['yinyang']['yang'], track1['yinyang']['yin']), (9, 5))
+        
+        track2 = result['track2']['forward']['global_digit_pairs']
+        self.assertEqual((track2['valid'], track2['total']), (6, 7))
+        self.assertEqual(track2['pair_types']['A'], {'count': 2, 'yinyang': '阳'})
+        self.assertEqual(track2['unpaired'], {1: 1, 9: 1})
+        self.assertIn(result['summary']['best_track'], analyzer.track_names)
+        
+        self.assertIn('error', analyzer.analyze([1, 10]))
+        
+        # 批量分析与逐个分析的结果一致，非法行单独报错
+        import random
+        rng = random.Random(8)
+        sequences = [[rng.randrange(10) for _ in range(length)] for length in (0, 11, 12, 37, 500)]
+        sequences.insert(2, [3, -1])
+        batch = analyzer.analyze_batch(sequences)
+        self.assertEqual(batch, [analyzer.analyze(digits) for digits in sequences])
+        self.assertIn('error', batch[2])
+    
+    def test_track_profile(self):
+        """测试区间剖面查询与对区间单独分析的结果一致"""
+        import random
+        rng = random.Random(3)
+        digits = [rng.randint(0, 9) for _ in range(60)]
+        profile = self.four_track_analyzer.profile(digits)
+        
+        for start, end in [(0, 60), (1, 30), (7, 19), (20, 57)]:
+            expected = self.four_track_analyzer.analyze(digits[start:end])
+            for track in ['track1', 'track2', 'track3', 'track4']:
+                result = profile.query(track, start, end)
+                self.assertEqual(result['yinyang'], expected[track]['forward']['yinyang'])
+                if track == 'track1':
+                    self.assertEqual(result['symbol_pairs'], expected[track]['forward']['symbol_pairs'])
+                else:
+                    pairing = expected['direct_pairing'][track]['forward']
+                    self.assertEqual(result['direct_pairing']['valid_pairs'], pairing['valid_pairs'])
+                    self.assertEqual(result['direct_pairing']['total_pairs'], pairing['total_pairs'])
+        
+        # 固定窗口剖面与逐窗口查询一致
+        window_profile = profile.window_profile('track3', 20, step=10)
+        self.assertEqual(list(window_profile['starts']), [0, 10, 20, 30, 40])
+        for start, ratio in zip(window_profile['starts'], window_profile['pair_ratio']):
+            self.assertAlmostEqual(ratio, profile.query('track3', start, start + 20)['direct_pairing']['pair_ratio'])
+    
+    def test_incremental_analysis(self):
+        """测试增量分析与整体分析一致，且状态可保存后继续追加"""
+        import os
+        import random
+        import shutil
+        import tempfile
+        from core.analyzers.incremental_analysis import IncrementalAnalysis
+        rng = random.Random(5)
+        digits = [rng.randint(0, 9) for _ in range(500)]
+        
+        incremental = self.composite_analyzer.incremental(digits[:7])
+        for start, end in [(7, 20), (20, 20), (20, 300)]:
+            incremental.extend(digits[start:end])
+        resumed = IncrementalAnalysis.from_dict(incremental.to_dict())
+        resumed.extend(digits[300:])
+        
+        result = resumed.result()
+        self.assertEqual(result['total_digits'], 500)
+        self.assertEqual(result['four_track'], self.four_track_analyzer.analyze(digits))
+        self.assertEqual(result['statistical'], self.statistical_analyzer.analyze(digits))
+        
+        # 数据文件追加后只处理新增部分
+        temp_dir = tempfile.mkdtemp()
+        try:
+            data_file = os.path.join(temp_dir, 'pi.txt')
+            with open(data_file, 'w') as f:
+                f.write('3.' + ''.join(map(str, digits[1:100])))
+            self.assertEqual(IncrementalAnalysis.for_file(data_file).length, 100)
+            self.assertTrue(os.path.exists(IncrementalAnalysis.state_path(data_file)))
+            
+            with open(data_file, 'w') as f:
+                f.write('3.' + ''.join(map(str, digits[1:])))
+            self.assertEqual(IncrementalAnalysis.for_file(data_file).result()['four_track'],
+                             self.four_track_analyzer.analyze([3] + digits[1:]))
+            self.assertEqual(IncrementalAnalysis.load(IncrementalAnalysis.state_path(data_file)).source['bytes'],
+                             os.path.getsize(data_file))
+            
+            # 改写中间的数字（首尾不变）后按摘要检测到，从头重新分析
+            rewritten = [3] + digits[1:]
+            rewritten[250] = (rewritten[250] + 1) % 10
+            with open(data_file, 'w') as f:
+                f.write('3.' + ''.join(map(str, rewritten[1:])) + '\n')
+            self.assertEqual(IncrementalAnalysis.for_file(data_file).result()['statistical'],
+                             self.statistical_analyzer.analyze(rewritten))
+            
+            # 按精度写入（10 -> 100 -> 500位）时从较低精度的状态继续，只分析新增的数字
+            from unittest import mock
+            from core.data.data_writer import DataWriter
+            writer = DataWriter(temp_dir)
+            extend = IncrementalAnalysis.extend
+            with mock.patch.object(IncrementalAnalysis, 'extend', autospec=True, side_effect=extend) as patched:
+                for precision in (10, 100, 500):
+                    self.assertTrue(writer.write_constant_with_precision('e', digits, precision))
+            self.assertEqual(sum(len(call.args[1]) for call in patched.call_args_list), 500)
+            resumed = IncrementalAnalysis.load(IncrementalAnalysis.state_path(os.path.join(temp_dir, 'e_500digits.txt')))
+            self.assertEqual(resumed.result()['four_track'], self.four_track_analyzer.analyze(digits))
+        finally:
+            shutil.rmtree(temp_dir)
+    
     def test_statistical_analyzer(self):
         """测试统计分析器"""
         # 分析数据
@@ -139,6 +615,41 @@ class TestAnalyzers(unittest.TestCase):
             self.assertIn(digit, digit_dist)
             self.assertGreaterEqual(digit_dist[digit], 0)
     
+    def test_statistical_streaming(self):
+        """测试统计分析器分块流式分析（含文件）与整体分析一致"""
+        import os
+        import random
+        import tempfile
+        from core.data.data_reader import DataReader
+        rng = random.Random(29)
+        digits = [rng.randint(0, 9) for _ in range(1000)]
+        expected = self.statistical_analyzer.analyze(digits)
+        
+        for chunk_size in [1, 7, 1000]:
+            self.statistical_analyzer.begin()
+            for i in range(0, len(digits), chunk_size):
+                self.statistical_analyzer.feed(digits[i:i+chunk_size])
+            self.assertEqual(self.statistical_analyzer.finish(), expected)
+        
+        self.statistical_analyzer.begin()
+        self.assertEqual(self.statistical_analyzer.finish(), self.statistical_analyzer.analyze([]))
+        with self.assertRaises(RuntimeError):
+            self.statistical_analyzer.feed(digits)
+        
+        # 文件按小块读取
+        fd, data_file = tempfile.mkstemp(suffix='.txt')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write('3.' + '\n'.join(''.join(map(str, digits[i:i+50])) for i in range(1, len(digits), 50)))
+            reader = DataReader()
+            reader.read_chunk_size = 64
+            self.assertEqual([3] + digits[1:], [d for chunk in reader.iter_file_chunks(data_file) for d in chunk])
+            self.assertEqual(self.statistical_analyzer.analyze_file(data_file), self.statistical_analyzer.analyze([3] + digits[1:]))
+            self.assertEqual(self.statistical_analyzer.analyze_file(data_file, max_digits=100),
+                             self.statistical_analyzer.analyze([3] + digits[1:100]))
+        finally:
+            os.remove(data_file)
+    
     def test_pattern_analyzer(self):
         """测试模式分析器"""
         # 创建有模式的数据
@@ -167,6 +678,278 @@ class TestAnalyzers(unittest.TestCase):
             self.assertIn('length', pattern)
             self.assertIn('score', pattern)
     
+    def test_repetition_patterns(self):
+        """测试基于后缀数组的重复模式和基于位置索引的配对模式与逐个计数一致"""
+        import random
+        from collections import Counter
+        rng = random.Random(11)
+        for digits in ([1, 1, 1, 1, 1], [rng.randint(0, 2) for _ in range(60)], [rng.randint(0, 9) for _ in range(300)]):
+            expected = []
+            for length in range(2, min(20, len(digits) // 2) + 1):
+                counts = Counter(tuple(digits[i:i+length]) for i in range(len(digits) - length + 1))
+                for pattern, count in counts.items():
+                    if count >= 2:
+                        positions = [i for i in range(len(digits) - length + 1) if tuple(digits[i:i+length]) == pattern]
+                        expected.append((list(pattern), length, count, positions))
+            
+            patterns = self.pattern_analyzer._detect_repetition_patterns(digits)
+            self.assertEqual([(p['pattern'], p['length'], p['count'], p['positions']) for p in patterns], expected)
+            
+            # 配对模式：前10个高频配对，次数相同时按首次出现顺序
+            pair_counts = Counter((digits[i], digits[i+1]) for i in range(len(digits) - 1))
+            expected_pairs = [(list(pair), count, [i for i in range(len(digits) - 1) if (digits[i], digits[i+1]) == pair])
+                              for pair, count in pair_counts.most_common(10) if count >= 3]
+            pair_patterns = self.pattern_analyzer._detect_pair_patterns(digits)
+            self.assertEqual([(p['pattern'], p['count'], p['positions']) for p in pair_patterns], expected_pairs)
+    
+    def test_ngram_spectrum(self):
+        """测试n元组频谱与逐位计数一致"""
+        import random
+        from collections import Counter
+        from core.analyzers.ngram_spectrum import NGramSpectrum
+        rng = random.Random(17)
+        digits = [rng.randint(0, 3) for _ in range(200)]
+        spectrum = NGramSpectrum(DigitSequence(digits), max_length=8)
+        
+        for k in [8, 1, 3, 7, 2]:
+            expected = Counter(tuple(digits[i:i+k]) for i in range(len(digits) - k + 1))
+            self.assertEqual(spectrum.items(k), list(expected.items()))
+            self.assertEqual(spectrum.max_count(k), max(expected.values()))
+        self.assertEqual(spectrum.count([0, 1, 2]), sum(1 for i in range(198) if digits[i:i+3] == [0, 1, 2]))
+        self.assertEqual(spectrum.count([9, 9]), 0)
+        self.assertEqual(NGramSpectrum([1, 2], max_length=3).items(3), [])
+        with self.assertRaises(ValueError):
+            spectrum.codes(9)
+    
+    def test_periodicity_profile(self):
+        """测试串联重复剖面与逐位置比较一致"""
+        import random
+        rng = random.Random(19)
+        analyzer = PatternAnalyzer(max_period=12)
+        for digits in ([], [4, 4, 4], [rng.randint(0, 1) for _ in range(80)], [1, 2, 3, 4, 5] * 6):
+            profile = analyzer.analyze(digits)['periodicity_profile'] if digits else analyzer._calculate_periodicity_profile(digits)
+            self.assertEqual(sorted(profile), list(range(2, 13)))
+            for period, stats in profile.items():
+                count = sum(1 for i in range(len(digits) - 2 * period + 1) if digits[i:i+period] == digits[i+period:i+2*period])
+                self.assertEqual(stats['count'], count)
+            expected_score = max([p for p in range(2, 13) if profile[p]['count'] > 0], default=0)
+            self.assertEqual(analyzer._calculate_repetition_score(digits), expected_score)
+        self.assertEqual(analyzer._calculate_repetition_score([1, 2, 3, 4, 5] * 6), 10)
+        
+        # 较大周期下逐级腐蚀的游程统计（含长于和短于周期的游程）
+        analyzer = PatternAnalyzer(max_period=40)
+        digits = [rng.randint(0, 2) for _ in range(300)] + [7, 1, 8, 2, 8] * 20 + [rng.randint(0, 9) for _ in range(300)]
+        profile = analyzer._calculate_periodicity_profile(digits)
+        for period, stats in profile.items():
+            matched = [digits[i] == digits[i + period] for i in range(len(digits) - period)]
+            runs = [len(run) for run in ''.join('1' if m else '0' for m in matched).split('0') if run]
+            self.assertEqual(stats['longest_run'], max(runs, default=0))
+            self.assertEqual(stats['count'], sum(max(run - period + 1, 0) for run in runs))
+    
+    def test_approximate_patterns(self):
+        """测试近似模式的结果结构、精确部分和草图误差界"""
+        import random
+        from collections import Counter
+        rng = random.Random(23)
+        planted = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]
+        digits = []
+        for _ in range(40):
+            digits.extend(rng.randint(0, 9) for _ in range(30))
+            digits.extend(planted)
+        exact = self.pattern_analyzer.analyze(digits)
+        
+        result = PatternAnalyzer(approximate=True, epsilon=0.01, chunk_size=257).analyze(DigitSequence(digits))
+        self.assertTrue(result['approximate'])
+        for key in ('repetition_score', 'pair_score', 'sequential_score', 'periodicity_profile'):
+            self.assertEqual(result[key], exact[key])
+        for key in ('patterns', 'pattern_density', 'pattern_distribution', 'total_patterns', 'error_bounds'):
+            self.assertIn(key, result)
+        
+        # 稠密计数的长度是精确的，草图计数的长度给出误差界
+        bounds = result['error_bounds']['lengths']
+        self.assertTrue(bounds[6]['exact'])
+        self.assertFalse(bounds[10]['exact'])
+        # 超出编码长度的模式长度不统计，并在结果中注明
+        self.assertEqual(result['error_bounds']['max_pattern_length'], 18)
+        self.assertEqual(result['error_bounds']['skipped_lengths'], [19, 20])
+        self.assertEqual(max(bounds), 18)
+        repetitions = [p for p in result['patterns'] if p['type'] == 'repetition']
+        for pattern in repetitions:
+            k = pattern['length']
+            true_count = Counter(tuple(digits[i:i+k]) for i in range(len(digits) - k + 1))[tuple(pattern['pattern'])]
+            self.assertGreaterEqual(pattern['count'], true_count)
+            self.assertLessEqual(pattern['count'] - pattern['count_error'], true_count)
+            self.assertLessEqual(pattern['count'] - true_count, bounds[k]['count_error'])
+        self.assertIn(planted, [p['pattern'] for p in repetitions if p['length'] == 10])
+        
+        # 序列模式和周期性剖面逐块累加，跨块的游程与整体计算一致
+        digits = [rng.randint(0, 9) for _ in range(200)] + list(range(10)) * 3 + [9, 8, 7, 6, 5] * 8
+        exact = PatternAnalyzer(top_k=5, max_period=12).analyze(digits)
+        for chunk_size in (1, 4, 7):
+            result = PatternAnalyzer(approximate=True, top_k=5, max_period=12,
+                                     chunk_size=chunk_size).analyze(DigitSequence(digits))
+            for key in ('sequential_score', 'periodicity_profile'):
+                self.assertEqual(result[key], exact[key])
+            for pattern_type in ('sequential_increasing', 'sequential_decreasing'):
+                self.assertEqual(result['pattern_distribution'].get(pattern_type),
+                                 exact['pattern_distribution'].get(pattern_type))
+    
+    def test_pattern_top_k(self):
+        """测试只保留前K个模式时密度和分布仍按全部模式计算"""
+        import random
+        rng = random.Random(13)
+        digits = [rng.randint(0, 9) for _ in range(400)]
+        full = self.pattern_analyzer.analyze(digits)
+        
+        for top_k in [1, 5, 60]:
+            limited = PatternAnalyzer(top_k=top_k, min_score=6, max_positions=2).analyze(digits)
+            expected = sorted([p for p in full['patterns'] if p['score'] >= 6], key=lambda p: -p['score'])[:top_k]
+            self.assertEqual([(p['pattern'], p['count'], p.get('positions', [])[:2]) for p in limited['patterns']],
+                             [(p['pattern'], p['count'], p.get('positions', [])[:2]) for p in expected])
+            self.assertTrue(all(len(p['positions']) <= 2 for p in limited['patterns'] if 'positions' in p))
+            for key in ('pattern_density', 'pattern_distribution', 'total_patterns', 'repetition_score'):
+                self.assertEqual(limited[key], full[key])
+    
+    def test_spectral_analyzer(self):
+        """测试FFT自相关与直接求和一致、分段计算与整体一致，并能找出周期"""
+        import numpy as np
+        from core.analyzers.spectral_analyzer import SpectralAnalyzer
+        rng = np.random.default_rng(5)
+        digits = rng.integers(0, 10, 600).tolist()
+        centered = np.array(digits) - np.mean(digits)
+        expected = np.array([np.dot(centered[:600 - k], centered[k:]) for k in range(301)]) / np.dot(centered, centered)
+        
+        analyzer = SpectralAnalyzer()
+        np.testing.assert_allclose(analyzer.autocorrelation(digits), expected, atol=1e-12)
+        result = analyzer.analyze(digits)
+        self.assertEqual(result['method'], 'periodogram')
+        self.assertEqual(len(result['autocorrelation']), 301)
+        self.assertEqual(result['max_lag'], 300)
+        self.assertAlmostEqual(result['lag1_autocorrelation'], expected[1])
+        
+        # 分段计算：自相关按块精确累加，周期图按段平均
+        segmented = SpectralAnalyzer(segment_length=64, welch_threshold=100)
+        np.testing.assert_allclose(segmented.autocorrelation(digits, 32), expected[:33], atol=1e-12)
+        result = segmented.analyze(digits)
+        self.assertEqual(result['method'], 'welch')
+        self.assertEqual(result['segments'], (600 - 64) // 32 + 1)
+        self.assertEqual(len(result['autocorrelation']), 33)
+        self.assertEqual(result['max_lag'], 32)
+        self.assertGreater(result['spectral_flatness'], 0.8)
+        
+        periodic = analyzer.analyze([1, 2, 3] * 100)
+        self.assertAlmostEqual(periodic['dominant_periods'][0]['period'], 3.0)
+        self.assertEqual(periodic['max_autocorrelation']['lag'], 3)
+        self.assertLess(periodic['spectral_flatness'], 0.01)
+        
+        self.assertEqual(analyzer.analyze([4, 4, 4])['lag1_autocorrelation'], 0)
+        self.assertIn('error', analyzer.analyze([]))
+        self.assertIn('spectral', self.composite_analyzer.analyze(self.pi_digits))
+    
+    def test_block_entropy_analyzer(self):
+        """测试块熵与逐块计数一致、复用频谱结果不变，并能区分高阶结构"""
+        import random
+        from collections import Counter
+        import numpy as np
+        from core.analyzers.block_entropy_analyzer import BlockEntropyAnalyzer
+        from core.analyzers.ngram_spectrum import NGramSpectrum
+        rng = random.Random(3)
+        digits = [rng.randint(0, 9) for _ in range(2000)]
+        analyzer = BlockEntropyAnalyzer(max_length=9)
+        result = analyzer.analyze(digits)
+        for k in [1, 2, 7, 9]:
+            counts = np.array(list(Counter(tuple(digits[i:i+k]) for i in range(len(digits) - k + 1)).values()))
+            probabilities = counts / counts.sum()
+            self.assertAlmostEqual(result['block_entropies'][k], -np.sum(probabilities * np.log2(probabilities)))
+            self.assertEqual(result['distinct_blocks'][k], len(counts))
+        self.assertEqual(result['reliable_length'], 2)
+        self.assertGreater(result['entropy_rate'], 3.2)
+        
+        spectrum = NGramSpectrum(digits, 4)
+        spectrum.table(4)
+        self.assertEqual(analyzer.analyze(digits, spectrum), result)
+        self.assertEqual(analyzer.analyze(digits, NGramSpectrum(digits, 12)), result)
+        
+        # 周期序列的单数字熵很高，但熵率为0
+        periodic = analyzer.analyze([0, 1, 2, 3, 4, 5, 6, 7, 8, 9] * 50)
+        self.assertAlmostEqual(periodic['block_entropies'][1], np.log2(10))
+        self.assertAlmostEqual(periodic['entropy_rate'], 0, places=3)
+        self.assertEqual(periodic['reliable_length'], 9)
+        self.assertIn('error', analyzer.analyze([]))
+        
+        # 均匀随机序列：插入估计的熵率偏低，Miller–Madow 修正后冗余度约为0
+        uniform = DigitSequence(np.random.default_rng(7).integers(0, 10, 200000).astype(np.uint8))
+        result = BlockEntropyAnalyzer().analyze(uniform)
+        self.assertEqual(result['reliable_length'], 4)
+        self.assertAlmostEqual(result['redundancy'], 0, places=3)
+        self.assertLess(BlockEntropyAnalyzer(bias_correction=False).analyze(uniform)['entropy_rate'],
+                        result['entropy_rate'] - 0.02)
+        self.assertGreater(result['corrected_block_entropies'][4], result['block_entropies'][4])
+    
+    def test_complexity_analyzer(self):
+        """测试LZ76分解与逐位查找实现一致、分块流式结果与整体一致"""
+        import random
+        import numpy as np
+        from core.analyzers.complexity_analyzer import ComplexityAnalyzer
+        from core.analyzers.suffix_array import longest_previous_factor, suffix_array
+        
+        def reference_phrases(digits):
+            # 每个短语为此前（允许重叠）出现过的最长子串再加一位
+            position, phrases = 0, 0
+            while position < len(digits):
+                longest = 0
+                for start in range(position):
+                    length = 0
+                    while position + length < len(digits) and digits[start + length] == digits[position + length]:
+                        length += 1
+                    longest = max(longest, length)
+                position += longest + 1
+                phrases += 1
+            return phrases
+        
+        rng = random.Random(17)
+        analyzer = ComplexityAnalyzer()
+        for length in [1, 2, 5, 30, 120]:
+            for alphabet in [1, 2, 10]:
+                digits = [rng.randrange(alphabet) for _ in range(length)]
+                self.assertEqual(analyzer.lz76_complexity(digits), reference_phrases(digits))
+        self.assertEqual(longest_previous_factor([1, 2, 1, 2, 1, 3]).tolist(), [0, 0, 3, 2, 1, 0])
+        self.assertEqual(suffix_array(np.array([1, 2, 1, 2, 1, 3])).tolist(), [0, 2, 4, 1, 3, 5])
+        
+        digits = [rng.randint(0, 9) for _ in range(3000)]
+        result = analyzer.analyze(digits)
+        self.assertEqual(result['blocks'], 1)
+        self.assertGreater(result['lz76_normalized'], 0.8)
+        self.assertGreater(result['zlib_normalized'], 1)
+        self.assertLess(analyzer.analyze([1, 2, 3] * 1000)['lz76_normalized'], 0.01)
+        
+        # 分块：短语跨块延续，不超过两块时与整体分解一致，更长时为上界；压缩率不受分块影响
+        def stream(values, block_size, step):
+            blocked = ComplexityAnalyzer(block_size=block_size)
+            blocked.begin()
+            for i in range(0, len(values), step):
+                blocked.feed(values[i:i+step])
+            return blocked.finish()
+        
+        for values, block_size in [(digits[:2000], 1000), (digits[:1500], 1000), ([1, 2, 1, 2, 1, 3] * 50, 150)]:
+            streamed = stream(values, block_size, 70)
+            self.assertTrue(streamed['lz76_exact'])
+            self.assertEqual(streamed['lz76_complexity'], reference_phrases(values) if len(values) < 500
+                             else analyzer.lz76_complexity(values))
+        streamed = stream(digits, 1000, 700)
+        self.assertEqual(streamed['blocks'], 3)
+        self.assertFalse(streamed['lz76_exact'])
+        self.assertGreaterEqual(streamed['lz76_complexity'], result['lz76_complexity'])
+        self.assertLessEqual(streamed['lz76_complexity'],
+                             sum(analyzer.lz76_complexity(digits[i:i+1000]) for i in range(0, 3000, 1000)))
+        self.assertEqual(streamed['zlib_ratio'], result['zlib_ratio'])
+        self.assertEqual(stream([7] * 5000, 1000, 300)['lz76_complexity'], 5)
+        self.assertIn('error', analyzer.analyze([]))
+        
+        scores = self.composite_analyzer.analyze(digits)['scores']
+        self.assertAlmostEqual(scores['lz76_complexity'], min(result['lz76_normalized'], 1.0))
+        self.assertEqual(scores['compression_ratio'], 1.0)
+    
     def test_sliding_window_analysis(self):
         """测试滑动窗口分析"""
         # 分析数据
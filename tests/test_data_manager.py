@@ -5,6 +5,7 @@ import unittest
 import os
 import tempfile
 from core.data.data_manager import DataManager
+from core.data.digit_sequence import DigitSequence
 
 class TestDataManager(unittest.TestCase):
     """测试数据管理器"""
@@ -108,6 +109,62 @@ class TestDataManager(unittest.TestCase):
         deleted_digits = self.data_manager.load_constant(test_name, 10)
         self.assertEqual(deleted_digits, [])
     
+    def test_load_sequence(self):
+        """测试加载紧凑数字序列"""
+        test_name = 'sequence_test'
+        test_digits = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]
+        self.data_manager.save_constant(test_name, DigitSequence(test_digits))
+        
+        sequence = self.data_manager.load_sequence(test_name, 8)
+        self.assertIsInstance(sequence, DigitSequence)
+        self.assertEqual(sequence, test_digits[:8])
+        
+        # 第二次加载来自缓存
+        self.assertEqual(self.data_manager.load_sequence(test_name, 8), test_digits[:8])
+        self.assertEqual(self.data_manager.load_constant(test_name, 8), test_digits[:8])
+    
+    def test_read_file_digits(self):
+        """测试读取文件时非ASCII数字字符的处理，以及中途出错时返回已读取的数字"""
+        from core.data.data_reader import DataReader
+        reader = DataReader(self.temp_dir)
+        reader.read_chunk_size = 4
+        file_path = os.path.join(self.temp_dir, 'unicode_test.txt')
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write('3.14\u0663159\n2653')
+        self.assertEqual(reader.read_sequence('unicode_test', 100), [3, 1, 4, 3, 1, 5, 9, 2, 6, 5, 3])
+        self.assertEqual(reader.read_sequence('unicode_test', 5), [3, 1, 4, 3, 1])
+        
+        # 上标数字满足 isdigit 但无法转换为整数：返回此前读取的数字
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write('3.14159\u00b226')
+        self.assertEqual(reader.read_sequence('unicode_test', 100), [3, 1, 4, 1, 5, 9])
+    
+    def test_digit_sequence(self):
+        """测试DigitSequence的校验、切片和反转"""
+        import pickle
+        sequence = DigitSequence([1, 2, 3, 4, 5])
+        
+        # 切片和反转共享缓冲区
+        self.assertEqual(sequence[1:4], [2, 3, 4])
+        self.assertEqual(sequence.reversed(), [5, 4, 3, 2, 1])
+        self.assertIs(sequence[1:4].data.base, sequence.data)
+        self.assertIs(sequence.reversed().data.base, sequence.data)
+        self.assertEqual(sequence[-1], 5)
+        self.assertEqual(list(sequence), [1, 2, 3, 4, 5])
+        
+        # 从文本解析
+        self.assertEqual(DigitSequence.from_string('3.14159', max_digits=4), [3, 1, 4, 1])
+        self.assertEqual(DigitSequence.from_string('3.14159').to_string(), '314159')
+        
+        # pickle往返
+        self.assertEqual(pickle.loads(pickle.dumps(sequence)), sequence)
+        
+        # 非法输入
+        with self.assertRaises(ValueError):
+            DigitSequence([1, 2, 10])
+        with self.assertRaises(ValueError):
+            DigitSequence([1.5, 2])
+    
     def test_save_and_load_analysis_result(self):
         """测试保存和加载分析结果"""
         # 测试数据
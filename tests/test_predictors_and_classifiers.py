@@ -8,6 +8,7 @@ from core.predictors.pattern_predictor import PatternPredictor
 from core.classifiers.ensemble_classifier import EnsembleClassifier
 from core.classifiers.rule_based_classifier import RuleBasedClassifier
 from core.classifiers.feature_based_classifier import FeatureBasedClassifier
+from core.data.digit_sequence import DigitSequence
 
 class TestPredictorsAndClassifiers(unittest.TestCase):
     """测试预测器和分类器组件"""
@@ -139,6 +140,22 @@ class TestPredictorsAndClassifiers(unittest.TestCase):
                 self.assertGreaterEqual(digit, 0)
                 self.assertLessEqual(digit, 9)
     
+    def test_digit_sequence_input(self):
+        """测试预测器和分类器直接接受DigitSequence输入"""
+        sequence = DigitSequence(self.pi_digits)
+        
+        for predictor in [self.ensemble_predictor, self.statistical_predictor, self.pattern_predictor]:
+            self.assertTrue(predictor.validate_input(sequence))
+            prediction = predictor.predict(sequence, length=5)
+            self.assertEqual(len(prediction), 5)
+        
+        classification = self.feature_based_classifier.classify(sequence)
+        self.assertNotEqual(classification['confidence'], 0.0)
+        self.assertEqual(
+            classification['features'],
+            self.feature_based_classifier.classify(self.pi_digits)['features']
+        )
+    
     def test_edge_cases(self):
         """测试边界情况"""
         # 空数据预测